@@ -1,115 +1,57 @@
-import time
-import RPi.GPIO as GPIO
-
-class BodyActivateMotor:
+from servo_bus import MOTOR_PINS, ANGLE_LIMITS
+from actuator_manager import get_actuator_manager
+from keyframe_track import KeyframeExecutor, compile_keyframe_track
 
 class BodyActivateMotor:
     """
     기울기 복구용 모터 제어 (case 별 복구 프로토콜 실행)
     서브모터를 사용한 정밀한 각도 제어
     """
-    def __init__(self):
+    def __init__(self, actuator=None, backend=None):
         # 서브모터 핀 설정 (라즈베리파이 GPIO)
-        self.motor_pins = {
-            'front_left_hip': 17,      # 앞왼쪽 힙 모터
-            'front_left_knee': 18,     # 앞왼쪽 무릎 모터
-            'front_left_ankle': 27,    # 앞왼쪽 발목 모터
-            'front_right_hip': 22,     # 앞오른쪽 힙 모터
-            'front_right_knee': 23,    # 앞오른쪽 무릎 모터
-            'front_right_ankle': 24,   # 앞오른쪽 발목 모터
-            'back_left_hip': 10,       # 뒤왼쪽 힙 모터
-            'back_left_knee': 9,       # 뒤왼쪽 무릎 모터
-            'back_left_ankle': 11,     # 뒤왼쪽 발목 모터
-            'back_right_hip': 5,       # 뒤오른쪽 힙 모터
-            'back_right_knee': 6,      # 뒤오른쪽 무릎 모터
-            'back_right_ankle': 13     # 뒤오른쪽 발목 모터
-        }
+        self.motor_pins = dict(MOTOR_PINS)
         
         # 서브모터 각도 범위 (도)
-        self.angle_limits = {
-            'hip': (-45, 45),      # 힙: 좌우 회전
-            'knee': (-30, 60),     # 무릎: 앞뒤 굽힘
-            'ankle': (-20, 20)     # 발목: 미세 조정
-        }
-        
-        # 현재 모터 각도 상태
-        self.current_angles = {}
-        for motor_name in self.motor_pins:
-            self.current_angles[motor_name] = 0
+        self.angle_limits = dict(ANGLE_LIMITS)
         
         # 모터 제어 파라미터
         self.motor_speed = 1.0      # 각도/프레임
         self.recovery_threshold = 5.0  # 복구 시작 임계값 (도)
         
-        # GPIO 초기화
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setwarnings(False)
-            
-            # 모든 모터 핀을 출력으로 설정
-            for pin in self.motor_pins.values():
-                GPIO.setup(pin, GPIO.OUT)
-            
-            # PWM 객체 생성 (서브모터 제어용)
-            self.pwm_objects = {}
-            for motor_name, pin in self.motor_pins.items():
-                self.pwm_objects[motor_name] = GPIO.PWM(pin, 50)  # 50Hz
-                self.pwm_objects[motor_name].start(0)
-            
-            print("모터 GPIO 초기화 완료")
-        except ImportError:
-            print("RPi.GPIO 모듈을 찾을 수 없습니다. 시뮬레이션 모드로 실행됩니다.")
-            self.simulation_mode = True
-        except Exception as e:
-            print(f"GPIO 초기화 오류: {e}")
+        # 공유 액추에이터 핸들 (PWM 채널과 관절 상태는 관리자가 소유)
+        # backend: 'gpio' (기본), 'pca9685', 'simulation' 또는 백엔드 객체
+        self.actuator = actuator if actuator is not None else get_actuator_manager(backend).acquire('motor')
+        if self.actuator.simulation_mode:
             self.simulation_mode = True
+        
+        # 키프레임 트랙 실행기 (관절 그룹 동시 구동)
+        self.keyframe_executor = KeyframeExecutor(self.actuator)
+
+    @property
+    def current_angles(self):
+        """현재 모터 각도 상태"""
+        return self.actuator.get_angles()
 
     def set_motor_angle(self, motor_name, target_angle):
         """특정 모터의 각도를 설정"""
-        if motor_name not in self.motor_pins:
-            print(f"알 수 없는 모터: {motor_name}")
-            return False
-        
-        # 각도 제한 확인
-        motor_type = motor_name.split('_')[-1]  # hip, knee, ankle
-        min_angle, max_angle = self.angle_limits[motor_type]
-        target_angle = max(min_angle, min(max_angle, target_angle))
-        
-        # 서브모터 각도 제어 (0도 = 2.5% duty cycle, 180도 = 12.5% duty cycle)
-        duty_cycle = 2.5 + (target_angle / 180.0) * 10.0
-        
-        try:
-            if not hasattr(self, 'simulation_mode'):
-                # 실제 하드웨어 제어
-                self.pwm_objects[motor_name].ChangeDutyCycle(duty_cycle)
-                time.sleep(0.1)  # 서브모터 안정화 시간
-                self.pwm_objects[motor_name].ChangeDutyCycle(0)  # 신호 정지
-            else:
-                # 시뮬레이션 모드
-                print(f"시뮬레이션: {motor_name} 모터를 {target_angle}도로 설정")
-            
-            self.current_angles[motor_name] = target_angle
-            return True
-            
-        except Exception as e:
-            print(f"모터 {motor_name} 제어 오류: {e}")
-            return False
+        return self.set_pose({motor_name: target_angle})
+
+    def set_pose(self, targets):
+        """여러 모터의 목표 각도를 한 제어 프레임에 설정 (targets: {모터 이름: 각도})"""
+        for motor_name in targets:
+            if motor_name not in self.motor_pins:
+                print(f"알 수 없는 모터: {motor_name}")
+                return False
+
+        return self.actuator.write_frame(targets)
 
     def set_motor_power(self, power):
         """모터 파워 조정 (0.0 ~ 1.0)"""
         power = max(0.0, min(1.0, power))
         self.motor_speed = power * 2.0  # 최대 2도/프레임
         
-        # 모든 모터의 속도 조정
-        for motor_name in self.motor_pins:
-            if hasattr(self, 'pwm_objects') and motor_name in self.pwm_objects:
-                # PWM 주파수 조정으로 속도 제어
-                new_freq = 50 + int(power * 100)  # 50Hz ~ 150Hz
-                try:
-                    self.pwm_objects[motor_name].ChangeFrequency(new_freq)
-                except:
-                    pass
+        # 모든 모터의 속도 조정 (궤적 속도 제한 배율, PWM 주파수는 50Hz 유지)
+        self.actuator.set_velocity_scale(power)
         
         print(f"모터 파워를 {power:.2f}로 설정")
 
@@ -122,21 +64,27 @@ class BodyActivateMotor:
             print("균형이 정상 범위 내에 있습니다.")
             return True
         
-        # 복구 시퀀스 실행
+        # 복구 시퀀스를 키프레임 트랙으로 변환하여 한 타임라인에서 실행
         recovery_sequence = self._calculate_recovery_sequence(roll_error, pitch_error)
+        track = compile_keyframe_track(recovery_sequence)
         
-        for step in recovery_sequence:
-            motor_name, target_angle, delay = step
-            success = self.set_motor_angle(motor_name, target_angle)
-            if success:
-                time.sleep(delay)
-            else:
-                print(f"복구 단계 실패: {motor_name}")
-                return False
+        if not self.play_keyframe_track(track):
+            print("균형 복구 실패")
+            return False
         
-        print("균형 복구 완료")
+        print(f"균형 복구 완료 ({self.keyframe_executor.last_play_duration * 1000:.0f}ms)")
         return True
 
+    def play_keyframe_track(self, track):
+        """키프레임 트랙 재생 (같은 키프레임의 관절은 동시에 이동)"""
+        for _, targets in track.keyframes:
+            for motor_name in targets:
+                if motor_name not in self.motor_pins:
+                    print(f"알 수 없는 모터: {motor_name}")
+                    return False
+        
+        return self.keyframe_executor.play(track)
+
     def _calculate_recovery_sequence(self, roll_error, pitch_error):
         """복구 시퀀스 계산"""
         sequence = []
@@ -182,43 +130,30 @@ class BodyActivateMotor:
         return sequence
 
     def emergency_stop(self):
-        """비상 정지 - 모든 모터를 중립 위치로"""
-        print("비상 정지 실행")
-        
-        for motor_name in self.motor_pins:
-            self.set_motor_angle(motor_name, 0)
+        """비상 정지 - 진행 중인 시퀀스를 취소하고 모든 모터를 중립 위치로 (지연 시간 ms 반환)"""
+        # 모든 모터를 한 번의 일괄 출력으로 중립 위치에 고정 (PWM은 유지하여 자세 보존)
+        latency_ms = self.actuator.emergency_stop()
         
-        # PWM 신호 정지
-        if hasattr(self, 'pwm_objects'):
-            for pwm in self.pwm_objects.values():
-                try:
-                    pwm.stop()
-                except:
-                    pass
-        
-        print("모든 모터가 중립 위치로 이동되었습니다.")
+        print(f"비상 정지 실행: 모든 모터가 중립 위치로 이동되었습니다. (지연 {latency_ms:.2f}ms)")
+        return latency_ms
+
+    def clear_emergency_stop(self):
+        """비상 정지 해제"""
+        self.actuator.clear_emergency_stop()
+        print("비상 정지가 해제되었습니다.")
 
     def get_motor_status(self):
         """모터 상태 정보 반환"""
         return {
             'current_angles': self.current_angles.copy(),
             'motor_speed': self.motor_speed,
+            'emergency_stopped': self.actuator.stop_requested,
+            'write_stats': self.actuator.get_write_stats(),
             'recovery_threshold': self.recovery_threshold
         }
 
     def cleanup(self):
         """리소스 정리"""
-        if hasattr(self, 'pwm_objects'):
-            for pwm in self.pwm_objects.values():
-                try:
-                    pwm.stop()
-                except:
-                    pass
-        
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.cleanup()
-        except:
-            pass
+        self.actuator.release()
         
         print("모터 리소스 정리 완료") 
@@ -1,9 +1,11 @@
+from actuator_manager import get_actuator_manager
+
 class BodyActivateSteering:
     """
     조향 기능 → 다리 두 개 사용 시 균형 고려 조정
     서브모터를 사용한 정밀한 조향 제어
     """
-    def __init__(self):
+    def __init__(self, actuator=None):
         # 조향 모터 핀 설정
         self.steering_motor_pins = {
             'front_left_hip': 17,      # 앞왼쪽 힙 회전
@@ -14,8 +16,8 @@ class BodyActivateSteering:
         
         # 조향 제어 파라미터
         self.max_steering_angle = 30.0  # 최대 조향 각도 (도)
-        self.steering_speed = 2.0       # 조향 속도 (도/프레임)
         self.balance_threshold = 3.0    # 균형 임계값 (도)
+        self.hip_steering_gain = 0.5    # 조향 1도당 힙 회전 (도), 최대 조향에서 ±15도
         
         # 현재 조향 상태
         self.current_steering = 0.0     # 현재 조향 각도
@@ -29,28 +31,9 @@ class BodyActivateSteering:
             'yaw_offset': 0.0           # Yaw 축 오프셋
         }
         
-        # GPIO 초기화
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setwarnings(False)
-            
-            # 조향 모터 핀을 출력으로 설정
-            for pin in self.steering_motor_pins.values():
-                GPIO.setup(pin, GPIO.OUT)
-            
-            # PWM 객체 생성
-            self.pwm_objects = {}
-            for motor_name, pin in self.steering_motor_pins.items():
-                self.pwm_objects[motor_name] = GPIO.PWM(pin, 50)  # 50Hz
-                self.pwm_objects[motor_name].start(0)
-            
-            print("조향 모터 GPIO 초기화 완료")
-        except ImportError:
-            print("RPi.GPIO 모듈을 찾을 수 없습니다. 시뮬레이션 모드로 실행됩니다.")
-            self.simulation_mode = True
-        except Exception as e:
-            print(f"GPIO 초기화 오류: {e}")
+        # 공유 액추에이터 핸들 (PWM 채널과 관절 상태는 관리자가 소유)
+        self.actuator = actuator if actuator is not None else get_actuator_manager().acquire('steering')
+        if self.actuator.simulation_mode:
             self.simulation_mode = True
 
     def adjust_steering(self, target_angle, speed_factor=1.0):
@@ -64,16 +47,10 @@ class BodyActivateSteering:
         self.target_steering = target_angle
         self.is_steering = True
         
-        # 조향 방향 결정
-        steering_direction = 1 if target_angle > self.current_steering else -1
-        
-        # 조향 속도 계산
-        adjusted_speed = self.steering_speed * speed_factor
-        
         print(f"조향 조정: {self.current_steering:.1f}° → {target_angle:.1f}°")
         
-        # 조향 실행
-        success = self._execute_steering(steering_direction, adjusted_speed)
+        # 조향 실행 (현재 조향과의 차이만큼 힙 회전)
+        success = self._execute_steering(target_angle - self.current_steering, speed_factor)
         
         if success:
             self.current_steering = target_angle
@@ -81,60 +58,34 @@ class BodyActivateSteering:
         
         return success
 
-    def _execute_steering(self, direction, speed):
-        """조향 실행"""
+    def _execute_steering(self, steering_change, speed_factor=1.0):
+        """조향 실행 (궤적으로 이동, 즉시 반환)"""
         try:
-            # 조향 각도에 따른 다리 위치 조정
-            steering_sequence = self._calculate_steering_sequence(direction, speed)
+            # 조향 각도에 따른 다리 위치 조정 (진행 중인 조향 목표 기준으로 누적)
+            steering_sequence = self._calculate_steering_sequence(steering_change)
             
-            for step in steering_sequence:
-                motor_name, angle_offset, delay = step
-                
-                if motor_name in self.pwm_objects:
-                    # 서브모터 각도 제어
-                    current_angle = self._get_current_motor_angle(motor_name)
-                    target_angle = current_angle + angle_offset
-                    
-                    # PWM 신호 생성
-                    duty_cycle = 2.5 + (target_angle / 180.0) * 10.0
-                    self.pwm_objects[motor_name].ChangeDutyCycle(duty_cycle)
-                    
-                    time.sleep(delay)
-                    self.pwm_objects[motor_name].ChangeDutyCycle(0)  # 신호 정지
-                else:
-                    # 시뮬레이션 모드
-                    print(f"시뮬레이션: {motor_name} 조향 {angle_offset}도")
-                    time.sleep(delay)
+            targets = {}
+            for motor_name, angle_offset in steering_sequence:
+                targets[motor_name] = self.actuator.get_target(motor_name) + angle_offset
             
-            return True
+            return self.actuator.move_to(targets, speed_factor)
             
         except Exception as e:
             print(f"조향 실행 오류: {e}")
             return False
 
-    def _calculate_steering_sequence(self, direction, speed):
-        """조향 시퀀스 계산"""
-        sequence = []
-        
-        # 조향 각도에 따른 다리 조정
-        if direction > 0:  # 오른쪽으로 조향
-            # 왼쪽 다리들을 앞으로, 오른쪽 다리들을 뒤로
-            sequence.extend([
-                ('front_left_hip', 15, 0.1),
-                ('back_left_hip', 15, 0.1),
-                ('front_right_hip', -15, 0.1),
-                ('back_right_hip', -15, 0.1)
-            ])
-        else:  # 왼쪽으로 조향
-            # 오른쪽 다리들을 앞으로, 왼쪽 다리들을 뒤로
-            sequence.extend([
-                ('front_right_hip', 15, 0.1),
-                ('back_right_hip', 15, 0.1),
-                ('front_left_hip', -15, 0.1),
-                ('back_left_hip', -15, 0.1)
-            ])
-        
-        return sequence
+    def _calculate_steering_sequence(self, steering_change):
+        """
+        조향 시퀀스 계산 (steering_change: 조향 각도 변화, 양수면 오른쪽)
+        오른쪽 조향은 왼쪽 다리들을 앞으로, 오른쪽 다리들을 뒤로 (변화량에 비례)
+        """
+        offset = steering_change * self.hip_steering_gain
+        return [
+            ('front_left_hip', offset),
+            ('back_left_hip', offset),
+            ('front_right_hip', -offset),
+            ('back_right_hip', -offset)
+        ]
 
     def balance_for_two_legs(self, roll_error, pitch_error, yaw_error):
         """두 다리 균형 조정"""
@@ -215,34 +166,23 @@ class BodyActivateSteering:
         }
         
         if leg_group in leg_motors:
+            targets = {}
             for motor_name in leg_motors[leg_group]:
-                if motor_name in self.pwm_objects:
-                    current_angle = self._get_current_motor_angle(motor_name)
-                    target_angle = current_angle + angle
-                    
-                    duty_cycle = 2.5 + (target_angle / 180.0) * 10.0
-                    self.pwm_objects[motor_name].ChangeDutyCycle(duty_cycle)
-                    time.sleep(0.1)
-                    self.pwm_objects[motor_name].ChangeDutyCycle(0)
+                targets[motor_name] = self._get_current_motor_angle(motor_name) + angle
+            self.actuator.write_frame(targets)
 
     def _adjust_leg_rotation(self, angle):
         """다리 회전 조정"""
         hip_motors = ['front_left_hip', 'front_right_hip', 'back_left_hip', 'back_right_hip']
         
+        targets = {}
         for motor_name in hip_motors:
-            if motor_name in self.pwm_objects:
-                current_angle = self._get_current_motor_angle(motor_name)
-                target_angle = current_angle + angle
-                
-                duty_cycle = 2.5 + (target_angle / 180.0) * 10.0
-                self.pwm_objects[motor_name].ChangeDutyCycle(duty_cycle)
-                time.sleep(0.1)
-                self.pwm_objects[motor_name].ChangeDutyCycle(0)
+            targets[motor_name] = self._get_current_motor_angle(motor_name) + angle
+        self.actuator.write_frame(targets)
 
     def _get_current_motor_angle(self, motor_name):
-        """모터 현재 각도 반환 (시뮬레이션용)"""
-        # 실제 구현에서는 모터 인코더나 센서에서 읽어와야 함
-        return 0.0
+        """모터 현재 각도 반환"""
+        return self.actuator.get_angle(motor_name)
 
     def get_steering_status(self):
         """조향 상태 정보 반환"""
@@ -257,19 +197,14 @@ class BodyActivateSteering:
         """조향을 중립 위치로 리셋"""
         return self.adjust_steering(0.0)
 
+    def clear_steering_state(self):
+        """비상 정지 후 조향 상태 초기화 (힙 관절은 이미 중립 위치)"""
+        self.current_steering = 0.0
+        self.target_steering = 0.0
+        self.is_steering = False
+
     def cleanup(self):
         """리소스 정리"""
-        if hasattr(self, 'pwm_objects'):
-            for pwm in self.pwm_objects.values():
-                try:
-                    pwm.stop()
-                except:
-                    pass
-        
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.cleanup()
-        except:
-            pass
+        self.actuator.release()
         
-        print("조향 모터 리소스 정리 완료") 
+        print("조향 모터 리소스 정리 완료") 
\ No newline at end of file
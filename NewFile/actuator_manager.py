@@ -0,0 +1,321 @@
+import threading
+import time
+from servo_bus import ServoCommandBus, DEFAULT_WRITE_DEADBAND
+from joint_pose import new_pose, new_mask, pose_from_dict
+from joint_trajectory import JointTrajectoryEngine
+from control_clock import SYSTEM_CLOCK
+
+
+# 비상 정지 지연 시간 예산 (ms)
+EMERGENCY_STOP_BUDGET_MS = 10.0
+
+
+class ActuatorManager:
+    """
+    프로세스 전역 액추에이터 관리자
+    PWM 채널을 한 번만 소유하고 관절 상태 벡터의 유일한 원본을 유지
+    """
+    def __init__(self, backend=None, control_rate=50, write_deadband=DEFAULT_WRITE_DEADBAND, calibration=None):
+        # 서보 명령 버스 (모든 PWM 채널 소유, 보정 테이블 변환, 데드밴드 이내 중복 출력 억제)
+        self.servo_bus = ServoCommandBus(backend, write_deadband, calibration)
+        self.simulation_mode = self.servo_bus.simulation_mode
+
+        # 제어 시계 (가상 시계를 가진 백엔드면 그 시계를 공유)
+        self.clock = getattr(self.servo_bus.backend, 'clock', None) or SYSTEM_CLOCK
+
+        # 관절 궤적 실행기 (최초 사용 시 생성)
+        self.control_rate = control_rate
+        self.trajectory = None
+
+        # 비상 정지 상태 (설정되면 진행 중인 시퀀스 취소, 일반 출력 차단)
+        self.stop_event = threading.Event()
+        self.last_stop_latency_ms = None
+        self._neutral_pose = new_pose()
+        self._all_joints = new_mask(True)
+
+        # 활성 핸들 목록
+        self.handles = []
+        self._lock = threading.RLock()
+
+    def acquire(self, owner):
+        """컨트롤러용 경량 핸들 발급"""
+        with self._lock:
+            handle = ActuatorHandle(self, owner)
+            self.handles.append(handle)
+            return handle
+
+    def release(self, handle):
+        """핸들 반환 (마지막 핸들이 반환되면 리소스 정리)"""
+        with self._lock:
+            if handle in self.handles:
+                self.handles.remove(handle)
+
+            if not self.handles:
+                if self.trajectory is not None:
+                    self.trajectory.stop()
+                self.servo_bus.cleanup()
+                _clear_actuator_manager(self)
+                print("액추에이터 관리자 리소스 정리 완료")
+
+    def write_frame(self, targets):
+        """관절 목표 각도를 한 프레임으로 즉시 출력 (targets: {관절: 각도})"""
+        try:
+            pose, mask = pose_from_dict(targets, self.servo_bus.current_angles)
+        except KeyError as e:
+            print(f"알 수 없는 모터: {e.args[0]}")
+            return False
+        return self.write_pose(pose, mask)
+
+    def write_pose(self, pose, mask=None):
+        """자세 벡터를 한 프레임으로 즉시 출력 (진행 중인 궤적은 출력 각도로 고정)"""
+        with self._lock:
+            if self.stop_event.is_set():
+                return False
+            success = self.servo_bus.write_pose(pose, mask)
+            if success and self.trajectory is not None:
+                self.trajectory.hold(self.servo_bus.current_angles, self._all_joints if mask is None else mask)
+            return success
+
+    def _write_trajectory_pose(self, pose, mask):
+        """궤적 실행기의 틱 출력"""
+        with self._lock:
+            if self.stop_event.is_set():
+                return False
+            return self.servo_bus.write_pose(pose, mask)
+
+    def _get_trajectory(self):
+        with self._lock:
+            if self.trajectory is None:
+                self.trajectory = JointTrajectoryEngine(
+                    self._write_trajectory_pose,
+                    self.servo_bus.current_angles,
+                    self.control_rate,
+                    clock=self.clock
+                )
+            return self.trajectory
+
+    def move_to(self, targets, speed_factor=1.0, max_velocity=None):
+        """관절을 부드러운 궤적으로 목표까지 이동 (즉시 반환)"""
+        if self.stop_event.is_set():
+            return False
+        try:
+            pose, mask = pose_from_dict(targets)
+        except KeyError as e:
+            print(f"알 수 없는 모터: {e.args[0]}")
+            return False
+        self._get_trajectory().set_target_pose(pose, mask, speed_factor, max_velocity)
+        return True
+
+    def move_pose(self, pose, mask=None, speed_factor=1.0, max_velocity=None):
+        """자세 벡터 목표로 부드럽게 이동 (즉시 반환)"""
+        if self.stop_event.is_set():
+            return False
+        self._get_trajectory().set_target_pose(pose, self._all_joints if mask is None else mask, speed_factor, max_velocity)
+        return True
+
+    def get_target(self, joint_name):
+        """관절의 목표 각도 반환 (궤적이 없으면 현재 각도)"""
+        if self.trajectory is None:
+            return self.servo_bus.get_angle(joint_name)
+        return self.trajectory.get_target(joint_name)
+
+    def set_velocity_scale(self, scale):
+        """궤적 속도 배율 설정"""
+        self._get_trajectory().set_velocity_scale(scale)
+
+    def wait_until_settled(self, timeout=None):
+        """진행 중인 궤적이 끝날 때까지 대기"""
+        if self.trajectory is None:
+            return True
+        return self.trajectory.wait_until_settled(timeout)
+
+    def get_angle(self, joint_name):
+        """관절 현재 각도 반환"""
+        return self.servo_bus.get_angle(joint_name)
+
+    def get_angles(self):
+        """전체 관절 각도 반환"""
+        return self.servo_bus.get_angles()
+
+    def get_pose(self):
+        """현재 자세 벡터 복사본 반환"""
+        return self.servo_bus.get_pose()
+
+    def get_write_stats(self):
+        """서보 채널 출력/억제 통계 반환"""
+        return self.servo_bus.get_write_stats()
+
+    def stop(self):
+        """PWM 신호 정지"""
+        with self._lock:
+            self.servo_bus.stop()
+
+    def emergency_stop(self):
+        """
+        선점형 비상 정지
+        진행 중인 시퀀스/궤적을 취소하고 모든 채널을 한 번의 일괄 출력으로 중립 위치에 고정,
+        측정된 정지 지연 시간(ms)을 반환
+        """
+        start = time.perf_counter()
+
+        # 대기 중인 시퀀스를 깨우고 이후 일반 출력을 차단
+        self.stop_event.set()
+
+        with self._lock:
+            if self.trajectory is not None:
+                self.trajectory.hold(self._neutral_pose, self._all_joints)
+            self.servo_bus.write_pose(self._neutral_pose, force=True)
+
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        self.last_stop_latency_ms = latency_ms
+
+        if latency_ms > EMERGENCY_STOP_BUDGET_MS:
+            print(f"경고: 비상 정지 지연 {latency_ms:.2f}ms (예산 {EMERGENCY_STOP_BUDGET_MS}ms 초과)")
+        return latency_ms
+
+    def clear_emergency_stop(self):
+        """비상 정지 해제 (일반 출력 재개)"""
+        self.stop_event.clear()
+
+    def wait(self, timeout):
+        """시퀀스 단계 간 대기 (비상 정지 시 즉시 깨어나 True 반환)"""
+        return self.clock.wait(self.stop_event, timeout)
+
+    def get_status(self):
+        """관리자 상태 정보 반환"""
+        return {
+            'owners': [handle.owner for handle in self.handles],
+            'frame_count': self.servo_bus.frame_count,
+            'issued_writes': self.servo_bus.issued_writes,
+            'suppressed_writes': self.servo_bus.suppressed_writes,
+            'simulation_mode': self.simulation_mode,
+            'emergency_stopped': self.stop_event.is_set(),
+            'last_stop_latency_ms': self.last_stop_latency_ms
+        }
+
+
+class ActuatorHandle:
+    """
+    컨트롤러용 액추에이터 핸들
+    상태를 따로 갖지 않고 공유 관리자에 위임
+    """
+    __slots__ = ('manager', 'owner', 'released')
+
+    def __init__(self, manager, owner):
+        self.manager = manager
+        self.owner = owner
+        self.released = False
+
+    @property
+    def simulation_mode(self):
+        return self.manager.simulation_mode
+
+    def write_frame(self, targets):
+        """관절 목표 각도를 한 프레임으로 출력"""
+        return self.manager.write_frame(targets)
+
+    def get_angle(self, joint_name):
+        """관절 현재 각도 반환"""
+        return self.manager.get_angle(joint_name)
+
+    def get_angles(self):
+        """전체 관절 각도 반환"""
+        return self.manager.get_angles()
+
+    def write_pose(self, pose, mask=None):
+        """자세 벡터를 한 프레임으로 출력"""
+        return self.manager.write_pose(pose, mask)
+
+    def move_pose(self, pose, mask=None, speed_factor=1.0, max_velocity=None):
+        """자세 벡터 목표로 부드럽게 이동 (즉시 반환)"""
+        return self.manager.move_pose(pose, mask, speed_factor, max_velocity)
+
+    def get_pose(self):
+        """현재 자세 벡터 복사본 반환"""
+        return self.manager.get_pose()
+
+    def get_write_stats(self):
+        """서보 채널 출력/억제 통계 반환"""
+        return self.manager.get_write_stats()
+
+    @property
+    def control_rate(self):
+        return self.manager.control_rate
+
+    @property
+    def clock(self):
+        return self.manager.clock
+
+    @property
+    def write_deadband(self):
+        """중복 출력 억제 데드밴드 (도)"""
+        return self.manager.servo_bus.deadband
+
+    def move_to(self, targets, speed_factor=1.0, max_velocity=None):
+        """관절을 부드러운 궤적으로 목표까지 이동 (즉시 반환)"""
+        return self.manager.move_to(targets, speed_factor, max_velocity)
+
+    def get_target(self, joint_name):
+        """관절의 목표 각도 반환"""
+        return self.manager.get_target(joint_name)
+
+    def set_velocity_scale(self, scale):
+        """궤적 속도 배율 설정"""
+        self.manager.set_velocity_scale(scale)
+
+    def wait_until_settled(self, timeout=None):
+        """진행 중인 궤적이 끝날 때까지 대기"""
+        return self.manager.wait_until_settled(timeout)
+
+    def stop(self):
+        """PWM 신호 정지"""
+        self.manager.stop()
+
+    @property
+    def stop_requested(self):
+        return self.manager.stop_event.is_set()
+
+    def emergency_stop(self):
+        """선점형 비상 정지 (정지 지연 시간 ms 반환)"""
+        return self.manager.emergency_stop()
+
+    def clear_emergency_stop(self):
+        """비상 정지 해제"""
+        self.manager.clear_emergency_stop()
+
+    def wait(self, timeout):
+        """시퀀스 단계 간 대기 (비상 정지 시 True 반환)"""
+        return self.manager.wait(timeout)
+
+    def release(self):
+        """핸들 반환"""
+        if not self.released:
+            self.released = True
+            self.manager.release(self)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_actuator_manager(backend=None):
+    """
+    프로세스 전역 액추에이터 관리자 반환 (backend는 최초 생성 시에만 사용)
+    이미 생성된 관리자와 다른 백엔드(이름은 종류로, 객체는 동일성으로 비교)를 지정하면 ValueError
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ActuatorManager(backend)
+        elif backend is not None and not _manager.servo_bus.uses_backend(backend):
+            current = _manager.servo_bus.backend_kind or type(_manager.servo_bus.backend).__name__
+            raise ValueError(f"액추에이터 관리자가 이미 다른 백엔드({current})로 생성되어 있습니다: {backend}")
+        return _manager
+
+
+def _clear_actuator_manager(manager):
+    """전역 관리자 해제"""
+    global _manager
+    with _manager_lock:
+        if _manager is manager:
+            _manager = None
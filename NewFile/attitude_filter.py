@@ -0,0 +1,411 @@
+import abc
+import math
+import time
+import numpy as np
+
+
+def accel_angles(accel):
+    """가속도 (N, 3) → 중력 방향 기준 (roll, pitch) 배열 (도)"""
+    roll = np.degrees(np.arctan2(accel[:, 1], accel[:, 2]))
+    pitch = np.degrees(np.arctan2(-accel[:, 0], np.hypot(accel[:, 1], accel[:, 2])))
+    return roll, pitch
+
+
+def linear_recurrence(initial, gains, inputs, chunk=64):
+    """
+    x_k = gains_k * x_(k-1) + inputs_k 를 묶음 전체에 한 번에 계산
+    누적곱 닫힌 형태를 chunk 단위로 나눠 계산하여 언더플로 방지
+    """
+    result = np.empty(len(inputs))
+    gains = np.clip(gains, 1e-3, 1.0)
+    for start in range(0, len(inputs), chunk):
+        end = min(start + chunk, len(inputs))
+        products = np.cumprod(gains[start:end])
+        result[start:end] = products * (initial + np.cumsum(inputs[start:end] / products))
+        initial = result[end - 1]
+    return result
+
+
+class AttitudeFilter(abc.ABC):
+    """
+    자세 추정 필터 공통 동작
+    샘플 시각(초, 단조 시계) 차이로 dt를 측정하여 호출 주기가 달라져도 각도가 틀어지지 않음,
+    정지 상태(가속도 크기 ≈ 1g, 회전 속도 작음)에서 자이로 영점을 추적하여 yaw 표류를 줄임
+    입력 단위: 가속도 g, 자이로 도/초 / 출력: roll, pitch, yaw (도)
+    update()는 실수 연산만 쓰는 샘플 단위 경로, update_arrays()/update_block()은 FIFO 묶음 경로
+    """
+    name = None
+    batch_threshold = 16        # 이보다 작은 묶음은 샘플 단위 경로가 더 빠름 (NumPy 호출 고정 비용)
+
+    def __init__(self, sample_rate=100, max_dt=0.1, bias_time_constant=5.0, still_gyro=1.5, still_accel=0.05):
+        self.nominal_dt = 1.0 / sample_rate          # 첫 샘플 dt (초)
+        self.max_dt = max_dt                         # dt 상한 (오래 멈췄다 재개해도 적분이 튀지 않게)
+        self.bias_time_constant = bias_time_constant # 자이로 영점 추적 시정수 (정지 누적 시간, 초)
+        self.still_gyro = still_gyro                 # 정지 판정 회전 속도 (도/초)
+        self.still_accel = still_accel               # 정지 판정 가속도 크기 오차 (g)
+        self.reset()
+
+    def reset(self):
+        """필터 상태 초기화 (다음 샘플의 가속도로 roll/pitch 초기화)"""
+        self.roll = 0.0
+        self.pitch = 0.0
+        self.yaw = 0.0
+        self.gyro_bias = np.zeros(3)
+        self.last_timestamp = None
+        self.last_dt = self.nominal_dt
+        self.update_count = 0
+        self.still_count = 0
+
+    def _initialize(self, roll, pitch):
+        """첫 샘플 자세 설정 (필터별 내부 상태 포함)"""
+        self.roll = roll
+        self.pitch = pitch
+
+    @abc.abstractmethod
+    def _step(self, ax, ay, az, gx, gy, gz, dt):
+        """샘플 하나 적분 (영점을 뺀 자이로), (roll, pitch, yaw) 반환 (필터별 구현)"""
+
+    def _integrate(self, accel, gyro, dt):
+        """묶음 적분, 샘플별 (roll, pitch, yaw) (N, 3) 반환 (기본: 샘플 단위 경로 반복)"""
+        out = np.empty((len(dt), 3))
+        for i, row in enumerate(np.column_stack((accel, gyro, dt)).tolist()):
+            out[i] = self._step(*row)
+        return out
+
+    def _measure_dt(self, timestamps):
+        """샘플별 측정 dt 배열 ([0, max_dt]로 제한)"""
+        previous = self.last_timestamp if self.last_timestamp is not None else timestamps[0] - self.nominal_dt
+        dt = np.clip(np.diff(timestamps, prepend=previous), 0.0, self.max_dt)
+        self.last_timestamp = float(timestamps[-1])
+        self.last_dt = float(dt[-1])
+        return dt
+
+    def _track_bias(self, accel, gyro, dt):
+        """정지 샘플로 자이로 영점 갱신 후 영점을 뺀 자이로 반환"""
+        still = ((np.abs(np.linalg.norm(accel, axis=1) - 1.0) < self.still_accel)
+                 & (np.linalg.norm(gyro - self.gyro_bias, axis=1) < self.still_gyro))
+        if still.any():
+            gain = 1.0 - math.exp(-dt[still].sum() / self.bias_time_constant)
+            self.gyro_bias += gain * (gyro[still].mean(axis=0) - self.gyro_bias)
+            self.still_count += int(still.sum())
+        return gyro - self.gyro_bias
+
+    def update_arrays(self, timestamps, accel, gyro):
+        """시각 (N,), 가속도 (N, 3), 자이로 (N, 3) 묶음 갱신, 샘플별 (roll, pitch, yaw) (N, 3) 반환"""
+        if len(timestamps) == 0:
+            return np.empty((0, 3))
+        if len(timestamps) < self.batch_threshold:
+            rows = np.column_stack((timestamps, accel, gyro)).tolist()
+            return np.array([self.update(row[0], row[1:4], row[4:7]) for row in rows])
+        if self.update_count == 0:
+            roll, pitch = accel_angles(accel[:1])
+            self._initialize(float(roll[0]), float(pitch[0]))
+
+        dt = self._measure_dt(np.asarray(timestamps, dtype=float))
+        gyro = self._track_bias(accel, gyro, dt)
+        angles = self._integrate(accel, gyro, dt)
+        self.roll, self.pitch, self.yaw = angles[-1].tolist()
+        self.update_count += len(timestamps)
+        return angles
+
+    def update(self, timestamp, accel, gyro):
+        """샘플 하나 갱신 (가속도/자이로 (x, y, z)), (roll, pitch, yaw) 반환"""
+        ax, ay, az = float(accel[0]), float(accel[1]), float(accel[2])
+        gx, gy, gz = float(gyro[0]), float(gyro[1]), float(gyro[2])
+        if self.update_count == 0:
+            self._initialize(math.degrees(math.atan2(ay, az)), math.degrees(math.atan2(-ax, math.hypot(ay, az))))
+
+        previous = self.last_timestamp if self.last_timestamp is not None else timestamp - self.nominal_dt
+        dt = min(max(timestamp - previous, 0.0), self.max_dt)
+        self.last_timestamp = timestamp
+        self.last_dt = dt
+
+        # 정지 샘플이면 자이로 영점 갱신
+        bx, by, bz = self.gyro_bias.tolist()
+        if (abs(math.sqrt(ax * ax + ay * ay + az * az) - 1.0) < self.still_accel
+                and math.sqrt((gx - bx) ** 2 + (gy - by) ** 2 + (gz - bz) ** 2) < self.still_gyro):
+            gain = 1.0 - math.exp(-dt / self.bias_time_constant)
+            bx, by, bz = bx + gain * (gx - bx), by + gain * (gy - by), bz + gain * (gz - bz)
+            self.gyro_bias = np.array([bx, by, bz])
+            self.still_count += 1
+
+        self.roll, self.pitch, self.yaw = self._step(ax, ay, az, gx - bx, gy - by, gz - bz, dt)
+        self.update_count += 1
+        return self.roll, self.pitch, self.yaw
+
+    def update_block(self, block):
+        """FIFO 묶음 ((N, 8), 열: 시각, 가속도 x/y/z, 자이로 x/y/z, 온도) 갱신"""
+        return self.update_arrays(block[:, 0], block[:, 1:4], block[:, 4:7])
+
+    def get_angles(self):
+        return {'roll': self.roll, 'pitch': self.pitch, 'yaw': self.yaw}
+
+    def get_status(self):
+        """필터 상태 정보 반환"""
+        return {
+            'name': self.name,
+            'angles': self.get_angles(),
+            'update_count': self.update_count,
+            'last_dt': self.last_dt,
+            'gyro_bias': self.gyro_bias.tolist(),
+            'still_count': self.still_count
+        }
+
+
+class ComplementaryFilter(AttitudeFilter):
+    """
+    상보필터 (roll/pitch: 자이로 적분 + 가속도 각도 혼합, yaw: 자이로 적분)
+    혼합 계수는 시정수로 정하여 dt마다 alpha = tau / (tau + dt) (100Hz에서 0.96 ↔ tau 0.24초)
+    선형 점화식이므로 묶음은 누적곱 닫힌 형태로 한 번에 계산
+    """
+    name = 'complementary'
+
+    def __init__(self, time_constant=0.24, **kwargs):
+        self.time_constant = time_constant
+        super().__init__(**kwargs)
+
+    def _step(self, ax, ay, az, gx, gy, gz, dt):
+        alpha = self.time_constant / (self.time_constant + dt)
+        accel_roll = math.degrees(math.atan2(ay, az))
+        accel_pitch = math.degrees(math.atan2(-ax, math.hypot(ay, az)))
+        return (alpha * (self.roll + gx * dt) + (1.0 - alpha) * accel_roll,
+                alpha * (self.pitch + gy * dt) + (1.0 - alpha) * accel_pitch,
+                self.yaw + gz * dt)
+
+    def _integrate(self, accel, gyro, dt):
+        alpha = self.time_constant / (self.time_constant + dt)
+        accel_roll, accel_pitch = accel_angles(accel)
+
+        angles = np.empty((len(dt), 3))
+        angles[:, 0] = linear_recurrence(self.roll, alpha, alpha * gyro[:, 0] * dt + (1.0 - alpha) * accel_roll)
+        angles[:, 1] = linear_recurrence(self.pitch, alpha, alpha * gyro[:, 1] * dt + (1.0 - alpha) * accel_pitch)
+        angles[:, 2] = self.yaw + np.cumsum(gyro[:, 2] * dt)
+        return angles
+
+
+def _quaternion_from_euler(roll, pitch, yaw=0.0):
+    cr, sr = math.cos(math.radians(roll) / 2), math.sin(math.radians(roll) / 2)
+    cp, sp = math.cos(math.radians(pitch) / 2), math.sin(math.radians(pitch) / 2)
+    cy, sy = math.cos(math.radians(yaw) / 2), math.sin(math.radians(yaw) / 2)
+    return [cr * cp * cy + sr * sp * sy, sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy, cr * cp * sy - sr * sp * cy]
+
+
+class MadgwickFilter(AttitudeFilter):
+    """
+    Madgwick 자세 필터 (6축, 쿼터니언 경사 하강 보정)
+    쿼터니언 점화식은 비선형이므로 묶음 경로도 dt/영점 처리만 일괄 계산하고 샘플 단위 실수 연산으로 진행
+    """
+    name = 'madgwick'
+
+    def __init__(self, beta=0.05, **kwargs):
+        self.beta = beta            # 가속도 보정 이득 (rad/s)
+        super().__init__(**kwargs)
+
+    def reset(self):
+        super().reset()
+        self.quaternion = [1.0, 0.0, 0.0, 0.0]
+
+    def _initialize(self, roll, pitch):
+        super()._initialize(roll, pitch)
+        self.quaternion = _quaternion_from_euler(roll, pitch, self.yaw)
+
+    def _step(self, ax, ay, az, gx, gy, gz, dt):
+        gx, gy, gz = math.radians(gx), math.radians(gy), math.radians(gz)
+        q0, q1, q2, q3 = self.quaternion
+
+        # 자이로 쿼터니언 변화율
+        d0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        d1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        d2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        d3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+
+        norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if norm > 1e-6:
+            # 중력 방향 오차 경사 (목적 함수 기울기)
+            ax, ay, az = ax / norm, ay / norm, az / norm
+            s0 = 4 * q0 * q2 * q2 + 2 * q2 * ax + 4 * q0 * q1 * q1 - 2 * q1 * ay
+            s1 = (4 * q1 * q3 * q3 - 2 * q3 * ax + 4 * q0 * q0 * q1 - 2 * q0 * ay - 4 * q1
+                  + 8 * q1 * q1 * q1 + 8 * q1 * q2 * q2 + 4 * q1 * az)
+            s2 = (4 * q0 * q0 * q2 + 2 * q0 * ax + 4 * q2 * q3 * q3 - 2 * q3 * ay - 4 * q2
+                  + 8 * q2 * q1 * q1 + 8 * q2 * q2 * q2 + 4 * q2 * az)
+            s3 = 4 * q1 * q1 * q3 - 2 * q1 * ax + 4 * q2 * q2 * q3 - 2 * q2 * ay
+            norm = math.sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if norm > 0.0:
+                d0 -= self.beta * s0 / norm
+                d1 -= self.beta * s1 / norm
+                d2 -= self.beta * s2 / norm
+                d3 -= self.beta * s3 / norm
+
+        q0, q1, q2, q3 = q0 + d0 * dt, q1 + d1 * dt, q2 + d2 * dt, q3 + d3 * dt
+        norm = math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        q0, q1, q2, q3 = q0 / norm, q1 / norm, q2 / norm, q3 / norm
+        self.quaternion = [q0, q1, q2, q3]
+
+        roll = math.degrees(math.atan2(2 * (q0 * q1 + q2 * q3), 1 - 2 * (q1 * q1 + q2 * q2)))
+        pitch = math.degrees(math.asin(max(-1.0, min(1.0, 2 * (q0 * q2 - q3 * q1)))))
+        # yaw는 -180~180도로 감기지 않게 이전 값에 변화량만 더함
+        yaw = math.degrees(math.atan2(2 * (q0 * q3 + q1 * q2), 1 - 2 * (q2 * q2 + q3 * q3)))
+        self.yaw += (yaw - self.yaw + 180.0) % 360.0 - 180.0
+        self.roll, self.pitch = roll, pitch
+        return roll, pitch, self.yaw
+
+
+class AttitudeEKF(AttitudeFilter):
+    """
+    소형 확장 칼만 필터
+    상태: roll, pitch, 자이로 x/y 영점 (rad) / 예측: 오일러 각 운동학 / 측정: 가속도 중력 방향 각도
+    가속도 크기가 1g에서 벗어날수록 (충격, 보행 가속) 측정 잡음을 키워 보정을 약하게 함
+    묶음 경로는 dt/영점 처리만 일괄 계산하고 4x4 공분산 점화식은 샘플 단위로 진행
+    """
+    name = 'ekf'
+
+    def __init__(self, gyro_noise=0.5, bias_noise=0.02, accel_noise=2.0, accel_gate=10.0, **kwargs):
+        self.gyro_noise = math.radians(gyro_noise)      # 자이로 잡음 (도/초 → rad/s)
+        self.bias_noise = math.radians(bias_noise)      # 영점 변화 (도/초/√초 → rad)
+        self.accel_noise = math.radians(accel_noise)    # 가속도 각도 잡음 (도 → rad)
+        self.accel_gate = accel_gate                    # 1g 오차 0.1g당 측정 잡음 배율
+        super().__init__(**kwargs)
+
+    def reset(self):
+        super().reset()
+        self.state = np.zeros(4)
+        self.covariance = np.diag([0.1, 0.1, 0.01, 0.01])
+        self._yaw = 0.0
+        self._jacobian = np.eye(4)
+        self._process_noise = np.diag([self.gyro_noise ** 2, self.gyro_noise ** 2,
+                                       self.bias_noise ** 2, self.bias_noise ** 2])
+
+    def _initialize(self, roll, pitch):
+        super()._initialize(roll, pitch)
+        self.state[:2] = math.radians(roll), math.radians(pitch)
+
+    def _step(self, ax, ay, az, gx, gy, gz, dt):
+        x, P, F = self.state, self.covariance, self._jacobian
+        roll, pitch = x[0], x[1]
+        p, q, r = math.radians(gx) - x[2], math.radians(gy) - x[3], math.radians(gz)
+        sr, cr = math.sin(roll), math.cos(roll)
+        cp = math.cos(pitch)
+        cp = cp if abs(cp) > 1e-3 else math.copysign(1e-3, cp)
+        tp = math.sin(pitch) / cp
+
+        # 예측 (오일러 각 운동학)
+        x[0] += (p + (q * sr + r * cr) * tp) * dt
+        x[1] += (q * cr - r * sr) * dt
+        self._yaw += (q * sr + r * cr) / cp * dt
+        F[0, 0] = 1.0 + (q * cr - r * sr) * tp * dt
+        F[0, 1] = (q * sr + r * cr) / (cp * cp) * dt
+        F[0, 2] = -dt
+        F[0, 3] = -sr * tp * dt
+        F[1, 0] = -(q * sr + r * cr) * dt
+        F[1, 3] = -cr * dt
+        P = F @ P @ F.T + self._process_noise * dt
+
+        # 측정 갱신 (H = [I 0]), 1g에서 벗어난 만큼 측정 잡음 증가
+        gate = 1.0 + self.accel_gate * abs(math.sqrt(ax * ax + ay * ay + az * az) - 1.0) / 0.1
+        innovation = np.array([math.atan2(ay, az) - x[0], math.atan2(-ax, math.hypot(ay, az)) - x[1]])
+        innovation[0] = (innovation[0] + math.pi) % (2 * math.pi) - math.pi
+        S = P[:2, :2] + np.eye(2) * (self.accel_noise * gate) ** 2
+        K = P[:, :2] @ np.linalg.inv(S)
+        x += K @ innovation
+        self.covariance = P - K @ P[:2, :]
+        return math.degrees(x[0]), math.degrees(x[1]), math.degrees(self._yaw)
+
+
+ATTITUDE_FILTERS = {
+    ComplementaryFilter.name: ComplementaryFilter,
+    MadgwickFilter.name: MadgwickFilter,
+    AttitudeEKF.name: AttitudeEKF
+}
+
+
+def create_attitude_filter(name='complementary', **kwargs):
+    """이름으로 자세 필터 생성 ('complementary', 'madgwick', 'ekf')"""
+    if name not in ATTITUDE_FILTERS:
+        raise ValueError(f"알 수 없는 자세 필터: {name} (지원: {', '.join(ATTITUDE_FILTERS)})")
+    return ATTITUDE_FILTERS[name](**kwargs)
+
+
+def synthetic_motion(samples=3000, rate=70.0, jitter=0.3, still_time=3.0, seed=0):
+    """
+    벤치마크용 합성 IMU 데이터 (시각, 가속도 g, 자이로 도/초, 참 roll/pitch/yaw)
+    실제 샘플 간격은 rate(Hz) ± jitter 비율로 흔들리고, 처음 still_time초는 정지, 자이로에 영점 오차 포함
+    """
+    rng = np.random.default_rng(seed)
+    dt = (1.0 + rng.uniform(-jitter, jitter, samples)) / rate
+    t = np.cumsum(dt)
+    moving = np.clip((t - still_time) / 1.0, 0.0, 1.0)
+
+    roll = np.radians(10.0 * np.sin(2 * np.pi * 0.5 * t) * moving)
+    pitch = np.radians(6.0 * np.sin(2 * np.pi * 0.3 * t) * moving)
+    yaw_rate = np.radians(15.0) * moving
+    yaw = np.cumsum(yaw_rate * dt)
+    roll_rate = np.gradient(roll, t)
+    pitch_rate = np.gradient(pitch, t)
+
+    # 오일러 각 변화율 → 몸체 회전 속도
+    gyro = np.column_stack((
+        roll_rate - np.sin(pitch) * yaw_rate,
+        np.cos(roll) * pitch_rate + np.sin(roll) * np.cos(pitch) * yaw_rate,
+        -np.sin(roll) * pitch_rate + np.cos(roll) * np.cos(pitch) * yaw_rate
+    ))
+    gyro = np.degrees(gyro) + np.array([0.6, -0.4, 0.5]) + rng.normal(0.0, 0.2, (samples, 3))
+    accel = np.column_stack((-np.sin(pitch), np.sin(roll) * np.cos(pitch), np.cos(roll) * np.cos(pitch)))
+    accel += rng.normal(0.0, 0.01, (samples, 3))
+    truth = np.degrees(np.column_stack((roll, pitch, yaw)))
+    return t, accel, gyro, truth
+
+
+def benchmark_filters(samples=3000, block_sizes=(5, 73)):
+    """
+    필터별 샘플당 CPU 시간 (샘플 단위 갱신 / FIFO 묶음 크기별 갱신)과 정확도 비교
+    묶음 크기 5 = 100Hz 샘플을 20Hz로 비울 때, 73 = FIFO가 가득 찼을 때
+    기존 고정 dt(100Hz 가정) 상보필터를 기준선으로 포함
+    """
+    t, accel, gyro, truth = synthetic_motion(samples)
+    results = {}
+
+    # 기준선: dt = 1/100 고정, 영점 추적 없음
+    alpha = np.full(samples, 0.96)
+    accel_roll, accel_pitch = accel_angles(accel)
+    baseline = np.column_stack((
+        linear_recurrence(0.0, alpha, 0.96 * gyro[:, 0] * 0.01 + 0.04 * accel_roll),
+        linear_recurrence(0.0, alpha, 0.96 * gyro[:, 1] * 0.01 + 0.04 * accel_pitch),
+        np.cumsum(gyro[:, 2] * 0.01)
+    ))
+    results['fixed_dt_complementary'] = _accuracy(baseline, truth)
+
+    for name in ATTITUDE_FILTERS:
+        attitude_filter = create_attitude_filter(name)
+        start = time.perf_counter()
+        angles = np.array([attitude_filter.update(t[i], accel[i], gyro[i]) for i in range(samples)])
+        per_sample_us = (time.perf_counter() - start) / samples * 1e6
+
+        result = _accuracy(angles, truth)
+        result['per_sample_us'] = per_sample_us
+        for block_size in block_sizes:
+            attitude_filter = create_attitude_filter(name)
+            start = time.perf_counter()
+            blocks = [attitude_filter.update_arrays(t[i:i + block_size], accel[i:i + block_size],
+                                                    gyro[i:i + block_size])
+                      for i in range(0, samples, block_size)]
+            result[f'block{block_size}_us_per_sample'] = (time.perf_counter() - start) / samples * 1e6
+            result[f'block{block_size}_max_diff_deg'] = float(np.abs(np.vstack(blocks) - angles)[:, :2].max())
+        results[name] = result
+    return results
+
+
+def _accuracy(angles, truth):
+    error = angles - truth
+    return {
+        'roll_rms_deg': float(np.sqrt(np.mean(error[:, 0] ** 2))),
+        'pitch_rms_deg': float(np.sqrt(np.mean(error[:, 1] ** 2))),
+        'final_yaw_error_deg': float(error[-1, 2])
+    }
+
+
+if __name__ == "__main__":
+    for filter_name, result in benchmark_filters().items():
+        print(f"\n=== {filter_name} ===")
+        for key, value in result.items():
+            print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
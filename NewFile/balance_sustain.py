@@ -5,22 +5,27 @@ def maintain_balance():
     """
     import time
     import math
-    from detect_inclination import BodyDetectInclination
+    from imu_sampler import get_imu_sampler
     from activate_motor import BodyActivateMotor
     from activate_steering import BodyActivateSteering
+    from periodic_scheduler import PeriodicScheduler
     
     class BalanceSustainController:
         def __init__(self):
             # 하위 시스템 초기화
-            self.inclination_sensor = BodyDetectInclination()
             self.motor_controller = BodyActivateMotor()
             self.steering_controller = BodyActivateSteering()
+            self.clock = self.motor_controller.actuator.clock
+            
+            # 공유 IMU 샘플러 (센서 필터는 샘플러 스레드만 갱신, 안정화 대기 중에도 계속 샘플링)
+            self.imu_sampler = get_imu_sampler(self.clock).acquire('balance_sustain')
             
             # 균형 제어 파라미터
             self.balance_threshold = 3.0      # 균형 임계값 (도)
             self.correction_strength = 0.8    # 보정 강도 (0.0 ~ 1.0)
             self.update_rate = 50             # 업데이트 주기 (Hz)
             self.stabilization_time = 0.5     # 안정화 시간 (초)
+            self.scheduler = PeriodicScheduler(self.update_rate, self.clock, name='balance_sustain')
             
             # 균형 상태
             self.is_balanced = True
@@ -48,7 +53,13 @@ def maintain_balance():
             print("균형 모니터링 시작")
             
             try:
+                self.scheduler.start()
                 while True:
+                    # 비상 정지는 해제될 때까지 유지되고 모든 출력이 거부되므로 모니터링 종료
+                    if self.motor_controller.actuator.stop_requested:
+                        print("비상 정지 상태 - 균형 모니터링 종료")
+                        break
+                    
                     # 현재 균형 상태 확인
                     balance_status = self._check_balance_status()
                     
@@ -56,8 +67,8 @@ def maintain_balance():
                         # 균형 보정 실행
                         self._correct_balance(balance_status)
                     
-                    # 안정화 대기
-                    time.sleep(1.0 / self.update_rate)
+                    # 다음 주기 마감 시각까지 대기 (작업 시간과 무관하게 update_rate 유지)
+                    self.scheduler.wait_next()
                     
             except KeyboardInterrupt:
                 print("\n균형 모니터링 중단")
@@ -69,17 +80,17 @@ def maintain_balance():
         def _check_balance_status(self):
             """균형 상태 확인"""
             try:
-                # 센서 데이터 읽기
-                sensor_data = self.inclination_sensor.read_gyro()
+                # 최신 자세 샘플
+                sample = self.imu_sampler.wait_for_sample()
                 
-                if sensor_data is None:
+                if sample is None:
                     return {'is_balanced': False, 'error': '센서 데이터 읽기 실패'}
                 
                 # 현재 각도 가져오기
-                angles = sensor_data['angles']
-                roll = angles['roll']
-                pitch = angles['pitch']
-                yaw = angles['yaw']
+                roll = sample.roll
+                pitch = sample.pitch
+                yaw = sample.yaw
+                angles = {'roll': roll, 'pitch': pitch, 'yaw': yaw}
                 
                 # 균형 상태 판단
                 roll_balanced = abs(roll) <= self.balance_threshold
@@ -107,7 +118,7 @@ def maintain_balance():
         def _correct_balance(self, balance_status):
             """균형 보정 실행"""
             try:
-                current_time = time.time()
+                current_time = self.clock.now()
                 
                 # 보정 간격 확인
                 if current_time - self.last_correction_time < self.stabilization_time:
@@ -131,7 +142,7 @@ def maintain_balance():
                     
                     # 보정 기록 저장
                     correction_record = {
-                        'timestamp': current_time,
+                        'timestamp': time.time(),
                         'angles': angles,
                         'correction': correction_angles,
                         'success': success
@@ -214,35 +225,43 @@ def maintain_balance():
         
         def _apply_roll_correction(self, roll_correction):
             """Roll 축 보정 적용"""
-            # 좌우 다리 높이 조정
+            # 좌우 다리 높이 조정 (네 발목을 한 프레임에 동시 출력)
             if roll_correction > 0:  # 오른쪽으로 기울어짐
                 # 왼쪽 다리들을 높이고 오른쪽 다리들을 낮춤
-                self.motor_controller.set_motor_angle('front_left_ankle', 15)
-                self.motor_controller.set_motor_angle('back_left_ankle', 15)
-                self.motor_controller.set_motor_angle('front_right_ankle', -15)
-                self.motor_controller.set_motor_angle('back_right_ankle', -15)
+                self.motor_controller.set_pose({
+                    'front_left_ankle': 15,
+                    'back_left_ankle': 15,
+                    'front_right_ankle': -15,
+                    'back_right_ankle': -15
+                })
             else:  # 왼쪽으로 기울어짐
                 # 오른쪽 다리들을 높이고 왼쪽 다리들을 낮춤
-                self.motor_controller.set_motor_angle('front_right_ankle', 15)
-                self.motor_controller.set_motor_angle('back_right_ankle', 15)
-                self.motor_controller.set_motor_angle('front_left_ankle', -15)
-                self.motor_controller.set_motor_angle('back_left_ankle', -15)
+                self.motor_controller.set_pose({
+                    'front_right_ankle': 15,
+                    'back_right_ankle': 15,
+                    'front_left_ankle': -15,
+                    'back_left_ankle': -15
+                })
         
         def _apply_pitch_correction(self, pitch_correction):
             """Pitch 축 보정 적용"""
-            # 앞뒤 다리 높이 조정
+            # 앞뒤 다리 높이 조정 (네 무릎을 한 프레임에 동시 출력)
             if pitch_correction > 0:  # 앞으로 기울어짐
                 # 앞다리들을 높이고 뒷다리들을 낮춤
-                self.motor_controller.set_motor_angle('front_left_knee', 30)
-                self.motor_controller.set_motor_angle('front_right_knee', 30)
-                self.motor_controller.set_motor_angle('back_left_knee', -20)
-                self.motor_controller.set_motor_angle('back_right_knee', -20)
+                self.motor_controller.set_pose({
+                    'front_left_knee': 30,
+                    'front_right_knee': 30,
+                    'back_left_knee': -20,
+                    'back_right_knee': -20
+                })
             else:  # 뒤로 기울어짐
                 # 뒷다리들을 높이고 앞다리들을 낮춤
-                self.motor_controller.set_motor_angle('back_left_knee', 30)
-                self.motor_controller.set_motor_angle('back_right_knee', 30)
-                self.motor_controller.set_motor_angle('front_left_knee', -20)
-                self.motor_controller.set_motor_angle('front_right_knee', -20)
+                self.motor_controller.set_pose({
+                    'back_left_knee': 30,
+                    'back_right_knee': 30,
+                    'front_left_knee': -20,
+                    'front_right_knee': -20
+                })
         
         def _apply_yaw_correction(self, yaw_correction):
             """Yaw 축 보정 적용"""
@@ -257,7 +276,8 @@ def maintain_balance():
                 'correction_strength': self.correction_strength,
                 'update_rate': self.update_rate,
                 'last_correction_time': self.last_correction_time,
-                'correction_history_count': len(self.correction_history)
+                'correction_history_count': len(self.correction_history),
+                'scheduler': self.scheduler.get_stats()
             }
         
         def set_balance_parameters(self, threshold=None, strength=None, rate=None):
@@ -272,6 +292,7 @@ def maintain_balance():
             
             if rate is not None:
                 self.update_rate = max(10, min(100, rate))
+                self.scheduler.set_rate(self.update_rate)
                 print(f"업데이트 주기를 {self.update_rate}Hz로 설정했습니다.")
         
         def emergency_stabilize(self):
@@ -279,16 +300,13 @@ def maintain_balance():
             print("비상 안정화 실행")
             
             try:
-                # 모든 모터를 중립 위치로
-                self.motor_controller.emergency_stop()
-                
-                # 조향을 중립으로
-                self.steering_controller.reset_steering()
+                # 진행 중인 시퀀스를 취소하고 모든 모터를 한 번에 중립 위치로
+                latency_ms = self.motor_controller.emergency_stop()
                 
-                # 안정화 대기
-                time.sleep(2.0)
+                # 조향 상태 초기화 (힙 관절은 중립 출력에 포함)
+                self.steering_controller.clear_steering_state()
                 
-                print("비상 안정화 완료")
+                print(f"비상 안정화 완료 (정지 지연 {latency_ms:.2f}ms)")
                 return True
                 
             except Exception as e:
@@ -298,7 +316,7 @@ def maintain_balance():
         def cleanup(self):
             """리소스 정리"""
             try:
-                self.inclination_sensor.cleanup()
+                self.imu_sampler.release('balance_sustain')
                 self.motor_controller.cleanup()
                 self.steering_controller.cleanup()
                 
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class ContactGaitClock:
+    """
+    접촉 이벤트 기반 보행 위상 진행
+    기본은 시간에 따라 위상을 진행하되, FSR 접촉 상태로 보정
+    - 이른 착지: 유각 중인 다리가 모두 유각 후반(early_fraction 이후)에 이미 닿았으면 착지 위상으로 바로 진행
+    - 늦은 착지: 계획상 지지로 바뀐 다리가 아직 닿지 않았으면 최대 touchdown_timeout 동안 위상 정지
+    """
+    def __init__(self, contact_sensor, early_fraction=0.5, touchdown_window=0.05, touchdown_timeout=0.2):
+        self.contact_sensor = contact_sensor
+        self.early_fraction = early_fraction        # 이른 착지 인정 유각 진행률
+        self.touchdown_window = touchdown_window    # 늦은 착지 검사 구간 (착지 후 주기 비율)
+        self.touchdown_timeout = touchdown_timeout  # 늦은 착지 최대 대기 (초)
+
+        self.phase = 0.0
+        self._last_time = None
+        self._hold_start = None
+
+        # 통계
+        self.early_touchdowns = 0
+        self.late_touchdowns = 0
+        self.saved_time = 0.0       # 이른 착지로 건너뛴 유각 시간 (초)
+        self.held_time = 0.0        # 늦은 착지로 기다린 시간 (초)
+
+    def reset(self, phase, now):
+        """위상 구간 시작"""
+        self.phase = phase
+        self._last_time = now
+        self._hold_start = None
+
+    def advance(self, gait_table, now, cycle_time):
+        """현재 시각까지 위상 진행 후 반환"""
+        dt = now - self._last_time
+        self._last_time = now
+        sensed = self.contact_sensor.contacts
+        offsets = np.asarray(gait_table.phase_offsets)
+        duty_factor = gait_table.duty_factor
+        phase = self.phase
+
+        # 늦은 착지: 착지 직후 구간인데 발이 닿지 않은 다리가 있으면 위상 정지
+        leg_phase = (phase - offsets) % 1.0
+        late = gait_table.contacts_at(phase) & ~sensed & (leg_phase < self.touchdown_window)
+        if late.any():
+            if self._hold_start is None:
+                self._hold_start = now
+                self.late_touchdowns += 1
+            if now - self._hold_start < self.touchdown_timeout:
+                self.held_time += dt
+                return phase
+        else:
+            self._hold_start = None
+
+        phase += dt / cycle_time
+
+        # 이른 착지: 유각 중인 다리가 모두 닿았으면 가장 먼저 착지할 위상으로 진행
+        leg_phase = (phase - offsets) % 1.0
+        swing = ~gait_table.contacts_at(phase)
+        if swing.any() and sensed[swing].all():
+            swing_progress = (leg_phase[swing] - duty_factor) / (1.0 - duty_factor)
+            if swing_progress.min() >= self.early_fraction:
+                skip = float((1.0 - leg_phase[swing]).min())
+                phase += skip + 1e-9
+                self.early_touchdowns += 1
+                self.saved_time += skip * cycle_time
+
+        self.phase = phase
+        return phase
+
+    def get_stats(self):
+        """접촉 위상 진행 통계"""
+        return {
+            'early_touchdowns': self.early_touchdowns,
+            'late_touchdowns': self.late_touchdowns,
+            'saved_time': self.saved_time,
+            'held_time': self.held_time
+        }
@@ -0,0 +1,249 @@
+import threading
+import numpy as np
+from joint_pose import LEG_NAMES, new_pose
+from gait_generator import get_gait_table
+from obstacle_planner import SLOW, STOP, TURN
+
+
+class ContinuousWalk:
+    """
+    연속 보행 모드
+    별도 스레드에서 일정한 보행 주기로 걷고, 언제든 갱신되는 (vx, vy, yaw_rate) 속도 명령을
+    다음 주기의 보행 파라미터로 반영 (주기 동안 이전 테이블과 새 테이블을 교차 혼합하여 멈추지 않음)
+    """
+    def __init__(self, leg_controller=None, gait='trot', step_frequency=1.25,
+                 max_step_length=20.0, max_turn=10.0, max_lateral=8.0, step_height=15.0, obstacle_planner=None):
+        if leg_controller is None:
+            from leg_moving import LegMoving
+            leg_controller = LegMoving()
+            self._owns_leg_controller = True
+        else:
+            self._owns_leg_controller = False
+
+        self.leg_controller = leg_controller
+        self.actuator = leg_controller.actuator
+
+        # 보행 파라미터
+        self.gait = gait
+        self.step_frequency = step_frequency    # 보행 주기 빈도 (Hz)
+        self.max_step_length = max_step_length  # vx=1일 때 힙 보폭 (도)
+        self.max_turn = max_turn                # yaw_rate=1일 때 좌우 보폭 차이 (도)
+        self.max_lateral = max_lateral          # vy=1일 때 발목 옆걸음 폭 (도)
+        self.step_height = step_height          # 유각기 무릎 들어올림 (도)
+        self.parameter_step = 0.5               # 보행 파라미터 양자화 단위 (도, 캐시 재사용)
+
+        # 속도 명령 (-1.0 ~ 1.0, 튜플 교체로 스레드 간 전달)
+        self.command = (0.0, 0.0, 0.0)
+        self._command_changed = threading.Event()
+
+        # 전방 장애물 판단 (ObstaclePlanner, 제어 틱마다 갱신, 감속은 다음 주기에 반영하고 정지/회피는 주기 중간에 서기로 전환)
+        self.obstacle_planner = obstacle_planner
+        self.obstacle_abort_count = 0
+
+        # 실행 상태
+        self.running = False
+        self.cycle_count = 0
+        self.phase = 0.0
+        self.current_table = None
+        self._stopping = False
+        self._thread = None
+        self._blend = new_pose()
+
+    def set_velocity(self, vx, vy=0.0, yaw_rate=0.0):
+        """속도 명령 갱신 (vx: 전진, vy: 좌측 옆걸음, yaw_rate: 좌회전, 각 -1.0 ~ 1.0)"""
+        command = tuple(max(-1.0, min(1.0, float(value))) for value in (vx, vy, yaw_rate))
+        if command != self.command:
+            self.command = command
+            self._command_changed.set()
+
+    def _effective_command(self):
+        """장애물 판단을 반영한 속도 명령 (전진만 감속/정지, 회피 판단이면 제자리 회전)"""
+        vx, vy, yaw_rate = self.command
+        planner = self.obstacle_planner
+        if planner is None or vx <= 0.0:
+            return self.command
+        decision = planner.decision
+        if decision.action == TURN:
+            return (0.0, vy, 0.5 if planner.turn_direction == 'left' else -0.5)
+        if decision.action == STOP:
+            return (0.0, vy, yaw_rate)
+        if decision.action == SLOW:
+            return (vx * decision.speed_scale, vy, yaw_rate)
+        return self.command
+
+    def _quantize(self, value):
+        return round(value / self.parameter_step) * self.parameter_step
+
+    def _table_for(self, command):
+        """속도 명령에 해당하는 보행 테이블 (정지 명령이면 보폭/높이 0인 서기 테이블)"""
+        vx, vy, yaw_rate = command
+        step_length = self._quantize(vx * self.max_step_length)
+        turn = self._quantize(yaw_rate * self.max_turn)
+        lateral = self._quantize(vy * self.max_lateral)
+        moving = step_length != 0.0 or turn != 0.0 or lateral != 0.0
+        return get_gait_table(
+            self.gait, step_length, self.step_height if moving else 0.0,
+            turn=turn, lateral=lateral
+        )
+
+    @staticmethod
+    def _is_standing(table):
+        return table.step_height == 0.0 and not table.poses.any()
+
+    def _stand(self, timeout):
+        """관절 궤적으로 서기 자세까지 이동 (보행 주기 밖에서 사용)"""
+        self.actuator.move_pose(new_pose(), max_velocity=self.leg_controller.movement_speed * self.actuator.control_rate)
+        self.actuator.wait_until_settled(timeout)
+
+    def _obstacle_blocks(self, *tables):
+        """전진 보폭이 있는 테이블을 정지/회피 판단이 막는지 (장애물 판단 갱신 포함)"""
+        planner = self.obstacle_planner
+        if planner is None:
+            return False
+        planner.update()
+        return (planner.is_blocked() and self.command[0] > 0.0
+                and any(table.step_length > 0.0 for table in tables))
+
+    def start(self):
+        """연속 보행 시작 (즉시 반환)"""
+        if self.running:
+            print("이미 연속 보행 중입니다.")
+            return False
+
+        self.running = True
+        self._stopping = False
+        self.cycle_count = 0
+        self._thread = threading.Thread(target=self._run, name='continuous-walk', daemon=True)
+        self._thread.start()
+        print(f"연속 보행 시작: {self.gait}, {self.step_frequency}Hz")
+        return True
+
+    def _run(self):
+        try:
+            # 서기 자세에서 시작
+            self._stand(2.0)
+
+            standing_table = self._table_for((0.0, 0.0, 0.0))
+            self.current_table = standing_table
+            while self.running:
+                self._command_changed.clear()
+                if self.obstacle_planner is not None:
+                    self.obstacle_planner.update()
+                target_table = self._table_for(self._effective_command())
+
+                if target_table is self.current_table and self._is_standing(target_table):
+                    if self._stopping or self.actuator.stop_requested:
+                        break
+                    # 서 있는 동안은 새 명령까지 대기
+                    self.actuator.clock.wait(self._command_changed, 0.1)
+                    continue
+
+                reached_table = self._play_cycle(self.current_table, target_table, standing_table)
+                if reached_table is None:
+                    break
+                self.current_table = reached_table
+                if reached_table is target_table:
+                    self.cycle_count += 1
+
+        except Exception as e:
+            print(f"연속 보행 오류: {e}")
+        finally:
+            self.running = False
+            if self.actuator.stop_requested:
+                print("비상 정지로 연속 보행이 취소되었습니다.")
+
+    def _play_cycle(self, from_table, to_table, standing_table):
+        """
+        한 보행 주기 재생 (제어 틱마다 테이블 행 출력)
+        주기 위상 w에 따라 from_table → to_table로 선형 교차 혼합하여 파라미터 변경을 부드럽게 반영
+        반환: 주기를 마친 뒤의 테이블 (완료 시 to_table, 장애물로 중단 시 standing_table, 정지/비상 정지 시 None)
+        """
+        clock = self.actuator.clock
+        tick = 1.0 / self.actuator.control_rate
+        cycle_time = 1.0 / self.step_frequency
+        start = clock.now()
+        next_tick = start
+        blend = self._blend
+
+        while self.running:
+            phase = min((clock.now() - start) / cycle_time, 1.0)
+            self.phase = phase
+
+            target_row = to_table.pose_at(phase)
+            if from_table is to_table:
+                row = target_row
+            else:
+                source_row = from_table.pose_at(phase)
+                np.subtract(target_row, source_row, out=blend)
+                blend *= phase
+                blend += source_row
+                row = blend
+
+            if not self.actuator.write_pose(row):
+                return None
+            if phase >= 1.0:
+                return to_table
+
+            # 정지/회피 판단이면 주기를 끝까지 걷지 않고 현재 자세에서 서기로 전환
+            if self._obstacle_blocks(from_table, to_table):
+                self.obstacle_abort_count += 1
+                print(f"장애물 감지로 보행 주기 중단 (위상 {phase:.2f})")
+                self._stand(cycle_time)
+                return None if self.actuator.stop_requested else standing_table
+
+            next_tick += tick
+            if self.actuator.wait(max(next_tick - clock.now(), 0.0)):
+                return None
+        return None
+
+    def get_contacts(self):
+        """현재 다리별 지지 여부 ({다리: bool})"""
+        table = self.current_table
+        if table is None or not self.running:
+            return {leg_name: True for leg_name in LEG_NAMES}
+        contacts = table.contacts_at(self.phase)
+        return {leg_name: bool(contact) for leg_name, contact in zip(LEG_NAMES, contacts)}
+
+    def stop(self, timeout=None):
+        """연속 보행 정지 (서기 자세로 감속한 뒤 스레드 종료)"""
+        if self._thread is None:
+            return False
+
+        self._stopping = True
+        self.set_velocity(0.0, 0.0, 0.0)
+        self._command_changed.set()
+
+        # 현재 주기 + 서기 전환 주기까지 대기, 초과하면 즉시 중단
+        if timeout is None:
+            timeout = 3.0 / self.step_frequency
+        self._thread.join(timeout / self.actuator.clock.speed)
+        if self._thread.is_alive():
+            self.running = False
+            self._thread.join(1.0)
+
+        self._thread = None
+        print("연속 보행 정지")
+        return True
+
+    def get_status(self):
+        """연속 보행 상태 정보 반환"""
+        table = self.current_table
+        return {
+            'running': self.running,
+            'command': self.command,
+            'gait': self.gait,
+            'step_frequency': self.step_frequency,
+            'cycle_count': self.cycle_count,
+            'phase': self.phase,
+            'step_length': table.step_length if table is not None else 0.0,
+            'turn': table.turn if table is not None else 0.0,
+            'lateral': table.lateral if table is not None else 0.0,
+            'obstacle_abort_count': self.obstacle_abort_count,
+            'obstacle': self.obstacle_planner.get_status() if self.obstacle_planner is not None else None
+        }
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+        if self._owns_leg_controller:
+            self.leg_controller.cleanup()
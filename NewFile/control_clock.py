@@ -0,0 +1,51 @@
+import time
+
+
+class SystemClock:
+    """실제 단조 시계 (기본 제어 시계)"""
+    speed = 1.0
+
+    def now(self):
+        """현재 시각 (초)"""
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        """지정 시간 대기"""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event, timeout=None):
+        """이벤트 대기 (설정되면 True)"""
+        return event.wait(timeout)
+
+
+class VirtualClock:
+    """
+    가상 제어 시계
+    실제 시간의 speed배로 흐르는 시계 (speed=20이면 1초 동작을 50ms에 실행),
+    모든 스레드가 같은 가상 시간축을 공유하므로 제어 주기/지연 관계가 유지됨
+    """
+    def __init__(self, speed=1.0, start=None):
+        if speed <= 0:
+            raise ValueError(f"가상 시계 배속은 0보다 커야 합니다: {speed}")
+        self.speed = float(speed)
+        self.start = time.monotonic() if start is None else start
+        self._real_start = time.perf_counter()
+
+    def now(self):
+        """현재 가상 시각 (초)"""
+        return self.start + (time.perf_counter() - self._real_start) * self.speed
+
+    def sleep(self, seconds):
+        """가상 시간 기준 대기"""
+        if seconds > 0:
+            time.sleep(seconds / self.speed)
+
+    def wait(self, event, timeout=None):
+        """가상 시간 기준 이벤트 대기 (설정되면 True)"""
+        if timeout is None:
+            return event.wait()
+        return event.wait(max(timeout, 0.0) / self.speed)
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -1,13 +1,123 @@
+import time
+import math
+import struct
+import numpy as np
+from attitude_filter import create_attitude_filter
+from control_clock import SYSTEM_CLOCK, VirtualClock
+from imu_calibration import IMUCalibrationCache, compute_calibration
+
+
+# MPU6050 레지스터
+MPU6050_ADDRESS = 0x68
+SMPLRT_DIV = 0x19
+CONFIG = 0x1A
+GYRO_CONFIG = 0x1B
+ACCEL_CONFIG = 0x1C
+FIFO_EN = 0x23
+ACCEL_XOUT_H = 0x3B        # 가속도(6) + 온도(2) + 자이로(6) 연속 레지스터 시작
+USER_CTRL = 0x6A
+PWR_MGMT_1 = 0x6B
+FIFO_COUNTH = 0x72
+FIFO_R_W = 0x74
+
+# 가속도 x/y/z, 온도, 자이로 x/y/z (빅엔디언 부호 있는 16비트 7개)
+BURST_LENGTH = 14
+BURST_FORMAT = struct.Struct('>7h')
+
+# FIFO 설정
+FIFO_SIZE = 1024
+FIFO_EN_ALL = 0xF8              # 온도 + 자이로 x/y/z + 가속도 (샘플당 14바이트, 버스트와 같은 순서)
+USER_CTRL_FIFO_EN = 0x40
+USER_CTRL_FIFO_RESET = 0x04
+DLPF_44HZ = 0x03                # 디지털 저역 필터 사용 시 내부 샘플링 1kHz
+FIFO_BASE_RATE = 1000.0
+FIFO_READ_CHUNK = 28            # SMBus 블록 읽기 32바이트 제한 안의 샘플 2개
+
+# FIFO 샘플 묶음 열 (시각 초, 가속도 g, 자이로 도/초, 온도 섭씨)
+FIFO_COLUMNS = ('timestamp', 'accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z', 'temperature')
+
+# 캘리브레이션 설정
+CALIBRATION_SAMPLES = 100
+CALIBRATION_INTERVAL = 0.01         # 전체 보정 샘플 간격 (초)
+DRIFT_CHECK_INTERVAL = 100          # 드리프트 검사 주기 (샘플)
+DRIFT_GYRO_BIAS = 0.3               # 자세 필터가 추정한 남은 자이로 영점 한계 (도/초)
+DRIFT_MIN_STILL_SAMPLES = 500       # 영점 추정을 믿기 위한 최소 정지 샘플 수 (마지막 갱신 이후)
+
+
+def temperature_from_raw(raw):
+    """온도 원시값 → 섭씨"""
+    return raw / 340.0 + 36.53
+
+
+class FakeMPU6050Bus:
+    """
+    테스트용 인메모리 I2C 버스 (MPU6050 모사)
+    측정 레지스터 값을 직접 설정하고, 트랜잭션 기록과 모델링한 버스 전송 시간을 유지
+    """
+    def __init__(self, clock_hz=400000, transaction_overhead=50e-6):
+        self.registers = bytearray(128)
+        self.transactions = []      # (종류, 레지스터, 길이)
+        self.clock_hz = clock_hz
+        self.transaction_overhead = transaction_overhead    # 트랜잭션당 드라이버 호출 지연 (초)
+        self.bus_time = 0.0         # 누적 전송 시간 모델 (초)
+        self.fifo = bytearray()
+        self.closed = False
+        self.set_sample()
+
+    def set_sample(self, accel=(0, 0, 16384), gyro=(0, 0, 0), temperature=25.0):
+        """측정 레지스터 설정 (가속도/자이로 원시값, 온도 섭씨)"""
+        temperature_raw = int(round((temperature - 36.53) * 340.0))
+        self.registers[ACCEL_XOUT_H:ACCEL_XOUT_H + BURST_LENGTH] = BURST_FORMAT.pack(
+            *accel, temperature_raw, *gyro)
+
+    def push_fifo(self, samples):
+        """FIFO에 샘플 적재 ((N, 7) 원시값: 가속도 x/y/z, 온도, 자이로 x/y/z), 넘치면 오래된 바이트부터 덮어씀"""
+        if not self.registers[USER_CTRL] & USER_CTRL_FIFO_EN:
+            return
+        self.fifo += np.asarray(samples, dtype='>i2').tobytes()
+        if len(self.fifo) > FIFO_SIZE:
+            del self.fifo[:len(self.fifo) - FIFO_SIZE]
+
+    def _account(self, kind, register, length):
+        # 시작 + 주소/레지스터 쓰기 + 반복 시작 + 주소 + 데이터 바이트 (바이트당 9비트)
+        bits = 9 * (3 + length) + 2
+        self.bus_time += self.transaction_overhead + bits / self.clock_hz
+        self.transactions.append((kind, register, length))
+
+    def write_byte_data(self, address, register, value):
+        if register == USER_CTRL and value & USER_CTRL_FIFO_RESET:
+            self.fifo.clear()
+            value &= ~USER_CTRL_FIFO_RESET
+        self.registers[register] = value & 0xFF
+        self._account('write_byte', register, 1)
+
+    def read_i2c_block_data(self, address, register, length):
+        self._account('read_block', register, length)
+        if register == FIFO_COUNTH:
+            return list(len(self.fifo).to_bytes(2, 'big'))[:length]
+        if register == FIFO_R_W:
+            # FIFO 데이터 레지스터는 주소가 증가하지 않고 FIFO에서 차례로 꺼냄 (비면 0)
+            data = list(self.fifo[:length]) + [0] * max(0, length - len(self.fifo))
+            del self.fifo[:length]
+            return data
+        return list(self.registers[register:register + length])
+
+    def close(self):
+        self.closed = True
+
+
 class BodyDetectInclination:
     """
     자이로센서 기반 기울기 인식 (threshold별 case 분류)
     MPU6050 6축 자이로센서를 사용한 정밀한 기울기 측정
     """
-    def __init__(self):
+    def __init__(self, bus=None, attitude_filter='complementary', calibration_cache=None, sensor_id=None, clock=None):
         # MPU6050 센서 설정
-        self.mpu6050_address = 0x68  # I2C 주소
+        self.mpu6050_address = MPU6050_ADDRESS  # I2C 주소
+        self.sensor_id = sensor_id if sensor_id is not None else f"mpu6050-{self.mpu6050_address:#04x}"
         self.accel_scale = 16384.0    # ±2g 스케일
         self.gyro_scale = 131.0       # ±250°/s 스케일
+        self.clock = clock if clock is not None else SYSTEM_CLOCK   # 대기/샘플 시각 (테스트는 가상 시계)
         
         # 기울기 임계값 설정
         self.inclination_thresholds = {
@@ -19,41 +129,55 @@ class BodyDetectInclination:
         }
         
         # 필터링 파라미터
-        self.alpha = 0.96          # 상보필터 계수
         self.sample_rate = 100     # 샘플링 레이트 (Hz)
+        self.set_attitude_filter(attitude_filter)   # 자세 필터 (측정 dt 사용)
         
         # 센서 데이터
         self.raw_accel = {'x': 0, 'y': 0, 'z': 0}
         self.raw_gyro = {'x': 0, 'y': 0, 'z': 0}
+        self.temperature = 25.0
+        
+        # FIFO 모드 상태
+        self.fifo_enabled = False
+        self.fifo_overflow_count = 0
+        self._fifo_timestamp = None
         self.filtered_angles = {'roll': 0, 'pitch': 0, 'yaw': 0}
         self.calibrated_offsets = {'accel': {'x': 0, 'y': 0, 'z': 0}, 'gyro': {'x': 0, 'y': 0, 'z': 0}}
         
-        # 센서 초기화
-        self._initialize_sensor()
+        # 캘리브레이션 캐시 (센서/온도별 보정값 파일)
+        self.calibration_cache = calibration_cache if calibration_cache is not None else IMUCalibrationCache()
+        self.calibration_info = {'source': None, 'temperature': None, 'load_ms': None, 'refresh_count': 0}
+        self._drift_sample_count = 0
+        self._drift_still_count = 0
         
-        # 캘리브레이션 실행
-        self._calibrate_sensor()
+        # 센서 초기화 (bus 지정 시 해당 I2C 버스 사용)
+        self._initialize_sensor(bus)
+        
+        # 캘리브레이션 (캐시에 현재 온도 보정값이 있으면 읽고, 없으면 전체 보정)
+        self._load_calibration()
         
         print("MPU6050 기울기 감지 센서 초기화 완료")
     
-    def _initialize_sensor(self):
+    def _initialize_sensor(self, bus=None):
         """MPU6050 센서 초기화"""
         try:
-            import smbus2 as smbus
-            self.bus = smbus.SMBus(1)  # 라즈베리파이 I2C 버스 1
+            if bus is None:
+                import smbus2 as smbus
+                bus = smbus.SMBus(1)  # 라즈베리파이 I2C 버스 1
+            self.bus = bus
             
             # 센서 웨이크업
-            self.bus.write_byte_data(self.mpu6050_address, 0x6B, 0x00)
-            time.sleep(0.1)
+            self.bus.write_byte_data(self.mpu6050_address, PWR_MGMT_1, 0x00)
+            self.clock.sleep(0.1)
             
             # 가속도계 설정 (±2g)
-            self.bus.write_byte_data(self.mpu6050_address, 0x1C, 0x00)
+            self.bus.write_byte_data(self.mpu6050_address, ACCEL_CONFIG, 0x00)
             
             # 자이로스코프 설정 (±250°/s)
-            self.bus.write_byte_data(self.mpu6050_address, 0x1B, 0x00)
+            self.bus.write_byte_data(self.mpu6050_address, GYRO_CONFIG, 0x00)
             
             # 샘플링 레이트 설정
-            self.bus.write_byte_data(self.mpu6050_address, 0x19, 0x07)
+            self.bus.write_byte_data(self.mpu6050_address, SMPLRT_DIV, 0x07)
             
             print("MPU6050 센서 초기화 성공")
             
@@ -64,97 +188,284 @@ class BodyDetectInclination:
             print(f"MPU6050 센서 초기화 오류: {e}")
             self.simulation_mode = True
     
-    def _calibrate_sensor(self):
-        """센서 캘리브레이션"""
+    def _load_calibration(self):
+        """캐시에서 현재 센서/온도의 보정값을 읽어 적용 (없으면 전체 보정 후 저장)"""
+        if hasattr(self, 'simulation_mode'):
+            self._calibrate_sensor()
+            return
+        
+        start = time.perf_counter()
+        try:
+            self.temperature = temperature_from_raw(self._read_burst()[3])
+            calibration = self.calibration_cache.lookup(self.sensor_id, self.temperature)
+        except Exception as e:
+            print(f"캘리브레이션 캐시 조회 오류: {e}")
+            calibration = None
+        
+        if calibration is None:
+            self._calibrate_sensor()
+            return
+        
+        self._apply_calibration(calibration, 'cache')
+        self.calibration_info['load_ms'] = (time.perf_counter() - start) * 1000.0
+        print(f"센서 캘리브레이션 캐시 사용 ({calibration['temperature']:.1f}도, "
+              f"{self.calibration_info['load_ms']:.2f}ms)")
+    
+    def _apply_calibration(self, calibration, source):
+        """보정값 적용 (오프셋 dict를 통째로 교체, 필터의 남은 영점 추정은 초기화)"""
+        self.calibrated_offsets = {'accel': dict(calibration['accel']), 'gyro': dict(calibration['gyro'])}
+        self.attitude_filter.gyro_bias = np.zeros(3)
+        self._drift_still_count = self.attitude_filter.still_count
+        self.calibration_info.update(source=source, temperature=calibration['temperature'])
+    
+    def _calibrate_sensor(self, samples=CALIBRATION_SAMPLES):
+        """
+        전체 센서 캘리브레이션 (정지/수평 상태에서 실행)
+        버스트 원시값을 미리 할당한 (N, 7) 배열에 모아 compute_calibration()으로 한 번에 계산하고 캐시에 저장
+        """
         print("센서 캘리브레이션 시작...")
         
         try:
             if not hasattr(self, 'simulation_mode'):
                 # 실제 센서 캘리브레이션
-                accel_samples = []
-                gyro_samples = []
-                
-                # 100개 샘플 수집
-                for _ in range(100):
-                    accel_data = self._read_raw_accelerometer()
-                    gyro_data = self._read_raw_gyroscope()
-                    
-                    accel_samples.append(accel_data)
-                    gyro_samples.append(gyro_data)
-                    
-                    time.sleep(0.01)
+                start = time.perf_counter()
+                raw = np.empty((samples, 7))
+                for index in range(samples):
+                    raw[index] = self._read_burst()
+                    self.clock.sleep(CALIBRATION_INTERVAL)
                 
-                # 평균값 계산하여 오프셋 설정
-                for axis in ['x', 'y', 'z']:
-                    accel_avg = sum(sample[axis] for sample in accel_samples) / len(accel_samples)
-                    gyro_avg = sum(sample[axis] for sample in gyro_samples) / len(gyro_samples)
-                    
-                    self.calibrated_offsets['accel'][axis] = accel_avg
-                    self.calibrated_offsets['gyro'][axis] = gyro_avg
+                calibration = compute_calibration(raw, temperature_from_raw(raw[:, 3]),
+                                                  self.accel_scale, self.gyro_scale)
+                if calibration is None:
+                    print("센서 캘리브레이션 중 움직임 감지: 기존 보정값을 유지합니다.")
+                    return False
                 
+                self.temperature = calibration['temperature']
+                self._apply_calibration(calibration, 'calibration')
+                self.calibration_info['load_ms'] = (time.perf_counter() - start) * 1000.0
+                self.calibration_cache.store(self.sensor_id, calibration)
+                self.calibration_cache.save()
                 print("센서 캘리브레이션 완료")
             else:
                 # 시뮬레이션 모드
+                self.calibration_info['source'] = 'simulation'
                 print("시뮬레이션 모드: 센서 캘리브레이션 완료")
+            return True
                 
         except Exception as e:
             print(f"센서 캘리브레이션 오류: {e}")
+            return False
     
-    def _read_raw_accelerometer(self):
-        """가속도계 원시 데이터 읽기"""
+    def _check_calibration_drift(self, count):
+        """
+        count개 샘플마다 DRIFT_CHECK_INTERVAL 주기로 드리프트 검사
+        온도가 보정 온도에서 temperature_step 넘게 벗어나거나, 정지 중 필터가 추정한 남은 자이로 영점이 크면 갱신
+        """
+        self._drift_sample_count += count
+        if self._drift_sample_count < DRIFT_CHECK_INTERVAL or self.calibration_info['temperature'] is None:
+            return False
+        self._drift_sample_count = 0
+        
+        filter_ = self.attitude_filter
+        settled = filter_.still_count - self._drift_still_count >= DRIFT_MIN_STILL_SAMPLES
+        temperature_drift = (abs(self.temperature - self.calibration_info['temperature'])
+                             > self.calibration_cache.temperature_step)
+        bias_drift = settled and float(np.linalg.norm(filter_.gyro_bias)) > DRIFT_GYRO_BIAS
+        if not (temperature_drift or bias_drift):
+            return False
+        
+        self._refresh_calibration(settled)
+        return True
+    
+    def _refresh_calibration(self, settled):
+        """
+        보정값 갱신 (제어 루프 안에서 바로 끝나는 작업만, 파일 저장은 백그라운드 스레드)
+        캐시에 현재 온도 보정값이 있으면 적용, 없으면 필터가 정지 중 추정한 자이로 영점을 오프셋에 합쳐 현재 온도로 저장
+        """
+        calibration = self.calibration_cache.lookup(self.sensor_id, self.temperature)
+        if calibration is not None and calibration['temperature'] != self.calibration_info['temperature']:
+            self._apply_calibration(calibration, 'cache')
+        elif settled:
+            bias = self.attitude_filter.gyro_bias * self.gyro_scale
+            offsets = self.calibrated_offsets
+            calibration = {
+                'accel': dict(offsets['accel']),
+                'gyro': {axis: offsets['gyro'][axis] + float(bias[i]) for i, axis in enumerate('xyz')},
+                'temperature': float(self.temperature),
+                'gyro_noise': None,
+                'samples': int(self.attitude_filter.still_count - self._drift_still_count),
+                'updated': time.time()
+            }
+            self._apply_calibration(calibration, 'drift')
+            self.calibration_cache.store(self.sensor_id, calibration)
+            self.calibration_cache.save_in_background()
+        else:
+            # 정지 샘플이 부족하면 다음 정지 구간까지 기다림 (현재 오프셋 유지)
+            return False
+        
+        self.calibration_info['refresh_count'] += 1
+        print(f"센서 캘리브레이션 갱신 ({self.calibration_info['source']}, {self.temperature:.1f}도)")
+        return True
+    
+    def _read_burst(self):
+        """가속도/온도/자이로 14바이트를 한 트랜잭션으로 읽어 원시값 7개 반환 (같은 시점의 측정)"""
+        data = self.bus.read_i2c_block_data(self.mpu6050_address, ACCEL_XOUT_H, BURST_LENGTH)
+        return BURST_FORMAT.unpack(bytes(data))
+    
+    def _read_raw_sample(self):
+        """원시 데이터 읽기 (가속도 dict, 자이로 dict, 온도 섭씨)"""
         try:
             if not hasattr(self, 'simulation_mode'):
                 # 실제 센서에서 데이터 읽기
-                accel_data = self.bus.read_i2c_block_data(self.mpu6050_address, 0x3B, 6)
-                
-                # 16비트 데이터 변환
-                accel_x = self._convert_to_signed_16bit(accel_data[0], accel_data[1])
-                accel_y = self._convert_to_signed_16bit(accel_data[2], accel_data[3])
-                accel_z = self._convert_to_signed_16bit(accel_data[4], accel_data[5])
-                
-                return {'x': accel_x, 'y': accel_y, 'z': accel_z}
+                ax, ay, az, temperature_raw, gx, gy, gz = self._read_burst()
+                return ({'x': ax, 'y': ay, 'z': az}, {'x': gx, 'y': gy, 'z': gz},
+                        temperature_from_raw(temperature_raw))
             else:
                 # 시뮬레이션 데이터
-                return {'x': 0, 'y': 0, 'z': 16384}  # 1g (지구 중력)
+                return {'x': 0, 'y': 0, 'z': 16384}, {'x': 0, 'y': 0, 'z': 0}, 25.0  # 1g (지구 중력)
                 
         except Exception as e:
-            print(f"가속도계 읽기 오류: {e}")
-            return {'x': 0, 'y': 0, 'z': 0}
+            print(f"센서 원시 데이터 읽기 오류: {e}")
+            return {'x': 0, 'y': 0, 'z': 0}, {'x': 0, 'y': 0, 'z': 0}, self.temperature
+    
+    def _read_raw_accelerometer(self):
+        """가속도계 원시 데이터 읽기"""
+        return self._read_raw_sample()[0]
     
     def _read_raw_gyroscope(self):
         """자이로스코프 원시 데이터 읽기"""
-        try:
-            if not hasattr(self, 'simulation_mode'):
-                # 실제 센서에서 데이터 읽기
-                gyro_data = self.bus.read_i2c_block_data(self.mpu6050_address, 0x43, 6)
-                
-                # 16비트 데이터 변환
-                gyro_x = self._convert_to_signed_16bit(gyro_data[0], gyro_data[1])
-                gyro_y = self._convert_to_signed_16bit(gyro_data[2], gyro_data[3])
-                gyro_z = self._convert_to_signed_16bit(gyro_data[4], gyro_data[5])
-                
-                return {'x': gyro_x, 'y': gyro_y, 'z': z}
-            else:
-                # 시뮬레이션 데이터
-                return {'x': 0, 'y': 0, 'z': 0}
-                
-        except Exception as e:
-            print(f"자이로스코프 읽기 오류: {e}")
-            return {'x': 0, 'y': 0, 'z': 0}
+        return self._read_raw_sample()[1]
     
-    def _convert_to_signed_16bit(self, msb, lsb):
-        """16비트 데이터를 부호 있는 정수로 변환"""
-        value = (msb << 8) | lsb
-        if value > 32767:
-            value -= 65536
-        return value
+    def enable_fifo(self):
+        """
+        FIFO 모드 시작
+        센서가 sample_rate로 가속도/온도/자이로를 FIFO(1024바이트, 약 73샘플)에 쌓고,
+        read_fifo_block()이 쌓인 샘플을 한 번에 꺼냄 (호출 사이 샘플이 버려지지 않음)
+        """
+        self._fifo_timestamp = None
+        if not hasattr(self, 'simulation_mode'):
+            try:
+                divider = int(round(FIFO_BASE_RATE / self.sample_rate)) - 1
+                self.bus.write_byte_data(self.mpu6050_address, CONFIG, DLPF_44HZ)
+                self.bus.write_byte_data(self.mpu6050_address, SMPLRT_DIV, max(0, min(255, divider)))
+                self.bus.write_byte_data(self.mpu6050_address, FIFO_EN, FIFO_EN_ALL)
+                self.bus.write_byte_data(self.mpu6050_address, USER_CTRL, USER_CTRL_FIFO_RESET)
+                self.bus.write_byte_data(self.mpu6050_address, USER_CTRL, USER_CTRL_FIFO_EN)
+            except Exception as e:
+                print(f"FIFO 설정 오류: {e}")
+                return False
+        self.fifo_enabled = True
+        print(f"MPU6050 FIFO 모드 시작 ({self.sample_rate}Hz)")
+        return True
+    
+    def disable_fifo(self):
+        """FIFO 모드 종료"""
+        if self.fifo_enabled and not hasattr(self, 'simulation_mode'):
+            try:
+                self.bus.write_byte_data(self.mpu6050_address, USER_CTRL, 0x00)
+                self.bus.write_byte_data(self.mpu6050_address, FIFO_EN, 0x00)
+            except Exception as e:
+                print(f"FIFO 해제 오류: {e}")
+        self.fifo_enabled = False
+    
+    def _read_fifo_bytes(self, length):
+        """FIFO 데이터 length바이트 읽기 (smbus2는 한 트랜잭션, 그 외 버스는 32바이트 이하 블록으로 나눠 읽음)"""
+        if hasattr(self.bus, 'i2c_rdwr'):
+            from smbus2 import i2c_msg
+            write = i2c_msg.write(self.mpu6050_address, [FIFO_R_W])
+            read = i2c_msg.read(self.mpu6050_address, length)
+            self.bus.i2c_rdwr(write, read)
+            return bytes(list(read))
+        data = bytearray()
+        for offset in range(0, length, FIFO_READ_CHUNK):
+            data += bytes(self.bus.read_i2c_block_data(self.mpu6050_address, FIFO_R_W,
+                                                       min(FIFO_READ_CHUNK, length - offset)))
+        return bytes(data)
+    
+    def _fifo_raw_samples(self, now):
+        """FIFO에 쌓인 원시 샘플 (N, 7), 넘쳤으면 FIFO를 비우고 빈 배열"""
+        if hasattr(self, 'simulation_mode'):
+            # 시뮬레이션: 마지막으로 꺼낸 시각 이후 sample_rate만큼의 정지 상태 샘플
+            last = self._fifo_timestamp if self._fifo_timestamp is not None else now - 1.0 / self.sample_rate
+            # 실제 FIFO처럼 1024바이트(73샘플)까지만 쌓임 (넘친 만큼은 오래된 샘플부터 버림)
+            count = min(max(0, int((now - last) * self.sample_rate)), FIFO_SIZE // BURST_LENGTH)
+            samples = np.zeros((count, 7), dtype=np.int16)
+            samples[:, 2] = int(self.accel_scale)
+            samples[:, 3] = int(round((25.0 - 36.53) * 340.0))
+            return samples
+        
+        count_bytes = self.bus.read_i2c_block_data(self.mpu6050_address, FIFO_COUNTH, 2)
+        count = (count_bytes[0] << 8) | count_bytes[1]
+        if count >= FIFO_SIZE:
+            # 넘치면 샘플 경계가 어긋나므로 비우고 다시 시작
+            self.bus.write_byte_data(self.mpu6050_address, USER_CTRL, USER_CTRL_FIFO_EN | USER_CTRL_FIFO_RESET)
+            self.fifo_overflow_count += 1
+            self._fifo_timestamp = None
+            print("MPU6050 FIFO 넘침: FIFO를 초기화합니다.")
+            return np.zeros((0, 7), dtype=np.int16)
+        
+        length = count - count % BURST_LENGTH
+        data = self._read_fifo_bytes(length) if length else b''
+        return np.frombuffer(data, dtype='>i2').reshape(-1, 7)
+    
+    def read_fifo_block(self, now=None):
+        """
+        FIFO에 쌓인 샘플을 한 번에 꺼내 (N, 8) 배열로 반환 (열: FIFO_COLUMNS, 캘리브레이션 오프셋 적용)
+        시각은 샘플 주기 간격으로 이전 묶음에 이어 붙이고, 어긋나면 꺼낸 시각(now) 기준으로 다시 맞춤
+        """
+        if not self.fifo_enabled:
+            raise RuntimeError("FIFO 모드가 아닙니다. enable_fifo()를 먼저 호출하세요.")
+        now = self.clock.now() if now is None else now
+        raw = self._fifo_raw_samples(now)
+        count = len(raw)
+        block = np.empty((count, len(FIFO_COLUMNS)))
+        if count == 0:
+            return block
+        
+        period = 1.0 / self.sample_rate
+        end = now
+        if self._fifo_timestamp is not None:
+            expected = self._fifo_timestamp + count * period
+            if now - 2 * period <= expected <= now:
+                end = expected
+        block[:, 0] = end - period * np.arange(count - 1, -1, -1)
+        self._fifo_timestamp = end
+        
+        offsets = self.calibrated_offsets
+        block[:, 1:4] = (raw[:, 0:3] - [offsets['accel'][axis] for axis in 'xyz']) / self.accel_scale
+        block[:, 4:7] = (raw[:, 4:7] - [offsets['gyro'][axis] for axis in 'xyz']) / self.gyro_scale
+        block[:, 7] = temperature_from_raw(raw[:, 3])
+        return block
+    
+    def set_attitude_filter(self, attitude_filter):
+        """자세 필터 교체 (이름 'complementary'/'madgwick'/'ekf' 또는 AttitudeFilter 인스턴스)"""
+        if isinstance(attitude_filter, str):
+            attitude_filter = create_attitude_filter(attitude_filter, sample_rate=self.sample_rate)
+        self.attitude_filter = attitude_filter
+    
+    def process_block(self, block):
+        """
+        FIFO 샘플 묶음 전체를 자세 필터에 한 번에 적용 (샘플 시각 간격을 dt로 사용)
+        반환: 샘플별 (roll, pitch, yaw) 배열 (N, 3), 마지막 값은 filtered_angles에 반영
+        """
+        if len(block) == 0:
+            return np.empty((0, 3))
+        
+        angles = self.attitude_filter.update_block(block)
+        self.filtered_angles = self.attitude_filter.get_angles()
+        accel = block[:, 1:4]
+        rates = block[:, 4:7]
+        self.temperature = float(block[-1, 7])
+        self.raw_accel = dict(zip('xyz', (accel[-1] * self.accel_scale).tolist()))
+        self.raw_gyro = dict(zip('xyz', (rates[-1] * self.gyro_scale).tolist()))
+        self._check_calibration_drift(len(block))
+        return angles
     
     def read_gyro(self):
         """센서 데이터 읽기 및 필터링"""
         try:
-            # 원시 데이터 읽기
-            accel_data = self._read_raw_accelerometer()
-            gyro_data = self._read_raw_gyroscope()
+            # 원시 데이터 읽기 (가속도/자이로 한 번에)
+            accel_data, gyro_data, self.temperature = self._read_raw_sample()
             
             # 캘리브레이션 오프셋 적용
             for axis in ['x', 'y', 'z']:
@@ -170,20 +481,24 @@ class BodyDetectInclination:
             gyro_pitch_rate = gyro_data['y'] / self.gyro_scale
             gyro_yaw_rate = gyro_data['z'] / self.gyro_scale
             
-            # 상보필터 적용
-            dt = 1.0 / self.sample_rate
-            self.filtered_angles['roll'] = self.alpha * (self.filtered_angles['roll'] + gyro_roll_rate * dt) + (1 - self.alpha) * accel_roll
-            self.filtered_angles['pitch'] = self.alpha * (self.filtered_angles['pitch'] + gyro_pitch_rate * dt) + (1 - self.alpha) * accel_pitch
-            self.filtered_angles['yaw'] += gyro_yaw_rate * dt
+            # 자세 필터 적용 (제어 시계로 측정한 호출 간격을 dt로 사용)
+            self.attitude_filter.update(
+                self.clock.now(),
+                (accel_data['x'] / self.accel_scale, accel_data['y'] / self.accel_scale, accel_data['z'] / self.accel_scale),
+                (gyro_roll_rate, gyro_pitch_rate, gyro_yaw_rate)
+            )
+            self.filtered_angles = self.attitude_filter.get_angles()
             
             # 데이터 저장
             self.raw_accel = accel_data
             self.raw_gyro = gyro_data
+            self._check_calibration_drift(1)
             
             return {
                 'angles': self.filtered_angles.copy(),
                 'accel': accel_data,
                 'gyro': gyro_data,
+                'temperature': self.temperature,
                 'accel_angles': {'roll': accel_roll, 'pitch': accel_pitch},
                 'gyro_rates': {'roll': gyro_roll_rate, 'pitch': gyro_pitch_rate, 'yaw': gyro_yaw_rate}
             }
@@ -262,8 +577,12 @@ class BodyDetectInclination:
         return {
             'calibrated_offsets': self.calibrated_offsets.copy(),
             'filtered_angles': self.filtered_angles.copy(),
+            'temperature': self.temperature,
+            'fifo_enabled': self.fifo_enabled,
+            'fifo_overflow_count': self.fifo_overflow_count,
             'sample_rate': self.sample_rate,
-            'alpha': self.alpha,
+            'attitude_filter': self.attitude_filter.get_status(),
+            'calibration': dict(self.calibration_info, sensor_id=self.sensor_id),
             'thresholds': self.inclination_thresholds.copy()
         }
     
@@ -271,13 +590,16 @@ class BodyDetectInclination:
         """캘리브레이션 리셋"""
         self.calibrated_offsets = {'accel': {'x': 0, 'y': 0, 'z': 0}, 'gyro': {'x': 0, 'y': 0, 'z': 0}}
         self.filtered_angles = {'roll': 0, 'pitch': 0, 'yaw': 0}
+        self.attitude_filter.reset()
+        self.calibration_info.update(source=None, temperature=None, load_ms=None)
         print("센서 캘리브레이션이 리셋되었습니다.")
         
-        # 재캘리브레이션 실행
+        # 재캘리브레이션 실행 (결과는 캐시의 현재 온도 구간을 덮어씀)
         self._calibrate_sensor()
     
     def cleanup(self):
         """리소스 정리"""
+        self.disable_fifo()
         if hasattr(self, 'bus'):
             try:
                 self.bus.close()
@@ -285,3 +607,71 @@ class BodyDetectInclination:
                 pass
         
         print("MPU6050 센서 리소스 정리 완료") 
+
+
+
+def _legacy_decode(accel, gyro):
+    """기존 방식 변환: 가속도/자이로 6바이트 두 블록을 축마다 부호 변환 (벤치마크 비교용)"""
+    def signed(msb, lsb):
+        value = (msb << 8) | lsb
+        return value - 65536 if value > 32767 else value
+    return ({'x': signed(accel[0], accel[1]), 'y': signed(accel[2], accel[3]), 'z': signed(accel[4], accel[5])},
+            {'x': signed(gyro[0], gyro[1]), 'y': signed(gyro[2], gyro[3]), 'z': signed(gyro[4], gyro[5])})
+
+
+def _burst_decode(data):
+    """버스트 변환: 14바이트 한 블록을 한 번에 언팩 (기존 방식과 같은 가속도/자이로 dict만 생성)"""
+    ax, ay, az, _, gx, gy, gz = BURST_FORMAT.unpack(bytes(data))
+    return {'x': ax, 'y': ay, 'z': az}, {'x': gx, 'y': gy, 'z': gz}
+
+
+def benchmark_burst_read(samples=20000, clock_hz=400000):
+    """
+    가상 I2C 버스에서 기존 두 번 읽기 ↔ 14바이트 버스트 읽기 비교
+    두 방식 모두 같은 가속도/자이로 dict를 만들도록 변환 작업을 맞추고,
+    변환 CPU 시간은 미리 읽은 바이트로 측정 (가상 버스 자체의 파이썬 오버헤드 제외),
+    버스 시간은 트랜잭션 기록으로 모델링
+    초당 샘플 수 = 1 / (샘플당 변환 시간 + 샘플당 버스 전송 시간)
+    """
+    bus = FakeMPU6050Bus(clock_hz)
+    bus.set_sample(accel=(-1200, 850, 16100), gyro=(-40, 25, 7), temperature=31.0)
+    # 가상 버스이므로 초기화/보정 대기는 가상 시계로 건너뜀
+    sensor = BodyDetectInclination(bus, calibration_cache=IMUCalibrationCache(path=None),
+                                   clock=VirtualClock(speed=1000))
+    address = sensor.mpu6050_address
+    result = {'samples': samples, 'i2c_clock_hz': clock_hz}
+
+    # 버스 트랜잭션/전송 시간 (한 샘플 읽기)
+    reads = {
+        'legacy': lambda: (bus.read_i2c_block_data(address, ACCEL_XOUT_H, 6),
+                           bus.read_i2c_block_data(address, 0x43, 6)),
+        'burst': lambda: (bus.read_i2c_block_data(address, ACCEL_XOUT_H, BURST_LENGTH),)
+    }
+    decoders = {'legacy': _legacy_decode, 'burst': _burst_decode}
+    outputs = {}
+    for name, read in reads.items():
+        bus.bus_time = 0.0
+        transaction_start = len(bus.transactions)
+        data = read()
+        result[f'{name}_transactions_per_sample'] = len(bus.transactions) - transaction_start
+        result[f'{name}_bus_us'] = bus.bus_time * 1e6
+
+        decode = decoders[name]
+        start = time.perf_counter()
+        for _ in range(samples):
+            outputs[name] = decode(*data)
+        decode_time = time.perf_counter() - start
+        result[f'{name}_decode_us'] = decode_time / samples * 1e6
+        result[f'{name}_samples_per_second'] = 1e6 / (result[f'{name}_decode_us'] + result[f'{name}_bus_us'])
+
+    if outputs['legacy'] != outputs['burst']:
+        raise RuntimeError("기존/버스트 변환 결과가 다릅니다")
+    result['bus_time_saving_us'] = result['legacy_bus_us'] - result['burst_bus_us']
+    result['speedup'] = result['burst_samples_per_second'] / result['legacy_samples_per_second']
+    sensor.cleanup()
+    return result
+
+
+if __name__ == "__main__":
+    for key, value in benchmark_burst_read().items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
@@ -0,0 +1,239 @@
+import math
+import threading
+from collections import namedtuple
+import numpy as np
+from joint_pose import LEG_NAMES
+from control_clock import SYSTEM_CLOCK
+from periodic_scheduler import PeriodicScheduler
+
+
+# MCP3008 (10비트 8채널 SPI ADC)
+MCP3008_CHANNELS = 8
+MCP3008_MAX_VALUE = 1023
+MCP3008_SPI_SPEED = 1350000     # 3.3V 기준 최대 클록 (Hz)
+
+# 발별 FSR 채널 (LEG_NAMES 순서)
+DEFAULT_FSR_CHANNELS = (0, 1, 2, 3)
+
+# 접촉 이벤트 (시각, 다리 이름, 'touchdown'/'liftoff', 정규화 압력)
+ContactEvent = namedtuple('ContactEvent', ['timestamp', 'leg', 'kind', 'force'])
+
+
+def mcp3008_command(channel):
+    """단일 종단 변환 명령 프레임 (시작 비트, SGL/DIFF + 채널, 응답 자리)"""
+    return [0x01, 0x80 | (channel << 4), 0x00]
+
+
+def mcp3008_decode(reply):
+    """응답 프레임 → 10비트 변환값"""
+    return ((reply[1] & 0x03) << 8) | reply[2]
+
+
+class SpidevTransport:
+    """
+    spidev 기반 SPI 전송
+    MCP3008은 변환마다 CS를 다시 내려야 하므로 채널별 3바이트 프레임을 연속 전송
+    """
+    def __init__(self, bus=0, device=0, max_speed_hz=MCP3008_SPI_SPEED):
+        import spidev
+        self.spi = spidev.SpiDev()
+        self.spi.open(bus, device)
+        self.spi.max_speed_hz = max_speed_hz
+        self.spi.mode = 0
+
+    def transfer(self, frames):
+        """프레임 목록을 차례로 전송하고 응답 목록 반환"""
+        xfer2 = self.spi.xfer2
+        return [xfer2(frame) for frame in frames]
+
+    def close(self):
+        self.spi.close()
+
+
+class FakeSPIBus:
+    """
+    테스트용 인메모리 SPI 버스 (MCP3008 모사)
+    채널별 변환값을 직접 설정하고 전송 기록을 유지
+    """
+    def __init__(self):
+        self.values = [0] * MCP3008_CHANNELS
+        self.transactions = []      # 전송 묶음별 프레임 수
+        self.closed = False
+
+    def set_value(self, channel, value):
+        """채널 변환값 설정 (0 ~ 1023)"""
+        self.values[channel] = max(0, min(MCP3008_MAX_VALUE, int(value)))
+
+    def transfer(self, frames):
+        replies = []
+        for frame in frames:
+            if frame[0] != 0x01 or not frame[1] & 0x80:
+                raise ValueError(f"MCP3008 명령 형식 오류: {frame}")
+            value = self.values[(frame[1] >> 4) & 0x07]
+            replies.append([0x00, (value >> 8) & 0x03, value & 0xFF])
+        self.transactions.append(len(frames))
+        return replies
+
+    def close(self):
+        self.closed = True
+
+
+class MCP3008:
+    """MCP3008 SPI ADC (여러 채널을 한 번의 전송 묶음으로 읽음)"""
+    def __init__(self, bus=None):
+        self.bus = bus if bus is not None else SpidevTransport()
+
+    def read_channels(self, channels):
+        """채널 목록의 10비트 변환값 배열"""
+        replies = self.bus.transfer([mcp3008_command(channel) for channel in channels])
+        return np.array([mcp3008_decode(reply) for reply in replies], dtype=np.float64)
+
+    def close(self):
+        self.bus.close()
+
+
+class FSRContactSensor:
+    """
+    발바닥 FSR402 접촉 감지
+    네 발 FSR을 한 번의 SPI 묶음으로 sample_rate(Hz)로 읽고,
+    히스테리시스 임계값 + 디바운스(연속 샘플 수)로 착지/이륙 이벤트 발생
+    """
+    def __init__(self, adc=None, channels=DEFAULT_FSR_CHANNELS, sample_rate=500,
+                 touchdown_threshold=0.25, liftoff_threshold=0.15, debounce=0.01, clock=SYSTEM_CLOCK):
+        if adc is None:
+            try:
+                adc = MCP3008()
+                self.simulation_mode = False
+            except Exception as e:
+                print(f"MCP3008 초기화 오류: {e}. 시뮬레이션 모드로 실행됩니다.")
+                adc = MCP3008(FakeSPIBus())
+                self.simulation_mode = True
+        else:
+            self.simulation_mode = isinstance(adc.bus, FakeSPIBus)
+
+        if len(channels) != len(LEG_NAMES):
+            raise ValueError(f"FSR 채널은 다리 {len(LEG_NAMES)}개 모두 지정해야 합니다")
+
+        self.adc = adc
+        self.channels = tuple(channels)
+        self.clock = clock
+        self.sample_rate = sample_rate
+        self.touchdown_threshold = touchdown_threshold    # 착지 판정 압력 (0~1)
+        self.liftoff_threshold = liftoff_threshold        # 이륙 판정 압력 (0~1, 히스테리시스)
+        self.debounce_samples = max(1, math.ceil(debounce * sample_rate))
+
+        # 상태 (다리별 배열, LEG_NAMES 순서)
+        self.forces = np.zeros(len(LEG_NAMES))
+        self.contacts = np.zeros(len(LEG_NAMES), dtype=bool)
+        self._pending = np.zeros(len(LEG_NAMES), dtype=np.int64)    # 반대 상태가 연속된 샘플 수
+
+        self.events = []                # 최근 이벤트 (최대 max_events개)
+        self.max_events = 200
+        self.listeners = []
+        self.sample_count = 0
+        self.event_count = 0
+
+        self.scheduler = PeriodicScheduler(sample_rate, clock, name='fsr')
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.running = False
+
+    def add_listener(self, callback):
+        """접촉 이벤트 콜백 등록 (샘플링 스레드에서 ContactEvent로 호출)"""
+        self.listeners.append(callback)
+
+    def sample_once(self):
+        """네 발 압력을 한 번 읽고 디바운스된 접촉 상태 갱신, 발생한 이벤트 목록 반환"""
+        forces = self.adc.read_channels(self.channels) / MCP3008_MAX_VALUE
+        self.forces = forces
+        self.sample_count += 1
+
+        # 현재 상태와 반대 임계값을 넘은 샘플이 debounce_samples번 연속되면 상태 전환
+        crossing = np.where(self.contacts, forces < self.liftoff_threshold, forces > self.touchdown_threshold)
+        self._pending = np.where(crossing, self._pending + 1, 0)
+        changed = self._pending >= self.debounce_samples
+        if not changed.any():
+            return []
+
+        contacts = self.contacts.copy()
+        contacts[changed] = ~contacts[changed]
+        self._pending[changed] = 0
+        self.contacts = contacts
+
+        now = self.clock.now()
+        events = [
+            ContactEvent(now, LEG_NAMES[leg], 'touchdown' if contacts[leg] else 'liftoff', float(forces[leg]))
+            for leg in np.flatnonzero(changed)
+        ]
+        self.events.extend(events)
+        if len(self.events) > self.max_events:
+            del self.events[:-self.max_events]
+        self.event_count += len(events)
+
+        for event in events:
+            for callback in self.listeners:
+                callback(event)
+        return events
+
+    def start(self):
+        """샘플링 스레드 시작"""
+        if self.running:
+            return False
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='fsr-sampler', daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        wait = lambda timeout: self.clock.wait(self._stop_event, timeout)
+        self.scheduler.start()
+        try:
+            while not self._stop_event.is_set():
+                self.sample_once()
+                if self.scheduler.wait_next(wait):
+                    break
+        except Exception as e:
+            print(f"FSR 샘플링 오류: {e}")
+        finally:
+            self.running = False
+
+    def stop(self):
+        """샘플링 스레드 정지"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        self.running = False
+
+    def get_contacts(self):
+        """다리별 접촉 여부 ({다리: bool})"""
+        contacts = self.contacts
+        return {leg_name: bool(contact) for leg_name, contact in zip(LEG_NAMES, contacts)}
+
+    def get_forces(self):
+        """다리별 정규화 압력 ({다리: 0~1})"""
+        forces = self.forces
+        return {leg_name: float(force) for leg_name, force in zip(LEG_NAMES, forces)}
+
+    def get_status(self):
+        """FSR 센서 상태 정보 반환"""
+        return {
+            'simulation_mode': self.simulation_mode,
+            'running': self.running,
+            'sample_rate': self.sample_rate,
+            'sample_count': self.sample_count,
+            'event_count': self.event_count,
+            'contacts': self.get_contacts(),
+            'forces': self.get_forces(),
+            'scheduler': self.scheduler.get_stats()
+        }
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+        try:
+            self.adc.close()
+        except:
+            pass
+        print("FSR 센서 리소스 정리 완료")
@@ -0,0 +1,181 @@
+import math
+from functools import lru_cache
+import numpy as np
+from joint_pose import LEG_NAMES, LEG_JOINT_INDEX, JOINT_COUNT, clamp_pose
+from leg_kinematics import NEUTRAL_FEET, TRACK_WIDTH, CachedLegIK
+
+
+# 보행 종류별 기본 설정 (다리별 위상 오프셋: front_left, front_right, back_left, back_right)
+GAIT_PRESETS = {
+    'crawl': {'duty_factor': 0.75, 'phase_offsets': (0.0, 0.5, 0.75, 0.25)},   # 한 다리씩 (FL → BR → FR → BL)
+    'trot': {'duty_factor': 0.5, 'phase_offsets': (0.0, 0.5, 0.5, 0.0)},       # 대각선 다리 쌍
+    'pace': {'duty_factor': 0.5, 'phase_offsets': (0.0, 0.5, 0.0, 0.5)},       # 같은 쪽 다리 쌍
+    'bound': {'duty_factor': 0.5, 'phase_offsets': (0.0, 0.0, 0.5, 0.5)}       # 앞다리/뒷다리 쌍
+}
+
+# 보행 테이블 기본 해상도 (한 주기당 샘플 수)
+DEFAULT_GAIT_SAMPLES = 200
+
+# 다리별 관절 인덱스 (LEG_NAMES 순서)
+_HIP_INDEX = np.array([LEG_JOINT_INDEX[(leg, 'hip')] for leg in LEG_NAMES])
+_KNEE_INDEX = np.array([LEG_JOINT_INDEX[(leg, 'knee')] for leg in LEG_NAMES])
+_ANKLE_INDEX = np.array([LEG_JOINT_INDEX[(leg, 'ankle')] for leg in LEG_NAMES])
+
+# 다리별 좌우 부호 (왼쪽 -1, 오른쪽 +1; 좌회전 시 오른쪽 다리 보폭 증가)
+LEG_SIDES = np.array([-1.0 if leg.endswith('left') else 1.0 for leg in LEG_NAMES])
+
+# 직교 좌표 보행용 역기구학 (보행 간에 반복되는 발 위치 해를 재사용)
+_GAIT_IK = CachedLegIK()
+
+
+class GaitTable:
+    """
+    한 보행 주기를 미리 계산한 관절 테이블
+    poses[샘플, 관절]은 정규화된 주기 위상(0~1)의 관절 각도, contacts[샘플, 다리]는 지지 여부
+    """
+    def __init__(self, gait, duty_factor, phase_offsets, step_length, step_height, poses, contacts,
+                 turn=0.0, lateral=0.0, cartesian=False, reachable=True):
+        self.gait = gait
+        self.duty_factor = duty_factor
+        self.phase_offsets = phase_offsets
+        self.step_length = step_length
+        self.step_height = step_height
+        self.turn = turn
+        self.lateral = lateral
+        self.cartesian = cartesian          # True면 보폭/높이 단위가 cm (발 궤적 → 역기구학)
+        self.reachable = reachable          # 모든 발 목표가 관절 제한 안에서 도달 가능한지
+        self.poses = poses
+        self.contacts = contacts
+        self.samples = len(poses)
+
+    def index_at(self, phase):
+        """주기 위상 → 테이블 행 인덱스"""
+        return int(phase * self.samples) % self.samples
+
+    def pose_at(self, phase):
+        """주기 위상의 관절 자세 벡터 (읽기 전용 행)"""
+        return self.poses[self.index_at(phase)]
+
+    def contacts_at(self, phase):
+        """주기 위상의 다리별 지지 여부"""
+        return self.contacts[self.index_at(phase)]
+
+
+def _swing_profile(amplitude, stance, stance_progress, swing_progress):
+    """지지 구간 등속 +A/2 → -A/2, 유각 구간 코사인 -A/2 → +A/2"""
+    half = amplitude / 2.0
+    return np.where(stance, half - amplitude * stance_progress, -half * np.cos(np.pi * swing_progress))
+
+
+def _render_gait(gait, duty_factor, phase_offsets, step_length, step_height, samples, turn=0.0, lateral=0.0,
+                 cartesian=False):
+    """
+    보행 한 주기를 관절 테이블로 계산
+    지지 구간: 힙(또는 발)이 +L/2 → -L/2로 등속 이동 (몸체 추진)
+    유각 구간: -L/2 → +L/2로 코사인 가속/감속, 무릎(또는 발 높이)을 사인 곡선으로 들어올림
+    turn: 좌우 다리 보폭 차이 (양수면 좌회전), lateral: 발목 좌우 스윙 폭 (도, 옆걸음)
+    cartesian=True면 보폭/높이/turn을 cm 단위 발 궤적으로 보고 역기구학으로 관절 각도 계산
+    """
+    phase = np.arange(samples) / samples
+    leg_phase = (phase[:, None] - np.asarray(phase_offsets)[None, :]) % 1.0     # (샘플, 다리)
+
+    stance = leg_phase < duty_factor
+    stance_progress = leg_phase / duty_factor
+    swing_progress = (leg_phase - duty_factor) / (1.0 - duty_factor)
+
+    leg_step_lengths = step_length + turn * LEG_SIDES
+    stride = _swing_profile(leg_step_lengths, stance, stance_progress, swing_progress)
+    lift = np.where(stance, 0.0, step_height * np.sin(np.pi * swing_progress))
+    ankle = _swing_profile(lateral, stance, stance_progress, swing_progress)
+
+    reachable = True
+    if cartesian:
+        # 중립 발 위치 기준 발 궤적 (샘플, 다리, [x, z]) → 관절 각도
+        feet = np.empty((samples, len(LEG_NAMES), 2))
+        feet[..., 0] = NEUTRAL_FEET[:, 0] + stride
+        feet[..., 1] = NEUTRAL_FEET[:, 1] + lift
+        poses, leg_reachable = _GAIT_IK.solve(feet, ankle)
+        reachable = bool(leg_reachable.all())
+        if not reachable:
+            print(f"경고: {gait} 보행 (보폭 {step_length}cm, 높이 {step_height}cm)의 일부 발 위치가 관절 제한을 벗어나 제한됩니다.")
+    else:
+        poses = np.zeros((samples, JOINT_COUNT))
+        poses[:, _HIP_INDEX] = stride
+        poses[:, _KNEE_INDEX] = lift
+        poses[:, _ANKLE_INDEX] = ankle
+        clamp_pose(poses, out=poses)
+
+    # 캐시로 공유되므로 읽기 전용
+    poses.flags.writeable = False
+    stance.flags.writeable = False
+    return GaitTable(gait, duty_factor, phase_offsets, step_length, step_height, poses, stance, turn, lateral,
+                     cartesian, reachable)
+
+
+@lru_cache(maxsize=128)
+def _cached_gait(gait, duty_factor, phase_offsets, step_length, step_height, samples, turn, lateral, cartesian):
+    return _render_gait(gait, duty_factor, phase_offsets, step_length, step_height, samples, turn, lateral,
+                        cartesian)
+
+
+def get_gait_table(gait='crawl', step_length=20.0, step_height=15.0, duty_factor=None,
+                   phase_offsets=None, samples=DEFAULT_GAIT_SAMPLES, turn=0.0, lateral=0.0, cartesian=False):
+    """
+    보행 테이블 반환 (같은 파라미터는 한 번만 계산하여 캐시)
+    gait: 'crawl', 'trot', 'pace', 'bound'
+    step_length: 힙 스윙 각도 (도, 음수면 후진), step_height: 유각기 무릎 들어올림 (도)
+    turn: 좌우 보폭 차이 (도, 양수면 좌회전), lateral: 발목 옆걸음 스윙 폭 (도)
+    cartesian=True면 step_length/step_height/turn은 발 궤적 (cm)
+    """
+    if gait not in GAIT_PRESETS:
+        raise ValueError(f"알 수 없는 보행 종류: {gait}")
+
+    preset = GAIT_PRESETS[gait]
+    if duty_factor is None:
+        duty_factor = preset['duty_factor']
+    if phase_offsets is None:
+        phase_offsets = preset['phase_offsets']
+
+    if not 0.0 < duty_factor < 1.0:
+        raise ValueError(f"듀티 비는 0과 1 사이여야 합니다: {duty_factor}")
+    if len(phase_offsets) != len(LEG_NAMES):
+        raise ValueError(f"위상 오프셋은 다리 {len(LEG_NAMES)}개 모두 지정해야 합니다")
+
+    # 캐시 키 정규화 (부동소수 표기 차이로 중복 계산하지 않도록)
+    return _cached_gait(
+        gait,
+        round(float(duty_factor), 4),
+        tuple(round(float(offset) % 1.0, 4) for offset in phase_offsets),
+        round(float(step_length), 3),
+        round(float(step_height), 3),
+        int(samples),
+        round(float(turn), 3),
+        round(float(lateral), 3),
+        bool(cartesian)
+    )
+
+
+def stride_per_cycle(step_length, duty_factor):
+    """
+    보폭 → 한 주기 몸체 전진 거리
+    지지 다리가 듀티 비 구간 동안 보폭만큼 뒤로 밀므로 몸체는 주기마다 step_length/duty_factor 전진 (주행 거리계와 같은 모델)
+    """
+    return step_length / duty_factor
+
+
+def turn_for_yaw_rate(yaw_rate, cycle_time, duty_factor, track_width=TRACK_WIDTH):
+    """
+    목표 회전 속도 (도/초, 양수면 좌회전) → 직교 좌표 보행 turn (cm)
+    좌우 다리 보폭 차이 2*turn이 한 주기 동안 몸체를 2*turn/(track_width*duty_factor) 라디안 회전시킴 (stride_per_cycle과 같은 모델)
+    """
+    return math.radians(yaw_rate) * cycle_time * duty_factor * track_width / 2.0
+
+
+def yaw_rate_for_turn(turn, cycle_time, duty_factor, track_width=TRACK_WIDTH):
+    """직교 좌표 보행 turn (cm) → 예상 회전 속도 (도/초)"""
+    return math.degrees(2.0 * turn / track_width) / (cycle_time * duty_factor)
+
+
+def clear_gait_cache():
+    """보행 테이블 캐시 초기화"""
+    _cached_gait.cache_clear()
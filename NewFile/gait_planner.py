@@ -0,0 +1,85 @@
+import math
+import numpy as np
+from joint_pose import new_pose
+from leg_kinematics import NEUTRAL_FEET, ANKLE_INDEX, CachedLegIK, forward_kinematics
+
+
+def _smoothstep(u):
+    return u * u * (3.0 - 2.0 * u)
+
+
+class GaitTransitionPlanner:
+    """
+    보행 전환 예측 계획기
+    현재 보행 위상부터 전환이 끝날 때까지의 발 목표를 한 번에 계산 (제어 틱 단위 구간)
+    다리마다 다음 유각 구간 동안 이전 보행 발 궤적 → 다음 보행(또는 서기 자세) 발 궤적으로 혼합하므로
+    지지 중인 발은 끌리지 않고, 모든 다리가 한 번씩 유각하는 한 주기 이내에 전환이 끝남
+    """
+    def __init__(self, clearance=3.0, stand_fraction=0.5, ik=None):
+        self.clearance = clearance              # 전환 유각 최소 발 높이 (cm)
+        self.stand_fraction = stand_fraction    # 서기 ↔ 서기 전환 시간 (주기 비율)
+        self.ik = ik if ik is not None else CachedLegIK()
+
+    @staticmethod
+    def _table_rows(table, phases):
+        indices = (phases * table.samples).astype(np.intp) % table.samples
+        return table.poses[indices]
+
+    def _swing_windows(self, schedule, phase):
+        """다리별 혼합 구간 (시작 위상, 끝 위상): 진행 중인 유각은 남은 구간, 아니면 다음 유각 구간"""
+        if schedule is None:
+            start = np.full(len(NEUTRAL_FEET), phase)
+            return start, start + self.stand_fraction
+
+        offsets = np.asarray(schedule.phase_offsets)
+        duty_factor = schedule.duty_factor
+        leg_phase = (phase - offsets) % 1.0
+        in_swing = leg_phase >= duty_factor
+        start = np.where(in_swing, phase, phase + (duty_factor - leg_phase))
+        end = np.where(in_swing, phase + (1.0 - leg_phase), start + (1.0 - duty_factor))
+        return start, end
+
+    def plan(self, source, target, phase, cycle_time, control_rate, current_pose=None):
+        """
+        전환 계획
+        source/target: 보행 테이블 (None이면 서기 자세, source=None은 current_pose에서 시작)
+        반환: (틱별 관절 자세 (T, 12), 틱별 보행 위상 (T,)) - 마지막 행은 target의 끝 위상 자세
+        """
+        start, end = self._swing_windows(source if source is not None else target, phase)
+        end_phase = float(end.max())
+
+        tick_phase = 1.0 / (control_rate * cycle_time)
+        tick_count = max(1, math.ceil((end_phase - phase) / tick_phase)) + 1
+        phases = np.minimum(phase + np.arange(tick_count) * tick_phase, end_phase)
+
+        # 다리별 혼합 진행률 (T, 4)
+        span = np.maximum(end - start, 1e-9)
+        progress = np.clip((phases[:, None] - start) / span, 0.0, 1.0)
+        weight = _smoothstep(progress)
+
+        # 이전/다음 발 궤적 (T, 4, 2)과 발목 (T, 4)
+        if source is not None:
+            source_rows = self._table_rows(source, phases)
+        else:
+            pose = current_pose if current_pose is not None else new_pose()
+            source_rows = np.broadcast_to(pose, (tick_count, len(pose)))
+        if target is not None:
+            target_rows = self._table_rows(target, phases)
+            target_feet = forward_kinematics(target_rows)
+            target_ankle = target_rows[:, ANKLE_INDEX]
+        else:
+            target_feet = np.broadcast_to(NEUTRAL_FEET, (tick_count,) + NEUTRAL_FEET.shape)
+            target_ankle = np.zeros((tick_count, len(NEUTRAL_FEET)))
+        source_feet = forward_kinematics(source_rows)
+        source_ankle = source_rows[:, ANKLE_INDEX]
+
+        feet = source_feet + weight[..., None] * (target_feet - source_feet)
+        ankle = source_ankle + weight * (target_ankle - source_ankle)
+
+        # 혼합 중인 발은 최소 높이만큼 들어올려 지면에 끌리지 않게 함
+        blending = (progress > 0.0) & (progress < 1.0)
+        lift = NEUTRAL_FEET[:, 1] + self.clearance * np.sin(np.pi * progress)
+        feet[..., 1] = np.where(blending, np.maximum(feet[..., 1], lift), feet[..., 1])
+
+        poses, _ = self.ik.solve(feet, ankle)
+        return poses, phases
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+
+
+# 기본 IMU 보정 캐시 경로 (모듈과 같은 디렉토리)
+DEFAULT_IMU_CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'imu_calibration.json')
+
+# 온도 구간 (섭씨), 이 간격마다 보정값을 따로 저장
+TEMPERATURE_STEP = 5.0
+
+# 보정값 유효 기간 (초), 오래된 보정값은 센서 노화/재장착을 고려해 다시 보정
+CALIBRATION_MAX_AGE = 30 * 24 * 3600.0
+
+# 보정 중 움직임 판정 (자이로 표준편차, 도/초)
+CALIBRATION_MOTION_LIMIT = 2.0
+
+
+def compute_calibration(raw, temperatures, accel_scale, gyro_scale, motion_limit=CALIBRATION_MOTION_LIMIT):
+    """
+    정지/수평 상태에서 모은 버스트 원시값 (N, 7)으로 보정값 계산 (NumPy 일괄 처리)
+    자이로가 중앙값에서 크게 벗어난 샘플(충격)은 제외하고, 가속도 z 오프셋은 1g를 남겨 중력을 지우지 않음
+    남은 샘플도 흔들리면 (자이로 표준편차 > motion_limit) None
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    accel = raw[:, 0:3]
+    gyro = raw[:, 4:7]
+
+    median = np.median(gyro, axis=0)
+    spread = 1.4826 * np.median(np.abs(gyro - median), axis=0) + 1.0
+    keep = (np.abs(gyro - median) <= 3.0 * spread).all(axis=1)
+    if keep.sum() < len(raw) // 2:
+        return None
+
+    gyro_noise = gyro[keep].std(axis=0) / gyro_scale
+    if gyro_noise.max() > motion_limit:
+        return None
+
+    accel_offset = accel[keep].mean(axis=0)
+    accel_offset[2] -= accel_scale
+    gyro_offset = gyro[keep].mean(axis=0)
+    return {
+        'accel': dict(zip('xyz', accel_offset.tolist())),
+        'gyro': dict(zip('xyz', gyro_offset.tolist())),
+        'temperature': float(np.mean(np.asarray(temperatures)[keep])),
+        'gyro_noise': gyro_noise.tolist(),
+        'samples': int(keep.sum()),
+        'updated': time.time()
+    }
+
+
+class IMUCalibrationCache:
+    """
+    IMU 보정값 디스크 캐시 (JSON)
+    센서 식별자 → 온도 구간 → 보정값, 시작 시 현재 온도에 가장 가까운 구간을 읽어 전체 보정을 생략
+    path=None이면 파일 없이 메모리에만 보관, max_age=None이면 유효 기간 없음
+    """
+    def __init__(self, path=DEFAULT_IMU_CALIBRATION_PATH, temperature_step=TEMPERATURE_STEP,
+                 max_age=CALIBRATION_MAX_AGE):
+        self.path = path
+        self.temperature_step = temperature_step
+        self.max_age = max_age
+        self.entries = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def _bin(self, temperature):
+        return str(int(round(temperature / self.temperature_step) * self.temperature_step))
+
+    def load(self):
+        """캐시 파일 로드 (없거나 잘못되면 빈 캐시)"""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            if not isinstance(entries, dict):
+                raise ValueError("센서별 보정값 객체가 아닙니다")
+            self.entries = entries
+        except Exception as e:
+            print(f"IMU 보정 캐시 로드 오류 ({self.path}): {e}. 전체 보정을 실행합니다.")
+            self.entries = {}
+
+    def _usable(self, entry, temperature, now):
+        """형식이 맞고, 유효 기간 안이며, 온도 차이가 temperature_step 이내인 보정값인지"""
+        try:
+            if not all(set(entry[key]) == set('xyz') for key in ('accel', 'gyro')):
+                return False
+            if self.max_age is not None and now - entry['updated'] > self.max_age:
+                return False
+            return abs(entry['temperature'] - temperature) <= self.temperature_step
+        except (KeyError, TypeError):
+            return False
+
+    def lookup(self, sensor_id, temperature):
+        """현재 온도에서 temperature_step 이내로 가장 가까운 유효한 보정값 (없으면 None)"""
+        with self._lock:
+            bins = self.entries.get(sensor_id)
+            candidates = list(bins.values()) if isinstance(bins, dict) else []
+        now = time.time()
+        candidates = [entry for entry in candidates if self._usable(entry, temperature, now)]
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda entry: abs(entry['temperature'] - temperature))
+        return json.loads(json.dumps(best))
+
+    def store(self, sensor_id, calibration):
+        """보정값을 온도 구간에 기록 (저장은 save())"""
+        with self._lock:
+            if not isinstance(self.entries.get(sensor_id), dict):
+                self.entries[sensor_id] = {}
+            self.entries[sensor_id][self._bin(calibration['temperature'])] = calibration
+
+    def save(self):
+        """캐시 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        if self.path is None:
+            return True
+        try:
+            with self._lock:
+                data = json.dumps(self.entries, indent=2, ensure_ascii=False)
+            temporary_path = self.path + '.tmp'
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temporary_path, self.path)
+            return True
+        except Exception as e:
+            print(f"IMU 보정 캐시 저장 오류 ({self.path}): {e}")
+            return False
+
+    def save_in_background(self):
+        """제어 루프를 막지 않도록 별도 스레드에서 저장"""
+        thread = threading.Thread(target=self.save, name='imu-calibration-save', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,251 @@
+import math
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from control_clock import SYSTEM_CLOCK
+from periodic_scheduler import PeriodicScheduler
+
+
+# 자세 샘플 (불변, 통째로 교체하여 스레드 간 전달)
+AttitudeSample = namedtuple(
+    'AttitudeSample', ['timestamp', 'roll', 'pitch', 'yaw', 'roll_rate', 'pitch_rate', 'yaw_rate']
+)
+
+# 링 버퍼 열 (AttitudeSample 필드 순서)
+HISTORY_COLUMNS = AttitudeSample._fields
+
+
+class IMUSampler:
+    """
+    백그라운드 IMU 샘플러
+    별도 스레드에서 센서를 sample_rate로 읽어 최신 자세 샘플을 게시,
+    제어 루프는 센서를 기다리지 않고 get_latest()로 마지막 샘플만 가져감
+    최근 history초 샘플은 미리 할당한 링 버퍼에 쌓아 get_window()로 구간 조회
+    use_fifo=True면 센서 FIFO를 drain_rate로 비우고 묶음 전체를 필터에 넣음 (스레드가 밀려도 샘플 유실 없음)
+    """
+    def __init__(self, sensor=None, sample_rate=None, clock=SYSTEM_CLOCK, use_fifo=False, drain_rate=20,
+                 history=2.0):
+        if sensor is None:
+            from detect_inclination import BodyDetectInclination
+            sensor = BodyDetectInclination(clock=clock)
+            self._owns_sensor = True
+        else:
+            self._owns_sensor = False
+
+        self.sensor = sensor
+        self.sample_rate = sample_rate if sample_rate is not None else sensor.sample_rate
+        self.clock = clock
+        self.use_fifo = use_fifo and hasattr(sensor, 'enable_fifo')
+        self.drain_rate = drain_rate
+        self.block_count = 0
+
+        # 자세 이력 링 버퍼 (쓰는 쪽은 샘플링 스레드 하나, 시퀀스 잠금 방식)
+        # 쓰기 전후로 _sequence를 올려 (쓰는 중이면 홀수) 읽는 쪽이 겹친 복사를 알아채고 다시 복사
+        rows = max(1, math.ceil(history * self.sample_rate))
+        self.history = np.zeros((rows, len(HISTORY_COLUMNS)))
+        self.write_count = 0
+        self._sequence = 0
+
+        self.latest = None              # 마지막 AttitudeSample
+        self.sample_count = 0
+        self.error_count = 0
+        self.running = False
+        self.users = []                 # acquire()한 사용자 목록
+        self._users_lock = threading.Lock()
+        self.scheduler = PeriodicScheduler(self.drain_rate if self.use_fifo else self.sample_rate, clock,
+                                           name='imu_sampler')
+        self._stop_event = threading.Event()
+        self._new_sample = threading.Event()
+        self._thread = None
+
+    def acquire(self, owner):
+        """사용자 등록 (첫 사용자가 샘플링 스레드 시작), 샘플러 자신을 반환"""
+        with self._users_lock:
+            self.users.append(owner)
+            self.start()
+        return self
+
+    def release(self, owner):
+        """사용자 해제 (마지막 사용자가 해제하면 스레드 정지, 전역 샘플러면 센서 정리)"""
+        with self._users_lock:
+            if owner in self.users:
+                self.users.remove(owner)
+            if self.users:
+                return
+        self.cleanup()
+        _clear_imu_sampler(self)
+
+    def start(self):
+        """샘플링 스레드 시작"""
+        if self.running:
+            return False
+
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='imu-sampler', daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        if self.use_fifo and not self.sensor.enable_fifo():
+            self.use_fifo = False
+            self.scheduler.set_rate(self.sample_rate)
+        wait = lambda timeout: self.clock.wait(self._stop_event, timeout)
+        self.scheduler.start()
+        while not self._stop_event.is_set():
+            if self.use_fifo:
+                self.sample_block()
+            else:
+                self.sample_once()
+
+            # 절대 마감 시각 기준 대기 (밀린 주기는 건너뜀)
+            if self.scheduler.wait_next(wait):
+                break
+        if self.use_fifo:
+            self.sensor.disable_fifo()
+        self.running = False
+
+    def _append(self, rows):
+        """링 버퍼에 행 추가 (버퍼보다 많으면 최근 행만)"""
+        capacity = len(self.history)
+        rows = rows[-capacity:]
+        indices = (self.write_count + np.arange(len(rows))) % capacity
+        self._sequence += 1
+        self.history[indices] = rows
+        self.write_count += len(rows)
+        self._sequence += 1
+
+    def sample_once(self):
+        """센서 한 번 읽어 최신 샘플 갱신 (실패 시 None)"""
+        data = self.sensor.read_gyro()
+        if data is None:
+            self.error_count += 1
+            return None
+
+        angles = data['angles']
+        rates = data['gyro_rates']
+        sample = AttitudeSample(
+            self.clock.now(), angles['roll'], angles['pitch'], angles['yaw'],
+            rates['roll'], rates['pitch'], rates['yaw']
+        )
+        self._append(np.array([sample]))
+        self.latest = sample
+        self.sample_count += 1
+        self._new_sample.set()
+        return sample
+
+    def sample_block(self):
+        """센서 FIFO를 비워 묶음 전체를 필터링하고 마지막 샘플 게시 (꺼낸 샘플 수 반환)"""
+        try:
+            block = self.sensor.read_fifo_block(self.clock.now())
+            angles = self.sensor.process_block(block)
+        except Exception as e:
+            print(f"IMU FIFO 읽기 오류: {e}")
+            self.error_count += 1
+            return 0
+        if len(block) == 0:
+            return 0
+
+        rows = np.column_stack((block[:, 0], angles, block[:, 4:7]))
+        self._append(rows)
+        self.latest = AttitudeSample(*rows[-1].tolist())
+        self.sample_count += len(block)
+        self.block_count += 1
+        self._new_sample.set()
+        return len(block)
+
+    def get_latest(self):
+        """마지막 자세 샘플 (아직 없으면 None)"""
+        return self.latest
+
+    def wait_for_sample(self, timeout=1.0):
+        """첫 샘플이 게시될 때까지 대기"""
+        if self.latest is None:
+            self.clock.wait(self._new_sample, timeout)
+        return self.latest
+
+    def get_window(self, duration=None):
+        """
+        최근 duration초 (None이면 버퍼 전체) 자세 이력 (N, 7) 배열 사본, 오래된 순 (열: HISTORY_COLUMNS)
+        잠금 없이 복사하고, 복사 중 샘플링 스레드가 썼으면 (시퀀스 변경) 쓰기가 끝난 뒤 다시 복사
+        """
+        capacity = len(self.history)
+        while True:
+            sequence = self._sequence
+            if sequence % 2:
+                time.sleep(0)       # 쓰는 중: 샘플링 스레드에 양보
+                continue
+            end = self.write_count
+            count = min(end, capacity)
+            window = self.history[(end - count + np.arange(count)) % capacity]
+            if self._sequence == sequence:
+                break
+        if duration is not None and len(window):
+            window = window[window[:, 0] >= window[-1, 0] - duration]
+        return window
+
+    def get_average(self, duration):
+        """최근 duration초 평균 자세 (AttitudeSample, 시각은 마지막 샘플, 이력이 없으면 None)"""
+        window = self.get_window(duration)
+        if not len(window):
+            return None
+        average = window.mean(axis=0)
+        average[0] = window[-1, 0]
+        return AttitudeSample(*average.tolist())
+
+    def stop(self):
+        """샘플링 스레드 정지"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        self.running = False
+
+    def get_status(self):
+        """샘플러 상태 정보 반환"""
+        latest = self.latest
+        return {
+            'running': self.running,
+            'users': list(self.users),
+            'sample_rate': self.sample_rate,
+            'sample_count': self.sample_count,
+            'history_length': min(self.write_count, len(self.history)),
+            'use_fifo': self.use_fifo,
+            'block_count': self.block_count,
+            'error_count': self.error_count,
+            'latest_age': self.clock.now() - latest.timestamp if latest is not None else None,
+            'scheduler': self.scheduler.get_stats()
+        }
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+        if self._owns_sensor:
+            self.sensor.cleanup()
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_imu_sampler(clock=None, use_fifo=True, drain_rate=20):
+    """
+    프로세스 전역 IMU 샘플러 반환 (인자는 최초 생성 시에만 사용)
+    센서 필터 상태는 샘플러 스레드만 갱신하므로 여러 컨트롤러가 같은 자세를 공유
+    기본은 FIFO 묶음 수집 (액추에이터 출력으로 스레드가 밀려도 샘플 유실 없음), enable_fifo() 실패 시 폴링
+    """
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = IMUSampler(clock=clock if clock is not None else SYSTEM_CLOCK, use_fifo=use_fifo,
+                                  drain_rate=drain_rate)
+        return _sampler
+
+
+def _clear_imu_sampler(sampler):
+    """전역 샘플러 해제"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is sampler:
+            _sampler = None
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+# 관절 순서 (자세 벡터 인덱스 기준)
+LEG_NAMES = ('front_left', 'front_right', 'back_left', 'back_right')
+JOINT_TYPES = ('hip', 'knee', 'ankle')
+JOINT_NAMES = tuple(f"{leg}_{joint}" for leg in LEG_NAMES for joint in JOINT_TYPES)
+JOINT_COUNT = len(JOINT_NAMES)
+
+# 인덱스 맵 (문자열 파싱 없이 조회)
+JOINT_INDEX = {name: index for index, name in enumerate(JOINT_NAMES)}
+LEG_JOINT_INDEX = {
+    (leg, joint): JOINT_INDEX[f"{leg}_{joint}"]
+    for leg in LEG_NAMES for joint in JOINT_TYPES
+}
+JOINT_TYPE_OF = tuple(joint for _ in LEG_NAMES for joint in JOINT_TYPES)
+
+# 서브모터 각도 범위 (도)
+ANGLE_LIMITS = {
+    'hip': (-45, 45),      # 힙: 앞뒤 스윙 (시상면 피치)
+    'knee': (-30, 60),     # 무릎: 앞뒤 굽힘
+    'ankle': (-20, 20)     # 발목: 미세 조정
+}
+
+# 관절별 최소/최대 각도 배열 (미리 계산)
+ANGLE_MIN = np.array([ANGLE_LIMITS[joint][0] for joint in JOINT_TYPE_OF], dtype=np.float64)
+ANGLE_MAX = np.array([ANGLE_LIMITS[joint][1] for joint in JOINT_TYPE_OF], dtype=np.float64)
+
+# 각도당 서보 펄스 폭 (180도 = 2000us)
+PULSE_PER_DEGREE_US = 2000.0 / 180.0
+
+
+def new_pose(fill=0.0):
+    """12개 관절 자세 벡터 생성"""
+    return np.full(JOINT_COUNT, fill, dtype=np.float64)
+
+
+def new_mask(fill=False):
+    """12개 관절 선택 마스크 생성"""
+    return np.full(JOINT_COUNT, fill, dtype=bool)
+
+
+def pose_from_dict(targets, base=None):
+    """{관절 이름: 각도}를 (자세 벡터, 변경 마스크)로 변환 (알 수 없는 관절은 KeyError)"""
+    pose = new_pose() if base is None else np.array(base, dtype=np.float64)
+    mask = new_mask()
+    for joint_name, angle in targets.items():
+        index = JOINT_INDEX[joint_name]
+        pose[index] = angle
+        mask[index] = True
+    return pose, mask
+
+
+def pose_to_dict(pose, mask=None):
+    """자세 벡터를 {관절 이름: 각도}로 변환"""
+    if mask is None:
+        return {name: float(angle) for name, angle in zip(JOINT_NAMES, pose)}
+    return {JOINT_NAMES[index]: float(pose[index]) for index in np.flatnonzero(mask)}
+
+
+def clamp_pose(pose, out=None):
+    """관절별 각도 제한 일괄 적용"""
+    return np.clip(pose, ANGLE_MIN, ANGLE_MAX, out=out)
@@ -0,0 +1,234 @@
+import threading
+import numpy as np
+from joint_pose import JOINT_NAMES, JOINT_COUNT, JOINT_INDEX, JOINT_TYPE_OF, new_pose, new_mask, pose_from_dict
+from control_clock import SYSTEM_CLOCK
+
+
+# 관절 종류별 최대 각속도 (도/초)
+DEFAULT_VELOCITY_LIMITS = {
+    'hip': 120.0,
+    'knee': 120.0,
+    'ankle': 150.0
+}
+
+# 최소 저크 프로파일의 최대 속도 계수 (v_peak = 1.875 * 변위 / 시간)
+MIN_JERK_PEAK_FACTOR = 1.875
+
+
+class JointTrajectoryPlanner:
+    """
+    관절 궤적 계획기
+    관절별 5차(최소 저크) 프로파일을 관절 속도 제한 안에서 생성하고,
+    움직이는 도중 새 목표가 오면 현재 위치/속도/가속도에서 다시 계획
+    (모든 상태는 12개 관절 배열로 유지하여 틱마다 일괄 계산)
+    """
+    def __init__(self, initial_angles=None, control_rate=50, velocity_limits=None):
+        self.joint_names = JOINT_NAMES
+        self.joint_index = JOINT_INDEX
+        self.control_rate = control_rate
+        self.min_duration = 1.0 / control_rate
+
+        limits = dict(DEFAULT_VELOCITY_LIMITS)
+        if velocity_limits:
+            limits.update(velocity_limits)
+        self.velocity_limits = np.array([limits[joint] for joint in JOINT_TYPE_OF], dtype=np.float64)
+        self.velocity_scale = 1.0
+
+        initial = new_pose() if initial_angles is None else np.array(initial_angles, dtype=np.float64)
+
+        # 관절별 구간: 시작 시각, 지속 시간, 다항식 계수 (열 = a0..a5), 목표
+        self.start_times = np.zeros(JOINT_COUNT)
+        self.durations = np.zeros(JOINT_COUNT)
+        self.coefficients = np.zeros((JOINT_COUNT, 6))
+        self.coefficients[:, 0] = initial
+        self.targets = initial.copy()
+
+        # 슬루율 제한용 마지막 출력
+        self.last_output = initial.copy()
+        self.last_sample_time = None
+
+        # 틱 계산용 사전 할당 버퍼
+        self._output = new_pose()
+        self._changed = new_mask()
+
+    def _evaluate(self, now, index=slice(None)):
+        """관절 위치/속도/가속도 일괄 계산"""
+        c = self.coefficients[index]
+        durations = self.durations[index]
+        elapsed = now - self.start_times[index]
+        finished = elapsed >= durations
+        t = np.clip(elapsed, 0.0, durations)
+
+        a0, a1, a2, a3, a4, a5 = c.T
+        position = a0 + t * (a1 + t * (a2 + t * (a3 + t * (a4 + t * a5))))
+        velocity = a1 + t * (2 * a2 + t * (3 * a3 + t * (4 * a4 + t * 5 * a5)))
+        acceleration = 2 * a2 + t * (6 * a3 + t * (12 * a4 + t * 20 * a5))
+
+        position = np.where(finished, self.targets[index], position)
+        velocity = np.where(finished, 0.0, velocity)
+        acceleration = np.where(finished, 0.0, acceleration)
+        return position, velocity, acceleration
+
+    def set_targets(self, targets, now, speed_factor=1.0, max_velocity=None):
+        """새 목표 설정 (targets: {관절: 각도}, 진행 중인 관절은 현재 상태에서 재계획)"""
+        pose, mask = pose_from_dict(targets, self.targets)
+        self.set_target_pose(pose, mask, now, speed_factor, max_velocity)
+
+    def set_target_pose(self, pose, mask, now, speed_factor=1.0, max_velocity=None):
+        """새 목표 자세 벡터 설정 (mask된 관절만)"""
+        index = np.flatnonzero(mask)
+        if index.size == 0:
+            return
+
+        position, velocity, acceleration = self._evaluate(now, index)
+
+        v_max = self.velocity_limits[index]
+        if max_velocity is not None:
+            v_max = np.minimum(v_max, max_velocity)
+        v_max = v_max * (self.velocity_scale * max(speed_factor, 0.01))
+
+        target = np.asarray(pose, dtype=np.float64)[index]
+        delta = target - position
+        T = np.maximum(self.min_duration, MIN_JERK_PEAK_FACTOR * np.abs(delta) / v_max)
+
+        # 경계 조건: (위치, 속도, 가속도) → (목표, 0, 0)
+        T2 = T * T
+        self.coefficients[index, 0] = position
+        self.coefficients[index, 1] = velocity
+        self.coefficients[index, 2] = acceleration / 2
+        self.coefficients[index, 3] = (20 * delta - 12 * velocity * T - 3 * acceleration * T2) / (2 * T2 * T)
+        self.coefficients[index, 4] = (-30 * delta + 16 * velocity * T + 3 * acceleration * T2) / (2 * T2 * T2)
+        self.coefficients[index, 5] = (12 * delta - 6 * velocity * T - acceleration * T2) / (2 * T2 * T2 * T)
+        self.start_times[index] = now
+        self.durations[index] = T
+        self.targets[index] = target
+
+    def hold(self, pose, mask, now):
+        """mask된 관절을 해당 각도에 즉시 고정 (외부에서 직접 출력한 경우)"""
+        index = np.flatnonzero(mask)
+        angles = np.asarray(pose, dtype=np.float64)[index]
+        self.coefficients[index] = 0.0
+        self.coefficients[index, 0] = angles
+        self.start_times[index] = now
+        self.durations[index] = 0.0
+        self.targets[index] = angles
+        self.last_output[index] = angles
+
+    def is_active(self, now):
+        """진행 중인 궤적이 있는지 확인"""
+        if np.any(now - self.start_times < self.durations):
+            return True
+        return bool(np.any(self.last_output != self.targets))
+
+    def sample(self, now):
+        """현재 틱의 (설정값 벡터, 변경 마스크) 반환 (슬루율 제한 적용)"""
+        dt = self.min_duration if self.last_sample_time is None else max(now - self.last_sample_time, 0.0)
+        self.last_sample_time = now
+
+        position = self._evaluate(now)[0]
+        max_step = self.velocity_limits * (self.velocity_scale * dt)
+        np.clip(position, self.last_output - max_step, self.last_output + max_step, out=self._output)
+
+        np.not_equal(self._output, self.last_output, out=self._changed)
+        np.copyto(self.last_output, self._output)
+        return self._output, self._changed
+
+
+class JointTrajectoryEngine:
+    """
+    실시간 관절 궤적 실행기
+    별도 스레드에서 고정 제어 주기로 설정값을 출력 (호출자는 대기하지 않음)
+    """
+    def __init__(self, write_pose, initial_angles=None, control_rate=50, velocity_limits=None, clock=SYSTEM_CLOCK):
+        self.write_pose = write_pose
+        self.control_rate = control_rate
+        self.clock = clock
+        self.planner = JointTrajectoryPlanner(initial_angles, control_rate, velocity_limits)
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._settled = threading.Event()
+        self._settled.set()
+        self._thread = None
+        self.running = False
+        self.tick_count = 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self.running = True
+            self._thread = threading.Thread(target=self._run, name='joint-trajectory', daemon=True)
+            self._thread.start()
+
+    def set_targets(self, targets, speed_factor=1.0, max_velocity=None):
+        """새 관절 목표 설정 (즉시 반환)"""
+        with self._lock:
+            self.planner.set_targets(targets, self.clock.now(), speed_factor, max_velocity)
+            self._settled.clear()
+            self._wake.set()
+        self._ensure_thread()
+
+    def set_target_pose(self, pose, mask, speed_factor=1.0, max_velocity=None):
+        """새 목표 자세 벡터 설정 (즉시 반환)"""
+        with self._lock:
+            self.planner.set_target_pose(pose, mask, self.clock.now(), speed_factor, max_velocity)
+            self._settled.clear()
+            self._wake.set()
+        self._ensure_thread()
+
+    def hold(self, pose, mask):
+        """직접 출력된 관절 각도로 궤적 고정"""
+        with self._lock:
+            self.planner.hold(pose, mask, self.clock.now())
+
+    def get_target(self, joint_name):
+        """관절의 현재 계획 목표 반환"""
+        return float(self.planner.targets[JOINT_INDEX[joint_name]])
+
+    def set_velocity_scale(self, scale):
+        """전체 속도 배율 설정"""
+        with self._lock:
+            self.planner.velocity_scale = max(0.05, scale)
+
+    def wait_until_settled(self, timeout=None):
+        """모든 궤적이 끝날 때까지 대기"""
+        return self.clock.wait(self._settled, timeout)
+
+    def _run(self):
+        period = 1.0 / self.control_rate
+        next_tick = self.clock.now()
+
+        while self.running:
+            self._wake.wait()
+            if not self.running:
+                break
+
+            now = self.clock.now()
+            with self._lock:
+                if not self.planner.is_active(now):
+                    # 모든 관절 도달: 다음 목표까지 대기
+                    self._wake.clear()
+                    self._settled.set()
+                    self.planner.last_sample_time = None
+                    next_tick = now + period
+                    continue
+                setpoints, changed = self.planner.sample(now)
+
+            # 출력 버퍼는 이 스레드에서만 갱신되므로 잠금 밖에서 출력
+            if changed.any():
+                self.write_pose(setpoints, changed)
+            self.tick_count += 1
+
+            next_tick += period
+            delay = next_tick - self.clock.now()
+            if delay > 0:
+                self.clock.sleep(delay)
+            else:
+                next_tick = self.clock.now()
+
+    def stop(self):
+        """실행 스레드 정지"""
+        self.running = False
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._settled.set()
@@ -0,0 +1,86 @@
+class KeyframeTrack:
+    """
+    시간 기반 키프레임 트랙
+    각 키프레임은 (시작 시각, {관절: 각도})이며 같은 키프레임의 관절은 동시에 움직임
+    """
+    def __init__(self, keyframes=None, duration=0.0):
+        self.keyframes = list(keyframes) if keyframes else []
+        self.duration = duration
+
+    def add_keyframe(self, start_time, targets, hold_time=0.0):
+        """키프레임 추가 (hold_time: 다음 키프레임까지 최소 유지 시간)"""
+        self.keyframes.append((start_time, dict(targets)))
+        self.keyframes.sort(key=lambda keyframe: keyframe[0])
+        self.duration = max(self.duration, start_time + hold_time)
+
+    def __len__(self):
+        return len(self.keyframes)
+
+
+def compile_keyframe_track(sequence):
+    """
+    (모터 이름, 목표 각도, 지연) 단계 목록을 키프레임 트랙으로 변환
+    같은 관절이 다시 나오기 전까지의 연속 단계를 한 키프레임으로 묶고,
+    키프레임 유지 시간은 묶인 단계 지연의 최대값으로 설정
+    """
+    track = KeyframeTrack()
+    current_time = 0.0
+    group = {}
+    group_delay = 0.0
+
+    for motor_name, target_angle, delay in sequence:
+        if motor_name in group:
+            track.add_keyframe(current_time, group, group_delay)
+            current_time += group_delay
+            group = {}
+            group_delay = 0.0
+
+        group[motor_name] = target_angle
+        group_delay = max(group_delay, delay)
+
+    if group:
+        track.add_keyframe(current_time, group, group_delay)
+
+    return track
+
+
+class KeyframeExecutor:
+    """
+    키프레임 트랙 실행기
+    하나의 타임라인(절대 시각 기준)으로 키프레임을 재생, 비상 정지 시 즉시 중단
+    """
+    def __init__(self, actuator):
+        self.actuator = actuator
+        self.last_play_duration = 0.0
+
+    def play(self, track):
+        """트랙 재생 (완료 시 True, 출력 실패/비상 정지 시 False)"""
+        clock = self.actuator.clock
+        start = clock.now()
+
+        try:
+            for start_time, targets in track.keyframes:
+                if self._wait_until(start + start_time):
+                    print("비상 정지로 키프레임 재생이 취소되었습니다.")
+                    return False
+
+                if not self.actuator.write_frame(targets):
+                    print(f"키프레임 출력 실패: {', '.join(targets)}")
+                    return False
+
+            # 마지막 키프레임 유지 시간까지 대기
+            if self._wait_until(start + track.duration):
+                print("비상 정지로 키프레임 재생이 취소되었습니다.")
+                return False
+
+            return True
+
+        finally:
+            self.last_play_duration = clock.now() - start
+
+    def _wait_until(self, deadline):
+        """절대 시각까지 대기 (비상 정지 시 True)"""
+        remaining = deadline - self.actuator.clock.now()
+        if remaining > 0:
+            return self.actuator.wait(remaining)
+        return self.actuator.stop_requested
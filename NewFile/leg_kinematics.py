@@ -0,0 +1,173 @@
+"""
+4다리 일괄 순/역기구학 (다리당 2자유도 시상면 모델)
+힙(앞뒤 스윙)과 무릎은 시상면 피치 관절로 발 위치 [x 앞, z 위]를 정하고,
+발목은 발바닥 기울기만 조정하므로 발 위치 계산에 쓰지 않음 (역기구학은 주어진 발목 각도를 그대로 전달)
+좌우(측면) 발 위치와 힙 외전은 모델에 없음
+"""
+import numpy as np
+from joint_pose import (
+    LEG_NAMES, LEG_JOINT_INDEX, JOINT_COUNT, ANGLE_LIMITS, ANGLE_MIN, ANGLE_MAX, new_pose
+)
+
+
+# 다리 기구 치수 (cm)
+FEMUR_LENGTH = 11.0     # 힙 → 무릎
+TIBIA_LENGTH = 11.0     # 무릎 → 발 (발목)
+TRACK_WIDTH = 12.0      # 좌우 힙 간격 (cm)
+
+# 관절 0도일 때의 기준 자세 (도)
+FEMUR_REST = 30.0       # 대퇴부가 수직 아래에서 앞으로 기운 각도
+KNEE_REST = 60.0        # 무릎 굽힘 각도 (중립 자세에서 발이 힙 바로 아래)
+
+# 다리별 관절 인덱스 (LEG_NAMES 순서)
+HIP_INDEX = np.array([LEG_JOINT_INDEX[(leg, 'hip')] for leg in LEG_NAMES])
+KNEE_INDEX = np.array([LEG_JOINT_INDEX[(leg, 'knee')] for leg in LEG_NAMES])
+ANKLE_INDEX = np.array([LEG_JOINT_INDEX[(leg, 'ankle')] for leg in LEG_NAMES])
+
+_HIP_LIMITS = np.radians(ANGLE_LIMITS['hip'])
+_KNEE_LIMITS = np.radians(ANGLE_LIMITS['knee'])
+_FEMUR_REST = np.radians(FEMUR_REST)
+_KNEE_REST = np.radians(KNEE_REST)
+
+
+def forward_kinematics(pose):
+    """
+    관절 자세 → 발 위치 (4개 다리 일괄)
+    pose: (..., 12) 관절 각도 (도), 반환: (..., 4, 2) 힙 기준 발 위치 [x 앞, z 위] (cm)
+    힙/무릎은 시상면 피치 관절, 발목은 발바닥 기울기만 조정 (발 위치에는 영향 없음)
+    """
+    pose = np.radians(np.asarray(pose, dtype=np.float64))
+    femur = pose[..., HIP_INDEX] + _FEMUR_REST
+    tibia = femur - (pose[..., KNEE_INDEX] + _KNEE_REST)
+
+    feet = np.empty(pose.shape[:-1] + (len(LEG_NAMES), 2))
+    feet[..., 0] = FEMUR_LENGTH * np.sin(femur) + TIBIA_LENGTH * np.sin(tibia)
+    feet[..., 1] = -FEMUR_LENGTH * np.cos(femur) - TIBIA_LENGTH * np.cos(tibia)
+    return feet
+
+
+def inverse_kinematics(feet, ankle=None):
+    """
+    발 위치 → 관절 자세 (4개 다리 일괄)
+    feet: (..., 4, 2) 힙 기준 발 위치 [x, z] (cm), ankle: (..., 4) 발목 각도 (도, 없으면 0)
+    반환: (자세 (..., 12), 도달 가능 여부 (..., 4)) - 도달 불가/관절 제한 초과 시 가장 가까운 자세로 제한
+    """
+    feet = np.asarray(feet, dtype=np.float64)
+    x = feet[..., 0]
+    z = feet[..., 1]
+    distance_sq = x * x + z * z
+    distance = np.sqrt(distance_sq)
+
+    # 무릎 내각 (코사인 법칙)
+    cos_inner = (FEMUR_LENGTH ** 2 + TIBIA_LENGTH ** 2 - distance_sq) / (2 * FEMUR_LENGTH * TIBIA_LENGTH)
+    in_range = np.abs(cos_inner) <= 1.0
+    knee_bend = np.pi - np.arccos(np.clip(cos_inner, -1.0, 1.0))
+
+    # 대퇴부 각도 = 발 방향 + 대퇴부와 발 방향 사이 각
+    safe_distance = np.maximum(distance, 1e-9)
+    cos_femur = (FEMUR_LENGTH ** 2 + distance_sq - TIBIA_LENGTH ** 2) / (2 * FEMUR_LENGTH * safe_distance)
+    femur = np.arctan2(x, -z) + np.arccos(np.clip(cos_femur, -1.0, 1.0))
+
+    hip = femur - _FEMUR_REST
+    knee = knee_bend - _KNEE_REST
+    reachable = (
+        in_range
+        & (hip >= _HIP_LIMITS[0] - 1e-9) & (hip <= _HIP_LIMITS[1] + 1e-9)
+        & (knee >= _KNEE_LIMITS[0] - 1e-9) & (knee <= _KNEE_LIMITS[1] + 1e-9)
+    )
+
+    pose = np.zeros(feet.shape[:-2] + (JOINT_COUNT,))
+    pose[..., HIP_INDEX] = np.degrees(hip)
+    pose[..., KNEE_INDEX] = np.degrees(knee)
+    if ankle is not None:
+        pose[..., ANKLE_INDEX] = ankle
+    np.clip(pose, ANGLE_MIN, ANGLE_MAX, out=pose)
+    return pose, reachable
+
+
+# 중립 자세의 발 위치 (4, 2)
+NEUTRAL_FEET = forward_kinematics(new_pose())
+
+
+class CachedLegIK:
+    """
+    양자화 격자 캐시 역기구학
+    보행 중 반복되는 발 목표를 resolution(cm) 격자로 양자화하여 다리별 해를 재사용,
+    캐시에 없는 목표만 모아 한 번에 계산
+    """
+    def __init__(self, resolution=0.05, max_entries=50000):
+        self.resolution = resolution
+        self.max_entries = max_entries
+        self.cache = {}             # (다리, x 격자, z 격자) → (힙, 무릎, 도달 가능)
+        self.hits = 0
+        self.misses = 0
+
+    def solve(self, feet, ankle=None):
+        """발 위치 → (자세, 도달 가능 여부), feet: (..., 4, 2)"""
+        feet = np.asarray(feet, dtype=np.float64)
+        batch_shape = feet.shape[:-2]
+        flat_feet = feet.reshape(-1, len(LEG_NAMES), 2)
+        sample_count = flat_feet.shape[0]
+
+        # (다리, x 격자, z 격자) 키를 만들고 중복 목표는 한 번만 조회
+        grid = np.rint(flat_feet / self.resolution).astype(np.int64)
+        legs = np.broadcast_to(np.arange(len(LEG_NAMES)), (sample_count, len(LEG_NAMES)))
+        keys = np.stack([legs, grid[..., 0], grid[..., 1]], axis=-1).reshape(-1, 3)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        unique_solutions = np.empty((len(unique_keys), 3))     # (힙, 무릎, 도달 가능)
+        missing = []
+        for i, key in enumerate(map(tuple, unique_keys.tolist())):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                unique_solutions[i] = cached
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            # 격자 중심점으로 일괄 계산 (같은 키는 같은 해)
+            points = unique_keys[missing, 1:] * self.resolution
+            hip, knee, reachable = _solve_legs(points)
+            unique_solutions[missing, 0] = hip
+            unique_solutions[missing, 1] = knee
+            unique_solutions[missing, 2] = reachable
+
+            if len(self.cache) + len(missing) > self.max_entries:
+                self.cache.clear()
+            for i in missing:
+                self.cache[tuple(unique_keys[i].tolist())] = tuple(unique_solutions[i].tolist())
+
+        solutions = unique_solutions[inverse.reshape(-1)].reshape(sample_count, len(LEG_NAMES), 3)
+
+        pose = np.zeros((flat_feet.shape[0], JOINT_COUNT))
+        pose[:, HIP_INDEX] = solutions[..., 0]
+        pose[:, KNEE_INDEX] = solutions[..., 1]
+        if ankle is not None:
+            pose[:, ANKLE_INDEX] = np.reshape(ankle, (-1, len(LEG_NAMES)))
+        np.clip(pose, ANGLE_MIN, ANGLE_MAX, out=pose)
+        reachable = solutions[..., 2].astype(bool)
+        return pose.reshape(batch_shape + (JOINT_COUNT,)), reachable.reshape(batch_shape + (len(LEG_NAMES),))
+
+    def get_stats(self):
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _solve_legs(points):
+    """다리별 점 목록 (N, 2) → (힙, 무릎, 도달 가능) 배열 (다리 종류와 무관한 같은 기구)"""
+    pose, reachable = inverse_kinematics(points[:, None, :].repeat(len(LEG_NAMES), axis=1))
+    return pose[:, HIP_INDEX[0]], pose[:, KNEE_INDEX[0]], reachable[:, 0]
+
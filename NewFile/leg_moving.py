@@ -1,13 +1,21 @@
+import math
+from actuator_manager import get_actuator_manager
+from joint_pose import LEG_JOINT_INDEX, new_pose, new_mask
+from gait_generator import get_gait_table
+from periodic_scheduler import PeriodicScheduler
+from contact_gait import ContactGaitClock
+from gait_planner import GaitTransitionPlanner
+
 class LegMoving:
     """
     다리 움직임을 제어하는 클래스 (어깨→팔꿈치→내리기 순서)
     서브모터를 사용한 정밀한 다리 제어
     """
-    def __init__(self):
+    def __init__(self, actuator=None):
         # 다리 모터 핀 설정
         self.leg_motor_pins = {
             'front_left': {
-                'hip': 17,      # 힙 회전 (좌우)
+                'hip': 17,      # 힙 회전 (앞뒤 스윙)
                 'knee': 18,     # 무릎 굽힘 (앞뒤)
                 'ankle': 27     # 발목 미세 조정
             },
@@ -33,47 +41,43 @@ class LegMoving:
         self.step_height = 15.0         # 보행 시 다리 들어올리는 높이 (도)
         self.step_length = 20.0         # 보행 시 한 걸음 길이 (도)
         self.leg_clearance = 5.0        # 지면과의 여유 거리 (도)
-        
-        # 현재 다리 위치 상태
-        self.leg_positions = {}
-        for leg_name in self.leg_motor_pins:
-            self.leg_positions[leg_name] = {
-                'hip': 0.0,     # 힙 각도
-                'knee': 0.0,    # 무릎 각도
-                'ankle': 0.0    # 발목 각도
-            }
+        self.gait = 'crawl'             # 보행 종류 (crawl, trot, pace, bound)
+        self.cycle_time = 0.8           # 보행 한 주기 시간 (초, 속도 1.0 기준)
         
         # 보행 시퀀스 상태
-        self.walking_phase = 0          # 보행 단계 (0-3)
+        self.walking_phase = 0.0        # 보행 주기 위상 (0~1)
         self.leg_cycle = 0              # 다리 사이클
         self.is_walking = False         # 보행 중인지 여부
         
-        # GPIO 초기화
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setwarnings(False)
-            
-            # 모든 모터 핀을 출력으로 설정
-            for leg_motors in self.leg_motor_pins.values():
-                for pin in leg_motors.values():
-                    GPIO.setup(pin, GPIO.OUT)
-            
-            # PWM 객체 생성
-            self.pwm_objects = {}
-            for leg_name, leg_motors in self.leg_motor_pins.items():
-                self.pwm_objects[leg_name] = {}
-                for joint_name, pin in leg_motors.items():
-                    self.pwm_objects[leg_name][joint_name] = GPIO.PWM(pin, 50)  # 50Hz
-                    self.pwm_objects[leg_name][joint_name].start(0)
-            
-            print("다리 모터 GPIO 초기화 완료")
-        except ImportError:
-            print("RPi.GPIO 모듈을 찾을 수 없습니다. 시뮬레이션 모드로 실행됩니다.")
-            self.simulation_mode = True
-        except Exception as e:
-            print(f"GPIO 초기화 오류: {e}")
+        # 공유 액추에이터 핸들 (PWM 채널과 관절 상태는 관리자가 소유)
+        self.actuator = actuator if actuator is not None else get_actuator_manager().acquire('leg')
+        if self.actuator.simulation_mode:
             self.simulation_mode = True
+        
+        # 보행 제어 틱 스케줄러 (마감 시각 기반 주기)
+        self.scheduler = PeriodicScheduler(self.actuator.control_rate, self.actuator.clock, name='leg_gait')
+        
+        # 발 접촉 기반 위상 진행 (FSR 센서 연결 시)
+        self.contact_clock = None
+        
+        # 보행 전환 계획 (현재 보행 테이블/위상에서 다음 보행 또는 서기 자세로 혼합)
+        self.planner = GaitTransitionPlanner()
+        self.current_table = None       # 마지막으로 재생한 보행 테이블 (서 있으면 None)
+        self.current_phase = 0.0        # 마지막으로 출력한 누적 위상
+        self.current_cycle_time = self.cycle_time
+
+    @property
+    def leg_positions(self):
+        """현재 다리 위치 상태 (공유 관절 상태에서 조회)"""
+        pose = self.actuator.get_pose()
+        return {
+            leg_name: {
+                'hip': float(pose[LEG_JOINT_INDEX[(leg_name, 'hip')]]),       # 힙 각도
+                'knee': float(pose[LEG_JOINT_INDEX[(leg_name, 'knee')]]),     # 무릎 각도
+                'ankle': float(pose[LEG_JOINT_INDEX[(leg_name, 'ankle')]])    # 발목 각도
+            }
+            for leg_name in self.leg_motor_pins
+        }
 
     def move_shoulder(self, leg_name, target_angle, speed_factor=1.0):
         """어깨(힙) 움직임"""
@@ -84,8 +88,8 @@ class LegMoving:
         # 각도 제한 (-45도 ~ 45도)
         target_angle = max(-45.0, min(45.0, target_angle))
         
-        # 현재 각도와 목표 각도 비교
-        current_angle = self.leg_positions[leg_name]['hip']
+        # 계획된 목표 각도와 비교
+        current_angle = self.actuator.get_target(f"{leg_name}_hip")
         if abs(target_angle - current_angle) < 0.5:
             return True  # 이미 목표 각도에 도달
         
@@ -93,7 +97,6 @@ class LegMoving:
         success = self._move_joint(leg_name, 'hip', target_angle, speed_factor)
         
         if success:
-            self.leg_positions[leg_name]['hip'] = target_angle
             print(f"{leg_name} 힙 각도: {current_angle:.1f}° → {target_angle:.1f}°")
         
         return success
@@ -107,8 +110,8 @@ class LegMoving:
         # 각도 제한 (-30도 ~ 60도)
         target_angle = max(-30.0, min(60.0, target_angle))
         
-        # 현재 각도와 목표 각도 비교
-        current_angle = self.leg_positions[leg_name]['knee']
+        # 계획된 목표 각도와 비교
+        current_angle = self.actuator.get_target(f"{leg_name}_knee")
         if abs(target_angle - current_angle) < 0.5:
             return True  # 이미 목표 각도에 도달
         
@@ -116,7 +119,6 @@ class LegMoving:
         success = self._move_joint(leg_name, 'knee', target_angle, speed_factor)
         
         if success:
-            self.leg_positions[leg_name]['knee'] = target_angle
             print(f"{leg_name} 무릎 각도: {current_angle:.1f}° → {target_angle:.1f}°")
         
         return success
@@ -130,8 +132,8 @@ class LegMoving:
         # 높이 제한 (-20도 ~ 20도)
         target_height = max(-20.0, min(20.0, target_height))
         
-        # 현재 높이와 목표 높이 비교
-        current_height = self.leg_positions[leg_name]['ankle']
+        # 계획된 목표 높이와 비교
+        current_height = self.actuator.get_target(f"{leg_name}_ankle")
         if abs(target_height - current_height) < 0.5:
             return True  # 이미 목표 높이에 도달
         
@@ -139,48 +141,49 @@ class LegMoving:
         success = self._move_joint(leg_name, 'ankle', target_height, speed_factor)
         
         if success:
-            self.leg_positions[leg_name]['ankle'] = target_height
             print(f"{leg_name} 발목 높이: {current_height:.1f}° → {target_height:.1f}°")
         
         return success
 
     def _move_joint(self, leg_name, joint_name, target_angle, speed_factor=1.0):
         """관절 움직임 실행"""
+        return self._move_joints({leg_name: {joint_name: target_angle}}, speed_factor)
+
+    def _move_joints(self, leg_targets, speed_factor=1.0):
+        """여러 관절을 부드러운 궤적으로 동시에 이동 (leg_targets: {다리: {관절: 각도}})"""
+        pose = new_pose()
+        mask = new_mask()
+        for leg_name, joints in leg_targets.items():
+            for joint_name, target_angle in joints.items():
+                index = LEG_JOINT_INDEX[(leg_name, joint_name)]
+                pose[index] = target_angle
+                mask[index] = True
+        
+        # movement_speed(도/프레임)를 관절 속도 제한으로 사용, 호출은 대기 없이 반환
+        max_velocity = self.movement_speed * self.actuator.control_rate
         try:
-            if not hasattr(self, 'simulation_mode'):
-                # 실제 하드웨어 제어
-                pwm_obj = self.pwm_objects[leg_name][joint_name]
-                
-                # PWM 신호 생성 (서브모터 제어)
-                duty_cycle = 2.5 + (target_angle / 180.0) * 10.0
-                pwm_obj.ChangeDutyCycle(duty_cycle)
-                
-                # 모터 안정화 시간
-                time.sleep(0.1)
-                pwm_obj.ChangeDutyCycle(0)  # 신호 정지
-                
-            else:
-                # 시뮬레이션 모드
-                print(f"시뮬레이션: {leg_name} {joint_name}를 {target_angle}도로 이동")
-                time.sleep(0.1)
-            
-            return True
-            
+            return self.actuator.move_pose(pose, mask, speed_factor, max_velocity)
         except Exception as e:
-            print(f"관절 {leg_name} {joint_name} 움직임 오류: {e}")
+            print(f"관절 {', '.join(leg_targets)} 움직임 오류: {e}")
             return False
 
-    def start_walking(self, direction='forward', speed=1.0):
-        """보행 시작"""
+    def start_walking(self, direction='forward', speed=1.0, gait=None):
+        """보행 시작 (한 보행 주기 실행), 보행 중이면 중립 복귀 없이 현재 위상에서 새 방향/보행으로 전환"""
+        if gait is not None:
+            self.gait = gait
+        
         if self.is_walking:
-            print("이미 보행 중입니다.")
-            return False
+            if self.current_table is None:
+                print("이미 보행 중입니다.")
+                return False
+            print(f"보행 전환: {direction}, 속도: {speed}, 보행: {self.gait}")
+            return self._switch_walking(direction, speed)
         
         self.is_walking = True
-        self.walking_phase = 0
+        self.walking_phase = 0.0
         self.leg_cycle = 0
         
-        print(f"보행 시작: {direction}, 속도: {speed}")
+        print(f"보행 시작: {direction}, 속도: {speed}, 보행: {self.gait}")
         
         # 보행 시퀀스 실행
         return self._execute_walking_sequence(direction, speed)
@@ -188,75 +191,137 @@ class LegMoving:
     def _execute_walking_sequence(self, direction, speed):
         """보행 시퀀스 실행"""
         try:
-            # 4단계 보행 패턴
-            walking_pattern = self._get_walking_pattern(direction)
-            
-            for phase in walking_pattern:
-                if not self.is_walking:
-                    break
-                
-                # 각 단계별 다리 움직임
-                for leg_name, movements in phase.items():
-                    for joint_name, target_angle in movements.items():
-                        if joint_name == 'hip':
-                            self.move_shoulder(leg_name, target_angle, speed)
-                        elif joint_name == 'knee':
-                            self.move_elbow(leg_name, target_angle, speed)
-                        elif joint_name == 'ankle':
-                            self.drop_leg(leg_name, target_angle, speed)
-                
-                # 단계 간 지연
-                time.sleep(0.2 / speed)
-                self.walking_phase = (self.walking_phase + 1) % 4
-            
-            return True
+            gait_table = self.get_gait_table(direction)
+            return self.play_gait(gait_table, 0.0, 1.0, self.cycle_time / speed)
             
         except Exception as e:
             print(f"보행 시퀀스 실행 오류: {e}")
             return False
 
-    def _get_walking_pattern(self, direction):
-        """보행 패턴 생성"""
-        if direction == 'forward':
-            # 전진 보행 패턴
-            return [
-                # 1단계: 앞왼쪽 다리 들어올리기
-                {
-                    'front_left': {'knee': self.step_height, 'ankle': 0},
-                    'front_right': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_left': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_right': {'hip': 0, 'knee': 0, 'ankle': 0}
-                },
-                # 2단계: 앞왼쪽 다리 앞으로 이동
-                {
-                    'front_left': {'hip': self.step_length, 'knee': 0, 'ankle': 0},
-                    'front_right': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_left': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_right': {'hip': 0, 'knee': 0, 'ankle': 0}
-                },
-                # 3단계: 앞왼쪽 다리 내리기
-                {
-                    'front_left': {'knee': 0, 'ankle': 0},
-                    'front_right': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_left': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_right': {'hip': 0, 'knee': 0, 'ankle': 0}
-                },
-                # 4단계: 다음 다리 준비
-                {
-                    'front_left': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'front_right': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_left': {'hip': 0, 'knee': 0, 'ankle': 0},
-                    'back_right': {'hip': 0, 'knee': 0, 'ankle': 0}
-                }
-            ]
-        else:
-            # 후진 보행 패턴 (방향만 반대)
-            pattern = self._get_walking_pattern('forward')
-            for phase in pattern:
-                for leg_movements in phase.values():
-                    if 'hip' in leg_movements:
-                        leg_movements['hip'] = -leg_movements['hip']
-            return pattern
+    def _switch_walking(self, direction, speed):
+        """현재 보행에서 새 보행 테이블로 혼합 전환한 뒤 다음 주기 경계까지 재생"""
+        try:
+            gait_table = self.get_gait_table(direction)
+            cycle_time = self.cycle_time / speed
+            phase = self.transition_to(gait_table, cycle_time)
+            if phase is None:
+                return False
+            return self.play_gait(gait_table, phase, math.floor(phase) + 1.0, cycle_time)
+            
+        except Exception as e:
+            print(f"보행 전환 오류: {e}")
+            return False
+
+    def transition_to(self, gait_table=None, cycle_time=None):
+        """
+        현재 보행 위상에서 gait_table (None이면 서기 자세)로 혼합 전환 (한 보행 주기 이내)
+        전환 구간의 발 목표를 미리 계산해 두고 제어 틱마다 한 프레임씩 출력, 이어서 재생할 위상 반환 (비상 정지 시 None)
+        """
+        if cycle_time is None:
+            cycle_time = self.current_cycle_time
+        source = self.current_table
+        phase = self.current_phase if source is not None else 0.0
+        
+        poses, phases = self.planner.plan(source, gait_table, phase, cycle_time, self.actuator.control_rate,
+                                          current_pose=self.actuator.get_pose())
+        
+        scheduler = self.scheduler
+        scheduler.start()
+        for pose, pose_phase in zip(poses, phases):
+            if not self.actuator.write_pose(pose):
+                self.current_table = None
+                return None
+            self.walking_phase = pose_phase % 1.0
+            if scheduler.wait_next(self.actuator.wait):
+                self.current_table = None
+                return None
+        
+        end_phase = float(phases[-1])
+        self.current_table = gait_table
+        self.current_phase = end_phase
+        self.current_cycle_time = cycle_time
+        return end_phase
+
+    def get_gait_table(self, direction='forward'):
+        """현재 보행 파라미터의 보행 테이블 (캐시됨, 'left'/'right'는 제자리 회전)"""
+        if direction in ('left', 'right'):
+            turn = self.step_length / 2.0 if direction == 'left' else -self.step_length / 2.0
+            return get_gait_table(self.gait, 0.0, self.step_height, turn=turn)
+        step_length = self.step_length if direction == 'forward' else -self.step_length
+        return get_gait_table(self.gait, step_length, self.step_height)
+
+    def play_gait(self, gait_table, start_phase, end_phase, cycle_time, pose_filter=None, scheduler=None):
+        """
+        보행 테이블의 위상 구간 재생
+        시작 자세까지 궤적으로 이동한 뒤 제어 틱마다 테이블 행을 한 프레임으로 출력
+        (이전 구간에 이어 이미 시작 자세면 출력 데드밴드 이내이므로 이동/정착 대기 생략)
+        pose_filter: 틱마다 (테이블 행, 위상)을 받아 출력할 자세를 반환하는 함수 (자세 보정 중첩용),
+        None을 반환하면 구간을 그 자리에서 끝냄
+        scheduler: 제어 틱 스케줄러 (없으면 다리 컨트롤러 기본 스케줄러)
+        접촉 센서가 연결되어 있으면 위상은 타이머 대신 착지/이륙 상태에 맞춰 진행
+        """
+        # 시작 자세로 부드럽게 이동
+        start_pose = gait_table.pose_at(start_phase)
+        if abs(self.actuator.get_pose() - start_pose).max() > self.actuator.write_deadband:
+            if not self.actuator.move_pose(start_pose, speed_factor=1.0,
+                                           max_velocity=self.movement_speed * self.actuator.control_rate):
+                return False
+            self.actuator.wait_until_settled(cycle_time)
+        elif self.actuator.stop_requested:
+            return False
+        
+        clock = self.actuator.clock
+        if scheduler is None:
+            scheduler = self.scheduler
+        contact_clock = self.contact_clock
+        start = clock.now()
+        scheduler.start()
+        if contact_clock is not None:
+            contact_clock.reset(start_phase, start)
+        
+        while self.is_walking:
+            if contact_clock is not None:
+                phase = contact_clock.advance(gait_table, clock.now(), cycle_time)
+            else:
+                phase = start_phase + (clock.now() - start) / cycle_time
+            if phase >= end_phase:
+                phase = end_phase
+            
+            # 테이블 행 인덱싱만으로 한 프레임 출력
+            row = gait_table.pose_at(phase)
+            if pose_filter is not None:
+                row = pose_filter(row, phase)
+                if row is None:
+                    return True
+            if not self.actuator.write_pose(row):
+                break
+            self.walking_phase = phase % 1.0
+            self.leg_cycle = int(phase)
+            self.current_table = gait_table
+            self.current_phase = phase
+            self.current_cycle_time = cycle_time
+            
+            if phase >= end_phase:
+                return True
+            
+            # 다음 틱까지 대기 (비상 정지 시 즉시 중단)
+            if scheduler.wait_next(self.actuator.wait):
+                break
+        
+        if self.actuator.stop_requested:
+            self.is_walking = False
+            self.current_table = None
+            print("비상 정지로 보행이 취소되었습니다.")
+            return False
+        return not self.is_walking
+
+    def set_contact_sensor(self, contact_sensor):
+        """발 접촉 센서 연결 (FSRContactSensor, None이면 타이머 위상 진행으로 복귀)"""
+        if contact_sensor is None:
+            self.contact_clock = None
+            return
+        contact_sensor.start()
+        self.contact_clock = ContactGaitClock(contact_sensor)
 
     def stop_walking(self):
         """보행 정지"""
@@ -267,46 +332,30 @@ class LegMoving:
         self.is_walking = False
         print("보행 정지")
         
-        # 모든 다리를 중립 위치로
-        return self._return_to_neutral_position()
-
-    def _return_to_neutral_position(self):
-        """중립 위치로 복귀"""
-        try:
-            for leg_name in self.leg_motor_pins:
-                self.move_shoulder(leg_name, 0.0)
-                self.move_elbow(leg_name, 0.0)
-                self.drop_leg(leg_name, 0.0)
-            
-            return True
-            
-        except Exception as e:
-            print(f"중립 위치 복귀 오류: {e}")
+        # 현재 보행 위상에서 서기 자세로 혼합 (한 주기 이내, 관절별 순차 복귀 없음)
+        if self.current_table is not None:
+            return self.transition_to(None) is not None
+        
+        # 보행 테이블 없이 움직였으면 12관절을 한 궤적으로 중립 자세에 복귀
+        if not self.actuator.move_pose(new_pose(), max_velocity=self.movement_speed * self.actuator.control_rate):
             return False
+        self.actuator.wait_until_settled(2.0)
+        return True
 
     def get_leg_status(self):
         """다리 상태 정보 반환"""
         return {
-            'leg_positions': self.leg_positions.copy(),
+            'leg_positions': self.leg_positions,
             'is_walking': self.is_walking,
             'walking_phase': self.walking_phase,
-            'leg_cycle': self.leg_cycle
+            'leg_cycle': self.leg_cycle,
+            'contact_gait': self.contact_clock.get_stats() if self.contact_clock is not None else None
         }
 
     def cleanup(self):
         """리소스 정리"""
-        if hasattr(self, 'pwm_objects'):
-            for leg_pwms in self.pwm_objects.values():
-                for pwm in leg_pwms.values():
-                    try:
-                        pwm.stop()
-                    except:
-                        pass
-        
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.cleanup()
-        except:
-            pass
+        if self.contact_clock is not None:
+            self.contact_clock.contact_sensor.stop()
+        self.actuator.release()
         
-        print("다리 모터 리소스 정리 완료") 
+        print("다리 모터 리소스 정리 완료")
\ No newline at end of file
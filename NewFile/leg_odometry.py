@@ -0,0 +1,86 @@
+import math
+from collections import namedtuple
+import numpy as np
+from joint_pose import LEG_NAMES
+from leg_kinematics import TRACK_WIDTH, forward_kinematics
+
+
+# 추정 몸체 위치 (시작점 기준 x 전방/y 좌측 cm, 방향 도, 누적 이동 거리 cm)
+OdometryPose = namedtuple('OdometryPose', ['x', 'y', 'heading', 'distance'])
+
+# 다리별 좌우 구분
+_LEFT_LEGS = np.array([leg.endswith('left') for leg in LEG_NAMES])
+
+
+class LegOdometry:
+    """
+    다리 주행 거리계
+    제어 틱마다 출력 자세의 순기구학 발 위치를 이전 틱과 비교하여,
+    두 틱 모두 지지 중인 다리의 발 변위(발이 뒤로 간 만큼 몸체가 앞으로 감)를 적분
+    방향은 좌우 지지 다리 변위 차이로 추정하고, IMU yaw가 주어지면 상보 혼합
+    """
+    def __init__(self, yaw_weight=0.98, track_width=TRACK_WIDTH):
+        self.yaw_weight = yaw_weight        # IMU yaw 신뢰도 (0이면 기구학만 사용)
+        self.track_width = track_width
+        self.reset()
+
+    def reset(self):
+        """시작점으로 초기화"""
+        self.pose = OdometryPose(0.0, 0.0, 0.0, 0.0)
+        self.update_count = 0
+        self._previous_feet = None
+        self._previous_contacts = None
+
+    def update(self, joint_pose, contacts, yaw=None):
+        """
+        한 틱 갱신 후 추정 위치 반환
+        joint_pose: 출력한 관절 자세 (12), contacts: 다리별 지지 여부 (4), yaw: 시작 기준 IMU 방향 (도)
+        """
+        feet_x = forward_kinematics(joint_pose)[:, 0]
+        contacts = np.asarray(contacts, dtype=bool)
+        previous_x = self._previous_feet
+        previous_contacts = self._previous_contacts
+        self._previous_feet = feet_x
+        self._previous_contacts = contacts
+        self.update_count += 1
+
+        x, y, heading, distance = self.pose
+        if previous_x is None:
+            return self.pose
+
+        stance = contacts & previous_contacts
+        if stance.any():
+            displacement = previous_x - feet_x     # 지지 발이 뒤로 간 거리 = 몸체 전진 거리
+            forward = float(displacement[stance].mean())
+
+            # 좌우 지지 다리 변위 차이 → 회전 (오른쪽이 더 밀면 좌회전)
+            left = stance & _LEFT_LEGS
+            right = stance & ~_LEFT_LEGS
+            if left.any() and right.any():
+                turn = (displacement[right].mean() - displacement[left].mean()) / self.track_width
+                heading += math.degrees(turn)
+
+            # 갱신된 방향으로 위치 적분
+            heading_rad = math.radians(heading)
+            x += forward * math.cos(heading_rad)
+            y += forward * math.sin(heading_rad)
+            distance += abs(forward)
+
+        if yaw is not None:
+            heading = self.yaw_weight * yaw + (1.0 - self.yaw_weight) * heading
+
+        # 튜플 교체로 게시 (다른 스레드는 get_pose()로 잠금 없이 읽음)
+        self.pose = OdometryPose(x, y, heading, distance)
+        return self.pose
+
+    def get_pose(self):
+        """현재 추정 위치 (x, y, heading, distance)"""
+        return self.pose
+
+    def get_status(self):
+        """주행 거리계 상태 정보 반환"""
+        return {
+            'pose': self.pose._asdict(),
+            'update_count': self.update_count,
+            'yaw_weight': self.yaw_weight
+        }
@@ -0,0 +1,194 @@
+import argparse
+import threading
+import numpy as np
+from joint_pose import JOINT_NAMES, JOINT_COUNT, PULSE_PER_DEGREE_US
+from control_clock import VirtualClock
+from servo_calibration import PULSE_CENTER_US
+
+
+# 서보 응답 모델 기본값 (일반 표준 서보: 0.12초/60도, 제어 신호 한 주기 지연, 4us 데드밴드)
+DEFAULT_SERVO_RATE = 500.0        # 최대 회전 속도 (도/초)
+DEFAULT_SERVO_LATENCY = 0.02      # 명령 → 응답 시작 지연 (초)
+DEFAULT_SERVO_DEADBAND_US = 4.0   # 서보 내부 데드밴드 (us)
+
+
+class MockServoBackend:
+    """
+    타이밍 모델 서보 백엔드 (로봇 없이 컨트롤러 벤치마크용)
+    가상 시계에서 서보 응답(지연, 회전 속도 제한, 데드밴드)을 모델링하고
+    모든 명령을 시각과 함께 기록
+    """
+    def __init__(self, clock=None, rate_limit=DEFAULT_SERVO_RATE, latency=DEFAULT_SERVO_LATENCY,
+                 deadband_us=DEFAULT_SERVO_DEADBAND_US, record=True):
+        self.clock = clock if clock is not None else VirtualClock()
+        self.rate_limit = rate_limit
+        self.rate_us = rate_limit * PULSE_PER_DEGREE_US
+        self.latency = latency
+        self.deadband_us = deadband_us
+        self.record = record
+
+        # 모델 상태 (채널별 펄스 폭, us)
+        self.positions = np.full(JOINT_COUNT, PULSE_CENTER_US, dtype=np.float64)
+        self.targets = self.positions.copy()
+        self.model_time = self.clock.now()
+        self.pending = []           # (도착 시각, 마스크, 펄스, 명령 시각)
+
+        # 명령 기록: (시각, 채널 인덱스 배열, 펄스 배열)
+        self.commands = []
+        self.response_times = []    # 명령별 응답 완료까지 걸린 시간 (초)
+        self.channel_writes = 0
+        self.stopped = False
+        self._lock = threading.Lock()
+
+    def _move(self, until):
+        """모델 시각을 until까지 진행 (회전 속도 제한으로 목표 추종)"""
+        dt = until - self.model_time
+        if dt <= 0:
+            return
+        step = self.rate_us * dt
+        self.positions += np.clip(self.targets - self.positions, -step, step)
+        self.model_time = until
+
+    def _advance(self, now):
+        """도착한 명령을 순서대로 적용하며 모델을 now까지 진행"""
+        while self.pending and self.pending[0][0] <= now:
+            arrival, mask, pulses, issued_at = self.pending.pop(0)
+            self._move(arrival)
+
+            # 서보 데드밴드 이내의 목표 변경은 무시
+            distance = np.abs(pulses - self.positions)
+            accepted = mask & (distance > self.deadband_us)
+            self.targets[accepted] = pulses[accepted]
+
+            # 응답 완료 시각 추정: 지연 + 데드밴드 밖 최대 이동 거리 / 회전 속도
+            travel = np.max(np.maximum(distance[mask] - self.deadband_us, 0.0), initial=0.0)
+            self.response_times.append(arrival - issued_at + travel / self.rate_us)
+        self._move(now)
+
+    def write_pulses(self, pulses, mask):
+        """마스크된 채널 명령 기록 (지연 후 서보 모델에 도착)"""
+        with self._lock:
+            now = self.clock.now()
+            self._advance(now)
+
+            mask = np.array(mask, dtype=bool)
+            pulses = np.array(pulses, dtype=np.float64)
+            self.pending.append((now + self.latency, mask, pulses, now))
+            self.channel_writes += int(np.count_nonzero(mask))
+            if self.record:
+                channels = np.flatnonzero(mask)
+                self.commands.append((now, channels, pulses[channels]))
+            self.stopped = False
+
+    def get_positions(self):
+        """현재 가상 시각의 모델 서보 위치 (us)"""
+        with self._lock:
+            self._advance(self.clock.now())
+            return self.positions.copy()
+
+    def get_angles(self):
+        """현재 모델 서보 위치를 {관절 이름: 중립 기준 각도}로 반환 (보정 미적용)"""
+        angles = (self.get_positions() - PULSE_CENTER_US) / PULSE_PER_DEGREE_US
+        return {name: float(angle) for name, angle in zip(JOINT_NAMES, angles)}
+
+    def get_report(self):
+        """명령 처리량/주기/응답 지연 통계"""
+        with self._lock:
+            times = np.array([command[0] for command in self.commands])
+            responses = np.array(self.response_times)
+
+        report = {
+            'command_count': len(times),
+            'channel_writes': self.channel_writes,
+            'clock_speed': self.clock.speed
+        }
+        if len(times) >= 2:
+            intervals = np.diff(times)
+            span = times[-1] - times[0]
+            report.update({
+                'duration': float(span),
+                'command_rate': float((len(times) - 1) / span) if span > 0 else 0.0,
+                'interval_mean_ms': float(intervals.mean() * 1000.0),
+                'interval_p95_ms': float(np.percentile(intervals, 95) * 1000.0),
+                'interval_max_ms': float(intervals.max() * 1000.0)
+            })
+        if len(responses):
+            report.update({
+                'response_mean_ms': float(responses.mean() * 1000.0),
+                'response_p95_ms': float(np.percentile(responses, 95) * 1000.0),
+                'response_max_ms': float(responses.max() * 1000.0)
+            })
+        return report
+
+    def reset_records(self):
+        """명령 기록/통계 초기화"""
+        with self._lock:
+            self.commands.clear()
+            self.response_times.clear()
+            self.channel_writes = 0
+
+    def change_frequency(self, frequency):
+        """PWM 주파수 변경 (모델에서는 무시)"""
+        pass
+
+    def stop(self):
+        """PWM 신호 정지 (서보는 현재 위치에서 멈춤)"""
+        with self._lock:
+            self._advance(self.clock.now())
+            self.pending.clear()
+            np.copyto(self.targets, self.positions)
+            self.stopped = True
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+
+
+def print_report(title, report):
+    """벤치마크 결과 출력"""
+    print(f"\n=== {title} ===")
+    for key, value in report.items():
+        if isinstance(value, float):
+            print(f"{key}: {value:.3f}")
+        else:
+            print(f"{key}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모의 서보 백엔드로 컨트롤러 벤치마크 (가상 시계)")
+    parser.add_argument('--speed', type=float, default=20.0, help="가상 시계 배속")
+    parser.add_argument('--distance', type=float, default=48.0, help="직선 보행 거리 (cm)")
+    args = parser.parse_args()
+
+    from actuator_manager import get_actuator_manager
+    backend = MockServoBackend(clock=VirtualClock(speed=args.speed))
+    manager = get_actuator_manager(backend=backend)
+    handle = manager.acquire('benchmark')
+
+    try:
+        # 직선 보행 루프
+        from straight_walk import straight_walk
+        walk_controller = straight_walk()
+        start = backend.clock.now()
+        walk_controller.start_walking(distance_cm=args.distance)
+        handle.wait_until_settled(5.0)
+        report = backend.get_report()
+        report['virtual_elapsed'] = backend.clock.now() - start
+        print_report("straight_walk", report)
+        walk_controller.cleanup()
+
+        # 키프레임 균형 복구
+        backend.reset_records()
+        from activate_motor import BodyActivateMotor
+        motor_controller = BodyActivateMotor()
+        motor_controller.recover_balance(20.0, -20.0)
+        report = backend.get_report()
+        report['play_duration'] = motor_controller.keyframe_executor.last_play_duration
+        print_report("recover_balance", report)
+        motor_controller.cleanup()
+    finally:
+        handle.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+
+# 장애물 판단 결과 (행동, 속도 배율 0~1, 판단에 쓴 거리 cm)
+ObstacleDecision = namedtuple('ObstacleDecision', ['action', 'speed_scale', 'distance'])
+
+# 행동 종류
+GO = 'go'           # 정상 속도
+SLOW = 'slow'       # 감속
+TURN = 'turn'       # 전진 멈추고 회전으로 회피
+STOP = 'stop'       # 정지
+
+
+class ObstaclePlanner:
+    """
+    초음파 거리 기반 속도/장애물 판단
+    센서 스레드가 게시한 최신 측정값만 읽으므로 보행 루프의 제어 틱마다 호출 가능
+    slow_distance 이하에서 속도를 선형으로 줄이고, stop_distance 이하에서 회전 회피(turn_direction 지정 시) 또는 정지
+    거리를 알 수 없거나 측정이 max_age보다 오래되면 비어 있다고 보지 않음 (정지/회피 중이면 유지, 아니면 최저 속도)
+    """
+    def __init__(self, sensor, slow_distance=60.0, stop_distance=25.0, min_speed_scale=0.3,
+                 turn_direction=None, max_age=0.5):
+        self.sensor = sensor
+        self.slow_distance = slow_distance      # 감속 시작 거리 (cm)
+        self.stop_distance = stop_distance      # 정지/회피 거리 (cm)
+        self.min_speed_scale = min_speed_scale  # 감속 구간 최소 속도 배율
+        self.turn_direction = turn_direction    # 회피 회전 방향 ('left'/'right', None이면 정지)
+        self.max_age = max_age                  # 측정값 유효 시간 (초), 넘으면 감속
+
+        self.decision = ObstacleDecision(GO, 1.0, None)
+        self.stop_count = 0
+
+    def update(self):
+        """최신 거리로 판단 갱신 후 반환"""
+        reading = self.sensor.get_reading()
+        distance = reading.distance
+        stale = self.sensor.clock.now() - reading.timestamp > self.max_age
+
+        if distance is None:
+            # 에코가 모두 끊김: 막혀 있던 판단은 풀지 않고, 아니면 최저 속도로 진행
+            if self.is_blocked():
+                decision = self.decision
+            else:
+                decision = ObstacleDecision(SLOW, self.min_speed_scale, None)
+        elif distance <= self.stop_distance:
+            action = TURN if self.turn_direction is not None else STOP
+            decision = ObstacleDecision(action, 0.0, distance)
+        elif stale:
+            # 유효 측정이 끊기면 감속 구간 최저 속도로 진행
+            decision = ObstacleDecision(SLOW, self.min_speed_scale, distance)
+        elif distance < self.slow_distance:
+            ratio = (distance - self.stop_distance) / (self.slow_distance - self.stop_distance)
+            scale = self.min_speed_scale + (1.0 - self.min_speed_scale) * ratio
+            decision = ObstacleDecision(SLOW, scale, distance)
+        else:
+            decision = ObstacleDecision(GO, 1.0, distance)
+
+        if decision.action in (STOP, TURN) and self.decision.action not in (STOP, TURN):
+            self.stop_count += 1
+        self.decision = decision
+        return decision
+
+    def is_blocked(self):
+        """마지막 판단이 정지/회피인지"""
+        return self.decision.action in (STOP, TURN)
+
+    def get_status(self):
+        """장애물 판단 상태 정보 반환"""
+        return {
+            'action': self.decision.action,
+            'speed_scale': self.decision.speed_scale,
+            'distance': self.decision.distance,
+            'stop_count': self.stop_count,
+            'slow_distance': self.slow_distance,
+            'stop_distance': self.stop_distance
+        }
@@ -0,0 +1,190 @@
+import time
+import numpy as np
+from servo_bus import JOINT_COUNT, SERVO_FREQUENCY
+
+
+# PCA9685 레지스터
+PCA9685_ADDRESS = 0x40
+MODE1 = 0x00
+MODE2 = 0x01
+LED0_ON_L = 0x06
+ALL_LED_ON_L = 0xFA         # 전체 채널 동시 쓰기 (ON_L, ON_H, OFF_L, OFF_H)
+ALL_LED_OFF_H = 0xFD
+PRESCALE = 0xFE
+
+# MODE1/MODE2 비트
+MODE1_RESTART = 0x80
+MODE1_AI = 0x20            # 레지스터 자동 증가
+MODE1_SLEEP = 0x10
+MODE2_OUTDRV = 0x04        # 토템폴 출력
+FULL_OFF = 0x10
+
+OSCILLATOR_HZ = 25000000
+PWM_RESOLUTION = 4096
+PCA9685_CHANNELS = 16
+
+
+class SMBus2Transport:
+    """
+    smbus2 기반 I2C 전송
+    블록 쓰기는 32바이트 SMBus 제한이 없는 단일 i2c_rdwr 트랜잭션으로 전송
+    """
+    def __init__(self, bus_number=1):
+        import smbus2
+        self.smbus2 = smbus2
+        self.bus = smbus2.SMBus(bus_number)
+
+    def write_byte_data(self, address, register, value):
+        self.bus.write_byte_data(address, register, value)
+
+    def read_byte_data(self, address, register):
+        return self.bus.read_byte_data(address, register)
+
+    def write_block(self, address, register, data):
+        """시작 레지스터부터 연속 데이터를 한 트랜잭션으로 쓰기"""
+        message = self.smbus2.i2c_msg.write(address, [register] + list(data))
+        self.bus.i2c_rdwr(message)
+
+    def close(self):
+        self.bus.close()
+
+
+class FakeI2CBus:
+    """
+    테스트용 인메모리 I2C 버스
+    장치별 레지스터 맵과 트랜잭션 기록을 유지 (PCA9685 자동 증가, ALL_LED 전체 채널 쓰기 동작 모사)
+    """
+    def __init__(self):
+        self.registers = {}         # 주소 → 256바이트 레지스터 맵
+        self.transactions = []      # (종류, 주소, 레지스터, 길이)
+        self.closed = False
+
+    def _device(self, address):
+        if address not in self.registers:
+            self.registers[address] = bytearray(256)
+        return self.registers[address]
+
+    def _store(self, device, register, value):
+        device[register] = value & 0xFF
+        if ALL_LED_ON_L <= register <= ALL_LED_OFF_H:
+            # ALL_LED 레지스터는 16채널의 같은 바이트를 한 번에 덮어씀
+            byte = register - ALL_LED_ON_L
+            device[LED0_ON_L + byte:LED0_ON_L + 4 * PCA9685_CHANNELS:4] = bytes([value & 0xFF]) * PCA9685_CHANNELS
+
+    def write_byte_data(self, address, register, value):
+        self._store(self._device(address), register, value)
+        self.transactions.append(('write_byte', address, register, 1))
+
+    def read_byte_data(self, address, register):
+        self.transactions.append(('read_byte', address, register, 1))
+        return self._device(address)[register]
+
+    def write_block(self, address, register, data):
+        device = self._device(address)
+        auto_increment = bool(device[MODE1] & MODE1_AI)
+        for offset, value in enumerate(data):
+            target = register + offset if auto_increment else register
+            self._store(device, target & 0xFF, value)
+        self.transactions.append(('write_block', address, register, len(data)))
+
+    def read_channel_counts(self, address, channel):
+        """채널의 (ON, OFF) 카운트 반환"""
+        device = self._device(address)
+        base = LED0_ON_L + 4 * channel
+        on_count = device[base] | (device[base + 1] << 8)
+        off_count = device[base + 2] | (device[base + 3] << 8)
+        return on_count, off_count
+
+    def close(self):
+        self.closed = True
+
+
+class PCA9685ServoBackend:
+    """
+    PCA9685 하드웨어 PWM 서보 백엔드 (I2C)
+    프레임마다 변경된 채널 범위의 레지스터만 자동 증가 블록 전송 한 번으로 출력
+    """
+    def __init__(self, bus=None, address=PCA9685_ADDRESS, channels=None, frequency=SERVO_FREQUENCY):
+        self.bus = bus if bus is not None else SMBus2Transport()
+        self.address = address
+
+        # 관절 → PCA9685 채널 매핑 (JOINT_NAMES 순서)
+        if channels is None:
+            channels = range(JOINT_COUNT)
+        self.channels = np.asarray(channels, dtype=np.intp)
+        self.first_channel = int(self.channels.min())
+        self.last_channel = int(self.channels.max())
+        self.block_slots = self.channels - self.first_channel
+
+        # 블록 전송 버퍼 (채널당 ON_L, ON_H, OFF_L, OFF_H; 변경 없는 채널은 이전 값 유지)
+        self.block = np.zeros((self.last_channel - self.first_channel + 1, 4), dtype=np.uint8)
+
+        self.frequency = frequency
+        self.period_us = 1000000.0 / frequency
+        self.block_writes = 0
+        self.bytes_written = 0
+        self.stopped = False
+
+        self.bus.write_byte_data(self.address, MODE2, MODE2_OUTDRV)
+        self._set_prescale(frequency)
+
+    def _set_prescale(self, frequency):
+        """PWM 주파수 설정 (슬립 상태에서만 프리스케일 변경 가능)"""
+        prescale = int(round(OSCILLATOR_HZ / (PWM_RESOLUTION * frequency))) - 1
+        prescale = max(3, min(255, prescale))
+
+        self.bus.write_byte_data(self.address, MODE1, MODE1_SLEEP)
+        self.bus.write_byte_data(self.address, PRESCALE, prescale)
+        self.bus.write_byte_data(self.address, MODE1, MODE1_AI)
+        time.sleep(0.0005)  # 발진기 안정화 (500us)
+        self.bus.write_byte_data(self.address, MODE1, MODE1_RESTART | MODE1_AI)
+
+        self.frequency = frequency
+        self.period_us = 1000000.0 / frequency
+
+    def _pulses_to_counts(self, pulses):
+        """펄스 폭(us)을 12비트 OFF 카운트로 일괄 변환"""
+        counts = np.rint(pulses * (PWM_RESOLUTION / self.period_us))
+        return np.clip(counts, 0, PWM_RESOLUTION - 1).astype(np.uint16)
+
+    def write_pulses(self, pulses, mask):
+        """마스크된 채널의 펄스 폭(us)을 갱신하고 변경 범위 블록을 한 번에 전송"""
+        slots = self.block_slots[mask]
+        if slots.size == 0:
+            return
+
+        counts = self._pulses_to_counts(pulses[mask])
+        self.block[slots, 2] = counts & 0xFF
+        self.block[slots, 3] = counts >> 8
+
+        if self.stopped:
+            # 정지 후 첫 프레임은 전체 채널 블록 재전송 (채널마다 OFF_H를 덮어써 FULL_OFF 해제)
+            # ALL_LED_OFF_H로 해제하면 모든 채널 OFF_H가 0이 되어 미전송 채널 펄스가 깨짐
+            first_slot = 0
+            last_slot = len(self.block) - 1
+            self.stopped = False
+        else:
+            # 변경된 첫 채널부터 마지막 채널까지만 전송 (중간의 미변경 채널은 이전 값 재전송)
+            first_slot = int(slots.min())
+            last_slot = int(slots.max())
+        data = self.block[first_slot:last_slot + 1].tobytes()
+        self.bus.write_block(self.address, LED0_ON_L + 4 * (self.first_channel + first_slot), data)
+        self.block_writes += 1
+        self.bytes_written += len(data)
+
+    def change_frequency(self, frequency):
+        """PWM 주파수 변경"""
+        self._set_prescale(frequency)
+
+    def stop(self):
+        """모든 채널 출력 정지"""
+        self.bus.write_byte_data(self.address, ALL_LED_OFF_H, FULL_OFF)
+        self.stopped = True
+
+    def cleanup(self):
+        """리소스 정리"""
+        try:
+            self.stop()
+            self.bus.close()
+        except:
+            pass
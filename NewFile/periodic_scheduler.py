@@ -0,0 +1,143 @@
+from bisect import bisect_right
+from control_clock import SYSTEM_CLOCK
+
+
+# 주기 초과 처리 정책
+SKIP = 'skip'           # 놓친 주기는 건너뛰고 다음 미래 마감 시각에 맞춤 (위상 유지)
+CATCH_UP = 'catch_up'   # 놓친 주기를 대기 없이 연속 실행하여 따라잡음 (틱 수 유지)
+SCHEDULER_POLICIES = (SKIP, CATCH_UP)
+
+# 지터/초과 히스토그램 구간 경계 (ms)
+HISTOGRAM_EDGES_MS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+
+class _Histogram:
+    """고정 구간 히스토그램 (구간 경계 ms, 마지막 구간은 상한 없음)"""
+    def __init__(self, edges_ms=HISTOGRAM_EDGES_MS):
+        self.edges = tuple(edge / 1000.0 for edge in edges_ms)
+        self.labels = [f"<{edge:g}ms" for edge in edges_ms] + [f">={edges_ms[-1]:g}ms"]
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * len(self.labels)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value):
+        self.counts[bisect_right(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000.0 if self.count else 0.0,
+            'max_ms': self.maximum * 1000.0,
+            'bins': dict(zip(self.labels, self.counts))
+        }
+
+
+class PeriodicScheduler:
+    """
+    마감 시각 기반 주기 스케줄러
+    다음 마감 시각을 절대 시각(단조 시계)으로 누적하므로 작업 시간이 주기에 더해지지 않음,
+    작업이 마감 시각을 넘기면 주기 초과로 기록하고 정책(skip/catch_up)에 따라 다음 마감 시각을 정함
+    """
+    def __init__(self, rate, clock=SYSTEM_CLOCK, policy=SKIP, max_catch_up=5, name='periodic'):
+        if rate <= 0:
+            raise ValueError(f"주기 빈도는 0보다 커야 합니다: {rate}")
+        if policy not in SCHEDULER_POLICIES:
+            raise ValueError(f"알 수 없는 스케줄러 정책: {policy}")
+
+        self.name = name
+        self.rate = float(rate)
+        self.period = 1.0 / self.rate
+        self.clock = clock
+        self.policy = policy
+        self.max_catch_up = max_catch_up      # catch_up 정책에서 연속 실행할 최대 놓친 주기 수
+
+        self.next_deadline = None
+        self.jitter = _Histogram()          # 마감 시각 대비 실제 깨어난 지연
+        self.overruns = _Histogram()        # 작업이 마감 시각을 넘긴 시간
+        self.tick_count = 0
+        self.skipped_ticks = 0
+
+    def set_rate(self, rate):
+        """주기 빈도 변경 (다음 주기부터 적용)"""
+        if rate <= 0:
+            raise ValueError(f"주기 빈도는 0보다 커야 합니다: {rate}")
+        self.rate = float(rate)
+        self.period = 1.0 / self.rate
+
+    def start(self):
+        """주기 시작 (지금부터 한 주기 뒤가 첫 마감 시각)"""
+        self.next_deadline = self.clock.now() + self.period
+        return self.next_deadline
+
+    def wait_next(self, wait=None):
+        """
+        다음 마감 시각까지 대기
+        wait: 대기 함수 (초 → 중단되면 True, 예: actuator.wait), 없으면 clock.sleep
+        반환: 대기 중 중단되었으면 True
+        """
+        if self.next_deadline is None:
+            self.start()
+
+        period = self.period
+        deadline = self.next_deadline
+        now = self.clock.now()
+        interrupted = False
+
+        if now > deadline:
+            # 주기 초과: 작업이 마감 시각을 넘김
+            late = now - deadline
+            self.overruns.add(late)
+            missed = int(late // period)
+            if self.policy == SKIP:
+                # 놓친 주기를 건너뛰고 다음 미래 마감 시각까지 대기
+                self.skipped_ticks += missed
+                deadline += (missed + 1) * period
+            else:
+                # 밀린 주기는 대기 없이 바로 실행 (최대 max_catch_up개, 나머지는 건너뜀)
+                if missed > self.max_catch_up:
+                    skipped = missed - self.max_catch_up
+                    self.skipped_ticks += skipped
+                    deadline += skipped * period
+                self.jitter.add(now - deadline)
+                self.next_deadline = deadline + period
+                self.tick_count += 1
+                return False
+
+        remaining = deadline - self.clock.now()
+        if wait is not None:
+            interrupted = bool(wait(max(remaining, 0.0)))
+        else:
+            self.clock.sleep(remaining)
+
+        self.jitter.add(max(self.clock.now() - deadline, 0.0))
+        self.next_deadline = deadline + period
+        self.tick_count += 1
+        return interrupted
+
+    def reset_stats(self):
+        """통계 초기화"""
+        self.jitter.reset()
+        self.overruns.reset()
+        self.tick_count = 0
+        self.skipped_ticks = 0
+
+    def get_stats(self):
+        """주기/지터/초과 통계"""
+        return {
+            'name': self.name,
+            'rate': self.rate,
+            'policy': self.policy,
+            'tick_count': self.tick_count,
+            'overrun_count': self.overruns.count,
+            'skipped_ticks': self.skipped_ticks,
+            'jitter': self.jitter.to_dict(),
+            'overrun': self.overruns.to_dict()
+        }
@@ -5,22 +5,29 @@ def execute_recovery():
     """
     import time
     import math
-    from detect_inclination import BodyDetectInclination
+    from imu_sampler import get_imu_sampler
     from activate_motor import BodyActivateMotor
     from activate_steering import BodyActivateSteering
+    from keyframe_track import compile_keyframe_track
+    from periodic_scheduler import PeriodicScheduler
     
     class PostureRecoveryController:
         def __init__(self):
             # 하위 시스템 초기화
-            self.inclination_sensor = BodyDetectInclination()
             self.motor_controller = BodyActivateMotor()
             self.steering_controller = BodyActivateSteering()
+            self.clock = self.motor_controller.actuator.clock
+            
+            # 공유 IMU 샘플러 (복구 동작/대기 중에도 계속 샘플링)
+            self.imu_sampler = get_imu_sampler(self.clock).acquire('posture_recovery')
             
             # 복구 파라미터
             self.recovery_threshold = 5.0      # 복구 시작 임계값 (도)
             self.max_recovery_attempts = 3     # 최대 복구 시도 횟수
             self.recovery_timeout = 10.0       # 복구 타임아웃 (초)
             self.stabilization_delay = 1.0     # 안정화 대기 시간 (초)
+            self.check_interval = 2.0          # 자동 복구 자세 확인 주기 (초)
+            self.scheduler = PeriodicScheduler(1.0 / self.check_interval, self.clock, name='posture_recovery')
             
             # 복구 상태
             self.is_recovering = False
@@ -78,17 +85,17 @@ def execute_recovery():
         def check_posture_status(self):
             """자세 상태 확인"""
             try:
-                # 센서 데이터 읽기
-                sensor_data = self.inclination_sensor.read_gyro()
+                # 최신 자세 샘플
+                sample = self.imu_sampler.wait_for_sample()
                 
-                if sensor_data is None:
+                if sample is None:
                     return {'status': 'error', 'message': '센서 데이터 읽기 실패'}
                 
                 # 현재 각도 가져오기
-                angles = sensor_data['angles']
-                roll = angles['roll']
-                pitch = angles['pitch']
-                yaw = angles['yaw']
+                roll = sample.roll
+                pitch = sample.pitch
+                yaw = sample.yaw
+                angles = {'roll': roll, 'pitch': pitch, 'yaw': yaw}
                 
                 # 자세 상태 판단
                 posture_status = self._analyze_posture(roll, pitch, yaw)
@@ -145,7 +152,7 @@ def execute_recovery():
             # 복구 시작
             self.is_recovering = True
             self.recovery_attempts += 1
-            start_time = time.time()
+            start_time = self.clock.now()
             
             print(f"자세 복구 시작 (시도 {self.recovery_attempts}/{self.max_recovery_attempts})")
             
@@ -158,8 +165,10 @@ def execute_recovery():
                     success = self._run_recovery_sequence(recovery_sequence)
                     
                     if success:
-                        # 안정화 대기
-                        time.sleep(self.stabilization_delay)
+                        # 안정화 대기 (비상 정지 시 즉시 중단)
+                        if self.motor_controller.actuator.wait(self.stabilization_delay):
+                            print("비상 정지로 자세 복구가 취소되었습니다.")
+                            return False
                         
                         # 복구 결과 확인
                         final_status = self.check_posture_status()
@@ -173,7 +182,7 @@ def execute_recovery():
                             'recovery_sequence': recovery_sequence,
                             'final_status': final_status,
                             'success': recovery_successful,
-                            'duration': time.time() - start_time
+                            'duration': self.clock.now() - start_time
                         }
                         self.recovery_history.append(recovery_record)
                         
@@ -228,24 +237,20 @@ def execute_recovery():
             return sequences
         
         def _run_recovery_sequence(self, recovery_sequence):
-            """복구 시퀀스 실행"""
+            """복구 시퀀스 실행 (키프레임 트랙으로 변환하여 관절 그룹 동시 구동)"""
             try:
-                print(f"복구 시퀀스 실행: {len(recovery_sequence)}개 단계")
+                track = compile_keyframe_track(recovery_sequence)
+                print(f"복구 시퀀스 실행: {len(recovery_sequence)}개 단계 → {len(track)}개 키프레임")
                 
-                for i, (motor_name, target_angle, delay) in enumerate(recovery_sequence):
-                    print(f"단계 {i+1}/{len(recovery_sequence)}: {motor_name} → {target_angle}°")
-                    
-                    # 모터 각도 설정
-                    success = self.motor_controller.set_motor_angle(motor_name, target_angle)
-                    
-                    if not success:
-                        print(f"모터 {motor_name} 제어 실패")
-                        return False
-                    
-                    # 지연 대기
-                    time.sleep(delay)
+                for i, (start_time, targets) in enumerate(track.keyframes):
+                    joints = ', '.join(f"{motor_name} → {angle}°" for motor_name, angle in targets.items())
+                    print(f"키프레임 {i+1}/{len(track)} (+{start_time:.2f}s): {joints}")
+                
+                if not self.motor_controller.play_keyframe_track(track):
+                    print("복구 시퀀스 실행 실패")
+                    return False
                 
-                print("복구 시퀀스 실행 완료")
+                print(f"복구 시퀀스 실행 완료 ({self.motor_controller.keyframe_executor.last_play_duration * 1000:.0f}ms)")
                 return True
                 
             except Exception as e:
@@ -256,10 +261,11 @@ def execute_recovery():
             """자동 복구 모드"""
             print(f"자동 복구 모드 시작 (지속 시간: {duration}초)")
             
-            start_time = time.time()
+            start_time = self.clock.now()
             
             try:
-                while time.time() - start_time < duration:
+                self.scheduler.start()
+                while self.clock.now() - start_time < duration:
                     # 현재 자세 상태 확인
                     posture_status = self.check_posture_status()
                     
@@ -271,9 +277,12 @@ def execute_recovery():
                         if not success:
                             print("복구 실패 - 비상 안정화 실행")
                             self.emergency_stabilization()
+                            
+                            # 비상 정지는 해제될 때까지 유지되므로 자동 복구 종료
+                            break
                     
-                    # 대기
-                    time.sleep(2.0)
+                    # 다음 확인 주기까지 대기 (복구 시퀀스로 넘긴 주기는 건너뜀)
+                    self.scheduler.wait_next()
                 
                 print("자동 복구 모드 종료")
                 
@@ -287,16 +296,13 @@ def execute_recovery():
             print("비상 안정화 실행")
             
             try:
-                # 모든 모터를 중립 위치로
-                self.motor_controller.emergency_stop()
-                
-                # 조향을 중립으로
-                self.steering_controller.reset_steering()
+                # 진행 중인 시퀀스를 취소하고 모든 모터를 한 번에 중립 위치로
+                latency_ms = self.motor_controller.emergency_stop()
                 
-                # 안정화 대기
-                time.sleep(3.0)
+                # 조향 상태 초기화 (힙 관절은 중립 출력에 포함)
+                self.steering_controller.clear_steering_state()
                 
-                print("비상 안정화 완료")
+                print(f"비상 안정화 완료 (정지 지연 {latency_ms:.2f}ms)")
                 return True
                 
             except Exception as e:
@@ -311,7 +317,8 @@ def execute_recovery():
                 'max_recovery_attempts': self.max_recovery_attempts,
                 'last_recovery_time': self.last_recovery_time,
                 'recovery_history_count': len(self.recovery_history),
-                'recovery_threshold': self.recovery_threshold
+                'recovery_threshold': self.recovery_threshold,
+                'scheduler': self.scheduler.get_stats()
             }
         
         def set_recovery_parameters(self, threshold=None, max_attempts=None, timeout=None):
@@ -337,7 +344,7 @@ def execute_recovery():
         def cleanup(self):
             """리소스 정리"""
             try:
-                self.inclination_sensor.cleanup()
+                self.imu_sampler.release('posture_recovery')
                 self.motor_controller.cleanup()
                 self.steering_controller.cleanup()
                 
@@ -21,7 +21,7 @@ from pygame.locals import *
 import time
 
 class QuadrupedSimulation:
-    def __init__(self, width=1200, height=800):
+    def __init__(self, width=1200, height=800, walk_controller=None):
         pygame.init()
         self.width = width
         self.height = height
@@ -65,6 +65,9 @@ class QuadrupedSimulation:
         # 제어 키 상태
         self.keys_pressed = set()
         
+        # 실제 보행 코드 연동 (ContinuousWalk, 없으면 화면 시뮬레이션만)
+        self.walk_controller = walk_controller
+        
     def draw_3d_robot(self):
         """3D 로봇을 2D 화면에 투영하여 그리기"""
         # 바디 그리기
@@ -160,8 +163,16 @@ class QuadrupedSimulation:
         elif self.robot_y > self.height - 100:
             self.robot_y = self.height - 100
         
+        # 연속 보행 컨트롤러의 다리 지지 상태 표시
+        if self.walk_controller is not None:
+            for leg_name, contact in self.walk_controller.get_contacts().items():
+                self.legs[leg_name]['contact'] = contact
+                self.pressure_sensors[leg_name] = 1.0 if contact else 0
+        
         # 다리 움직임 시뮬레이션
         for leg_name in self.legs:
+            if self.walk_controller is not None:
+                break
             # 보행 패턴 시뮬레이션
             if self.robot_speed > 0:
                 self.legs[leg_name]['angle'] += 2 * self.robot_speed
@@ -231,6 +242,11 @@ class QuadrupedSimulation:
             self.robot_speed = 0
             self.robot_steering = 0
         
+        # 연속 보행 속도 명령 전달 (최대 속도/조향으로 정규화)
+        if self.walk_controller is not None:
+            vx = self.robot_speed / 5.0 if self.robot_speed >= 0 else self.robot_speed / 3.0
+            self.walk_controller.set_velocity(vx, 0.0, self.robot_steering / 3.0)
+        
         return True
     
     def run_simulation(self):
@@ -264,6 +280,8 @@ class QuadrupedSimulation:
             pygame.display.flip()
             self.clock.tick(60)
         
+        if self.walk_controller is not None:
+            self.walk_controller.cleanup()
         pygame.quit()
         sys.exit()
 
@@ -276,5 +294,12 @@ if __name__ == "__main__":
     print("Space: 정지")
     print("ESC: 종료")
     
-    simulation = QuadrupedSimulation()
+    # --walk: WASD 입력으로 실제 연속 보행 코드 구동
+    walk_controller = None
+    if '--walk' in sys.argv:
+        from continuous_walk import ContinuousWalk
+        walk_controller = ContinuousWalk()
+        walk_controller.start()
+    
+    simulation = QuadrupedSimulation(walk_controller=walk_controller)
     simulation.run_simulation()
@@ -0,0 +1,284 @@
+import time
+import numpy as np
+from joint_pose import (
+    JOINT_NAMES, JOINT_COUNT, JOINT_INDEX, ANGLE_LIMITS,
+    PULSE_PER_DEGREE_US, new_pose, new_mask, pose_from_dict, pose_to_dict, clamp_pose
+)
+from servo_calibration import load_servo_calibration
+
+
+# 서브모터 핀 설정 (라즈베리파이 GPIO, BCM)
+MOTOR_PINS = {
+    'front_left_hip': 17,      # 앞왼쪽 힙 모터
+    'front_left_knee': 18,     # 앞왼쪽 무릎 모터
+    'front_left_ankle': 27,    # 앞왼쪽 발목 모터
+    'front_right_hip': 22,     # 앞오른쪽 힙 모터
+    'front_right_knee': 23,    # 앞오른쪽 무릎 모터
+    'front_right_ankle': 24,   # 앞오른쪽 발목 모터
+    'back_left_hip': 10,       # 뒤왼쪽 힙 모터
+    'back_left_knee': 9,       # 뒤왼쪽 무릎 모터
+    'back_left_ankle': 11,     # 뒤왼쪽 발목 모터
+    'back_right_hip': 5,       # 뒤오른쪽 힙 모터
+    'back_right_knee': 6,      # 뒤오른쪽 무릎 모터
+    'back_right_ankle': 13     # 뒤오른쪽 발목 모터
+}
+
+# 서보 PWM 주기 (50Hz = 20ms)
+SERVO_FREQUENCY = 50
+SERVO_PERIOD_US = 1000000.0 / SERVO_FREQUENCY
+
+# 중복 출력 억제 데드밴드 (도, 마지막 출력값과의 차이가 이하이면 채널 출력 생략)
+DEFAULT_WRITE_DEADBAND = 0.1
+
+
+class GPIOServoBackend:
+    """
+    RPi.GPIO 소프트웨어 PWM 서보 백엔드
+    채널별 PWM 객체를 유지하고 듀티 사이클만 갱신 (신호를 끊지 않음)
+    """
+    def __init__(self, joint_pins=None):
+        import RPi.GPIO as GPIO
+        self.GPIO = GPIO
+
+        if joint_pins is None:
+            joint_pins = [MOTOR_PINS[name] for name in JOINT_NAMES]
+        self.joint_pins = list(joint_pins)
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+
+        # 모든 모터 핀을 출력으로 설정하고 PWM 시작
+        self.pwm_objects = []
+        for pin in self.joint_pins:
+            GPIO.setup(pin, GPIO.OUT)
+            pwm = GPIO.PWM(pin, SERVO_FREQUENCY)
+            pwm.start(0)
+            self.pwm_objects.append(pwm)
+
+    def write_pulses(self, pulses, mask):
+        """마스크된 채널의 펄스 폭(us) 출력"""
+        duties = pulses * (100.0 / SERVO_PERIOD_US)
+        for index in np.flatnonzero(mask):
+            self.pwm_objects[index].ChangeDutyCycle(duties[index])
+
+    def change_frequency(self, frequency):
+        """PWM 주파수 변경"""
+        for pwm in self.pwm_objects:
+            pwm.ChangeFrequency(frequency)
+
+    def stop(self):
+        """PWM 신호 정지"""
+        for pwm in self.pwm_objects:
+            try:
+                pwm.stop()
+            except:
+                pass
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+        try:
+            self.GPIO.cleanup()
+        except:
+            pass
+
+
+class SimulationServoBackend:
+    """하드웨어가 없는 환경용 서보 백엔드 (verbose=True면 프레임마다 콘솔 출력)"""
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.last_pulses = np.zeros(JOINT_COUNT, dtype=np.float64)
+
+    def write_pulses(self, pulses, mask):
+        """마스크된 채널의 펄스 폭(us) 출력"""
+        np.copyto(self.last_pulses, pulses, where=mask)
+
+        if self.verbose and mask.any():
+            changed = [JOINT_NAMES[index] for index in np.flatnonzero(mask)]
+            print(f"시뮬레이션: {len(changed)}개 관절 프레임 출력 ({', '.join(changed)})")
+
+    def change_frequency(self, frequency):
+        """PWM 주파수 변경 (시뮬레이션에서는 무시)"""
+        pass
+
+    def stop(self):
+        """PWM 신호 정지"""
+        pass
+
+    def cleanup(self):
+        """리소스 정리"""
+        pass
+
+
+def create_servo_backend(kind, **options):
+    """이름으로 서보 백엔드 생성 ('gpio', 'pca9685', 'simulation')"""
+    if kind == 'gpio':
+        return GPIOServoBackend(**options)
+    if kind == 'pca9685':
+        from pca9685_backend import PCA9685ServoBackend
+        return PCA9685ServoBackend(**options)
+    if kind == 'simulation':
+        return SimulationServoBackend(**options)
+    raise ValueError(f"알 수 없는 서보 백엔드: {kind}")
+
+
+class ServoCommandBus:
+    """
+    12개 관절 서보 명령 버스
+    관절 목표 벡터를 한 제어 프레임에 일괄 출력 (관절별 대기 없음)
+    관절별 보정 조회 테이블로 펄스를 변환하고,
+    채널별 마지막 출력 펄스를 기억하여 데드밴드 안의 변경은 출력하지 않음
+    """
+    def __init__(self, backend=None, deadband=DEFAULT_WRITE_DEADBAND, calibration=None):
+        if backend is None:
+            backend = 'gpio'
+
+        # 이름으로 요청한 백엔드 종류 (시뮬레이션으로 대체되어도 유지, 객체로 받으면 None)
+        self.backend_kind = backend if isinstance(backend, str) else None
+        if isinstance(backend, str):
+            try:
+                backend = create_servo_backend(backend)
+                print("서보 버스 초기화 완료")
+            except ImportError as e:
+                print(f"서보 백엔드 모듈을 찾을 수 없습니다 ({e}). 시뮬레이션 모드로 실행됩니다.")
+                backend = SimulationServoBackend()
+            except Exception as e:
+                print(f"서보 백엔드 초기화 오류: {e}")
+                backend = SimulationServoBackend()
+
+        self.backend = backend
+        self.simulation_mode = isinstance(backend, SimulationServoBackend)
+
+        # 서보 보정 조회 테이블 (지정하지 않으면 보정 파일에서 로드)
+        self.calibration = calibration if calibration is not None else load_servo_calibration()
+
+        # 현재 관절 각도 벡터 (JOINT_NAMES 순서)
+        self.current_angles = new_pose()
+
+        # 프레임 출력용 사전 할당 버퍼
+        self._frame_pose = new_pose()
+        self._frame_pulses = new_pose()
+        self._all_joints = new_mask(True)
+        self._write_mask = new_mask()
+        self._pulse_delta = new_pose()
+
+        # 채널별 마지막 출력 펄스 (NaN: 아직 출력하지 않음 → 항상 출력)
+        self.written_pulses = new_pose(np.nan)
+        self.set_deadband(deadband)
+
+        # 프레임/채널 출력 통계
+        self.frame_count = 0
+        self.last_frame_time = 0.0
+        self.issued_writes = 0
+        self.suppressed_writes = 0
+
+    def uses_backend(self, backend):
+        """요청한 백엔드(이름 또는 객체)가 현재 버스의 백엔드와 같은지"""
+        if isinstance(backend, str):
+            return backend == self.backend_kind
+        return backend is self.backend
+
+    def set_deadband(self, deadband):
+        """중복 출력 억제 데드밴드 설정 (도, 0이면 동일 값만 억제)"""
+        self.deadband = max(0.0, deadband)
+        self.deadband_us = self.deadband * PULSE_PER_DEGREE_US
+
+    def invalidate(self):
+        """마지막 출력 기록 초기화 (다음 프레임은 전체 채널 출력)"""
+        self.written_pulses.fill(np.nan)
+
+    def write_pose(self, pose, mask=None, force=False):
+        """
+        자세 벡터를 한 프레임으로 출력 (mask: 출력할 관절, None이면 전체)
+        마지막 출력과 데드밴드 이내인 채널은 건너뜀 (force=True면 모두 출력)
+        """
+        if mask is None:
+            mask = self._all_joints
+
+        frame = self._frame_pose
+        np.copyto(frame, self.current_angles)
+        np.copyto(frame, pose, where=mask)
+        clamp_pose(frame, out=frame)
+        pulses = self.calibration.angles_to_pulses(frame, out=self._frame_pulses)
+
+        # 변경 채널 선별 (NaN 비교는 False이므로 첫 출력은 항상 포함)
+        write_mask = self._write_mask
+        if force:
+            np.copyto(write_mask, mask)
+        else:
+            delta = np.subtract(pulses, self.written_pulses, out=self._pulse_delta)
+            np.abs(delta, out=delta)
+            np.logical_not(delta <= self.deadband_us, out=write_mask)
+            write_mask &= mask
+
+        requested = int(np.count_nonzero(mask))
+        issued = int(np.count_nonzero(write_mask))
+        self.suppressed_writes += requested - issued
+        if issued == 0:
+            return True
+
+        try:
+            self.backend.write_pulses(pulses, write_mask)
+        except Exception as e:
+            print(f"서보 프레임 출력 오류: {e}")
+            return False
+
+        np.copyto(self.written_pulses, pulses, where=write_mask)
+        np.copyto(self.current_angles, frame, where=write_mask)
+        self.issued_writes += issued
+        self.frame_count += 1
+        self.last_frame_time = time.time()
+        return True
+
+    def write_frame(self, targets):
+        """관절 목표 각도를 한 프레임으로 출력 (targets: {관절 이름: 각도})"""
+        try:
+            pose, mask = pose_from_dict(targets, self.current_angles)
+        except KeyError as e:
+            print(f"알 수 없는 모터: {e.args[0]}")
+            return False
+        return self.write_pose(pose, mask)
+
+    def write_vector(self, angles):
+        """12개 관절 목표 벡터 전체를 한 프레임으로 출력"""
+        if len(angles) != JOINT_COUNT:
+            print(f"관절 벡터 길이 오류: {len(angles)} (필요: {JOINT_COUNT})")
+            return False
+        return self.write_pose(np.asarray(angles, dtype=np.float64))
+
+    def get_angle(self, joint_name):
+        """관절 현재 각도 반환"""
+        return float(self.current_angles[JOINT_INDEX[joint_name]])
+
+    def get_angles(self):
+        """전체 관절 각도 반환 ({관절 이름: 각도})"""
+        return pose_to_dict(self.current_angles)
+
+    def get_pose(self):
+        """현재 자세 벡터 복사본 반환"""
+        return self.current_angles.copy()
+
+    def get_write_stats(self):
+        """채널 출력 통계 반환 (출력/억제 횟수)"""
+        total = self.issued_writes + self.suppressed_writes
+        return {
+            'frame_count': self.frame_count,
+            'issued_writes': self.issued_writes,
+            'suppressed_writes': self.suppressed_writes,
+            'suppression_ratio': self.suppressed_writes / total if total else 0.0,
+            'deadband': self.deadband
+        }
+
+    def change_frequency(self, frequency):
+        """PWM 주파수 변경"""
+        self.backend.change_frequency(frequency)
+        self.invalidate()
+
+    def stop(self):
+        """PWM 신호 정지"""
+        self.backend.stop()
+        self.invalidate()
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.backend.cleanup()
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import numpy as np
+from joint_pose import (
+    JOINT_NAMES, JOINT_COUNT, ANGLE_MIN, ANGLE_MAX, PULSE_PER_DEGREE_US, new_mask
+)
+
+
+# 기본 보정 파일 경로 (모듈과 같은 디렉토리)
+DEFAULT_CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servo_calibration.json')
+
+# 표준 서보 펄스 범위 (중립 1500us, 0~180도 = 500~2500us)
+PULSE_CENTER_US = 1500.0
+PULSE_MIN_US = 500.0
+PULSE_MAX_US = 2500.0
+
+# 조회 테이블 해상도 (도)
+LOOKUP_RESOLUTION = 0.1
+
+
+def default_joint_calibration():
+    """보정되지 않은 서보의 기본 보정값"""
+    return {
+        'offset': 0.0,                         # 중립 보정 (도)
+        'direction': 1,                        # 회전 방향 (1 또는 -1)
+        'min_us': PULSE_MIN_US,                # 최소 펄스 폭
+        'max_us': PULSE_MAX_US,                # 최대 펄스 폭
+        'us_per_degree': PULSE_PER_DEGREE_US   # 각도당 펄스 폭
+    }
+
+
+class ServoCalibration:
+    """
+    관절별 서보 보정 테이블
+    보정값(중립 보정, 방향, 펄스 범위)을 시작 시 관절별 0.1도 해상도 펄스 조회 테이블로 컴파일,
+    프레임 출력은 테이블 인덱싱만 수행
+    """
+    def __init__(self, joints=None, resolution=LOOKUP_RESOLUTION):
+        self.joints = {name: default_joint_calibration() for name in JOINT_NAMES}
+        if joints:
+            for joint_name, values in joints.items():
+                if joint_name not in self.joints:
+                    raise KeyError(joint_name)
+                self.joints[joint_name].update(values)
+
+        self.resolution = resolution
+        self.compile()
+
+    def compile(self):
+        """보정값으로 관절별 펄스 조회 테이블 생성"""
+        self.angle_origin = float(ANGLE_MIN.min())
+        span = float(ANGLE_MAX.max()) - self.angle_origin
+        self.table_width = int(round(span / self.resolution)) + 1
+        self.index_scale = 1.0 / self.resolution
+
+        angles = self.angle_origin + np.arange(self.table_width) * self.resolution
+        table = np.empty((JOINT_COUNT, self.table_width), dtype=np.float64)
+        for row, joint_name in enumerate(JOINT_NAMES):
+            table[row] = self._pulse_curve(self.joints[joint_name], angles)
+
+        # 평탄화된 테이블과 관절별 행 시작 인덱스
+        self.table = table
+        self.flat_table = table.ravel()
+        self.row_offsets = np.arange(JOINT_COUNT, dtype=np.intp) * self.table_width
+
+        # 출력용 사전 할당 버퍼
+        self._scaled = np.empty(JOINT_COUNT, dtype=np.float64)
+        self._index = np.empty(JOINT_COUNT, dtype=np.intp)
+
+    @staticmethod
+    def _pulse_curve(calibration, angles):
+        """보정값을 적용한 각도 → 펄스 폭(us) 변환"""
+        pulses = PULSE_CENTER_US + (
+            calibration['direction'] * angles + calibration['offset']
+        ) * calibration['us_per_degree']
+        return np.clip(pulses, calibration['min_us'], calibration['max_us'])
+
+    def angles_to_pulses(self, pose, out=None):
+        """제한 적용된 자세 벡터를 조회 테이블로 펄스 폭(us) 벡터로 변환"""
+        if out is None:
+            out = np.empty(JOINT_COUNT, dtype=np.float64)
+        scaled = np.subtract(pose, self.angle_origin, out=self._scaled)
+        scaled *= self.index_scale
+        np.rint(scaled, out=scaled)
+        index = self._index
+        index[:] = scaled
+        np.clip(index, 0, self.table_width - 1, out=index)
+        index += self.row_offsets
+        np.take(self.flat_table, index, out=out)
+        return out
+
+    def joint_pulse(self, joint_name, angle):
+        """단일 관절 각도의 보정 펄스 폭(us) 반환"""
+        return float(self._pulse_curve(self.joints[joint_name], np.float64(angle)))
+
+    def to_dict(self):
+        return {'resolution': self.resolution, 'joints': self.joints}
+
+    def save(self, path=DEFAULT_CALIBRATION_PATH):
+        """보정값을 JSON 파일로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def load_servo_calibration(path=DEFAULT_CALIBRATION_PATH):
+    """보정 파일 로드 (파일이 없거나 잘못되면 기본 보정값 사용)"""
+    if not os.path.exists(path):
+        return ServoCalibration()
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return ServoCalibration(data.get('joints'), data.get('resolution', LOOKUP_RESOLUTION))
+    except Exception as e:
+        print(f"서보 보정 파일 로드 오류 ({path}): {e}. 기본 보정값을 사용합니다.")
+        return ServoCalibration()
+
+
+class ServoCalibrationRoutine:
+    """
+    명령줄 서보 보정 절차
+    관절마다 중립 보정, 회전 방향, 기계적 한계 펄스를 조그 입력으로 측정하여 기록
+    """
+    def __init__(self, backend, calibration, input_func=input):
+        self.backend = backend
+        self.calibration = calibration
+        self.input = input_func
+        self.pulses = np.full(JOINT_COUNT, PULSE_CENTER_US, dtype=np.float64)
+
+    def _write(self, joint_index, pulse_us):
+        """단일 채널에 펄스 폭 출력"""
+        mask = new_mask()
+        mask[joint_index] = True
+        self.pulses[joint_index] = pulse_us
+        self.backend.write_pulses(self.pulses, mask)
+
+    def _jog(self, joint_index, prompt, pulse_us, step_us):
+        """'+'/'-' 입력으로 펄스 폭 조정, 빈 입력으로 확정"""
+        while True:
+            self._write(joint_index, pulse_us)
+            command = self.input(f"{prompt} [{pulse_us:.0f}us] (+/-: {step_us:.0f}us 조정, 숫자: 직접 입력, Enter: 확정) > ").strip()
+            if not command:
+                return pulse_us
+            if command in ('+', '-'):
+                pulse_us += step_us if command == '+' else -step_us
+            else:
+                try:
+                    pulse_us = float(command)
+                except ValueError:
+                    print(f"알 수 없는 입력: {command}")
+                    continue
+            pulse_us = min(max(pulse_us, PULSE_MIN_US), PULSE_MAX_US)
+
+    def calibrate_joint(self, joint_name):
+        """한 관절 보정 (중립 → 방향 → 최소/최대 펄스)"""
+        joint_index = JOINT_NAMES.index(joint_name)
+        values = self.calibration.joints[joint_name]
+        us_per_degree = values['us_per_degree']
+        print(f"\n=== {joint_name} 보정 ===")
+
+        # 1. 중립 위치 (관절 0도)
+        start = PULSE_CENTER_US + values['offset'] * us_per_degree
+        center_us = self._jog(joint_index, "관절이 중립 위치가 되도록 조정", start, 5.0)
+        values['offset'] = round((center_us - PULSE_CENTER_US) / us_per_degree, 2)
+
+        # 2. 회전 방향 (+10도 명령 시 양의 방향으로 움직이는지)
+        self._write(joint_index, center_us + 10.0 * us_per_degree)
+        answer = self.input("관절이 양(+)의 방향으로 움직였습니까? (Y/n) > ").strip().lower()
+        values['direction'] = -1 if answer.startswith('n') else 1
+
+        # 3. 기계적 한계 (기계적 멈춤에 바로 부딪히지 않도록 중립에서 시작해 바깥쪽으로 조그)
+        values['min_us'] = self._jog(joint_index, "최소 한계 위치까지 조정 (-로 감소)", center_us, 10.0)
+        values['max_us'] = self._jog(joint_index, "최대 한계 위치까지 조정 (+로 증가)", center_us, 10.0)
+        if values['min_us'] > values['max_us']:
+            values['min_us'], values['max_us'] = values['max_us'], values['min_us']
+
+        # 중립으로 복귀
+        self._write(joint_index, center_us)
+        print(f"{joint_name}: 중립 보정 {values['offset']:+.2f}°, 방향 {values['direction']:+d}, "
+              f"펄스 {values['min_us']:.0f}~{values['max_us']:.0f}us")
+
+    def run(self, joint_names=JOINT_NAMES):
+        """지정한 관절들을 차례로 보정하고 테이블 재컴파일"""
+        for joint_name in joint_names:
+            self.calibrate_joint(joint_name)
+        self.calibration.compile()
+        return self.calibration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="4족 보행 로봇 서보 보정")
+    parser.add_argument('--backend', default='gpio', choices=('gpio', 'pca9685', 'simulation'),
+                        help="서보 백엔드")
+    parser.add_argument('--file', default=DEFAULT_CALIBRATION_PATH, help="보정 파일 경로")
+    parser.add_argument('--joint', action='append', choices=JOINT_NAMES,
+                        help="보정할 관절 (여러 번 지정 가능, 생략 시 전체)")
+    args = parser.parse_args()
+
+    from servo_bus import create_servo_backend
+    backend = create_servo_backend(args.backend)
+    calibration = load_servo_calibration(args.file)
+    routine = ServoCalibrationRoutine(backend, calibration)
+
+    try:
+        routine.run(args.joint or JOINT_NAMES)
+        calibration.save(args.file)
+        print(f"\n보정 결과 저장: {args.file}")
+    except KeyboardInterrupt:
+        print("\n보정이 취소되었습니다. (저장하지 않음)")
+    finally:
+        backend.cleanup()
+
+
+if __name__ == "__main__":
+    main()
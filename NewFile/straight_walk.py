@@ -4,9 +4,27 @@ def straight_walk():
     사족 보행 로봇의 기본적인 직선 보행 기능
     """
     import time
+    import math
+    import numpy as np
     from leg_moving import LegMoving
     from activate_motor import BodyActivateMotor
     from activate_steering import BodyActivateSteering
+    from gait_generator import get_gait_table, stride_per_cycle
+    from imu_sampler import get_imu_sampler
+    from leg_odometry import LegOdometry
+    from periodic_scheduler import PeriodicScheduler
+    from fsr_sensor import FSRContactSensor
+    from turning_walk import HeadingController
+    from ultrasonic_sensor import UltrasonicSensor
+    from obstacle_planner import ObstaclePlanner, STOP, TURN
+    from joint_pose import LEG_NAMES, LEG_JOINT_INDEX, new_pose, clamp_pose
+    
+    # 자세 보정 1도당 관절 오프셋 (균형 유지와 같은 방향: roll → 발목 좌우, pitch → 무릎 앞뒤)
+    ROLL_OFFSETS = new_pose()
+    PITCH_OFFSETS = new_pose()
+    for leg_name in LEG_NAMES:
+        ROLL_OFFSETS[LEG_JOINT_INDEX[(leg_name, 'ankle')]] = 1.0 if leg_name.endswith('left') else -1.0
+        PITCH_OFFSETS[LEG_JOINT_INDEX[(leg_name, 'knee')]] = 1.0 if leg_name.startswith('front') else -1.0
     
     class StraightWalkController:
         def __init__(self):
@@ -25,43 +43,56 @@ def straight_walk():
             self.is_walking = False
             self.current_step = 0
             self.total_steps = 0
+            self.max_steps = 0
             self.target_distance = 0.0   # 목표 거리 (cm)
+            self.distance_reached = False
+            
+            # 보행 테이블 (crawl, 한 걸음 = 1/4 주기)
+            self.gait = 'crawl'
+            self.steps_per_cycle = 4
+            self.gait_table = self._create_gait_table()
+            
+            # IMU 자세 피드백 (공유 백그라운드 샘플러, 제어 틱마다 최신 샘플 사용)
+            self.imu_sampler = get_imu_sampler(self.motor_controller.actuator.clock).acquire('straight_walk')
+            self.attitude_gains = {'Kp': 0.5, 'Ki': 2.0}    # 기울기 1도당 보정 (도, 도/초)
+            self.max_attitude_correction = 5.0              # 관절 보정 한계 (도)
+            self.abort_inclination = 30.0                   # 보행 중단 기울기 (도)
+            self.attitude_correction = {'roll': 0.0, 'pitch': 0.0}
+            self._attitude_integral = {'roll': 0.0, 'pitch': 0.0}
+            self._corrected_pose = new_pose()
+            self._last_correction_time = None
+            
+            # 보행 보고 (방향 편차, 걸음별 보정 지연)
+            self.start_yaw = None
+            self.heading_drift = 0.0
+            self._step_latencies = []
+            self.step_reports = []
+            
+            # 다리 주행 거리계 (지지 다리 발 변위 적분, IMU yaw 혼합)
+            self.odometry = LegOdometry()
+            
+            # 방향 유지 (시작 방향 오차를 걸음마다 좌우 보폭 차이로 보정)
+            self.heading_controller = HeadingController()
             
-            # 보행 패턴 (4단계)
-            self.walking_pattern = self._create_walking_pattern()
+            # 제어 틱 스케줄러 (제어 주기 마감 시각 기준, 늦은 틱은 건너뜀)
+            actuator = self.motor_controller.actuator
+            self.scheduler = PeriodicScheduler(actuator.control_rate, actuator.clock, name='straight_walk')
+            
+            # 발 접촉 센서 (실제 FSR이 있을 때만 접촉 이벤트로 보행 위상 진행)
+            self.contact_sensor = FSRContactSensor(clock=actuator.clock)
+            if not self.contact_sensor.simulation_mode:
+                self.leg_controller.set_contact_sensor(self.contact_sensor)
+            
+            # 전방 장애물 (초음파 거리로 걸음 속도 조절, 정지 거리에서 보행 중단)
+            self.ultrasonic_sensor = UltrasonicSensor(clock=actuator.clock)
+            self.obstacle_planner = ObstaclePlanner(self.ultrasonic_sensor)
+            self.obstacle_stopped = False
             
             print("직선 보행 컨트롤러 초기화 완료")
         
-        def _create_walking_pattern(self):
-            """보행 패턴 생성"""
-            # 각 단계별 다리 움직임 정의
-            pattern = {
-                0: {  # 1단계: 앞왼쪽 다리 들어올리기
-                    'front_left': {'action': 'lift', 'height': self.step_height, 'angle': 0},
-                    'front_right': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_left': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_right': {'action': 'support', 'height': 0, 'angle': 0}
-                },
-                1: {  # 2단계: 앞왼쪽 다리 앞으로 이동
-                    'front_left': {'action': 'move_forward', 'height': self.step_height, 'angle': self.step_length},
-                    'front_right': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_left': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_right': {'action': 'support', 'height': 0, 'angle': 0}
-                },
-                2: {  # 3단계: 앞왼쪽 다리 내리기
-                    'front_left': {'action': 'place', 'height': 0, 'angle': self.step_length},
-                    'front_right': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_left': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_right': {'action': 'support', 'height': 0, 'angle': 0}
-                },
-                3: {  # 4단계: 다음 다리 준비
-                    'front_left': {'action': 'support', 'height': 0, 'angle': self.step_length},
-                    'front_right': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_left': {'action': 'support', 'height': 0, 'angle': 0},
-                    'back_right': {'action': 'support', 'height': 0, 'angle': 0}
-                }
-            }
-            return pattern
+        def _create_gait_table(self, turn=0.0):
+            """보행 테이블 생성 (보폭/높이/turn은 cm 단위 발 궤적, 역기구학으로 관절 각도 변환)"""
+            return get_gait_table(self.gait, self.step_length, self.step_height, turn=turn, cartesian=True)
         
         def start_walking(self, distance_cm=100.0, speed=1.0):
             """직선 보행 시작"""
@@ -73,13 +104,23 @@ def straight_walk():
             self.walking_speed = max(0.5, min(2.0, speed))
             self.step_interval = 0.3 / self.walking_speed
             
-            # 총 걸음 수 계산 (보폭 기준)
-            self.total_steps = int(distance_cm / self.step_length)
+            # 예상 걸음 수 (한 주기에 보폭/듀티 비만큼 전진), 실제 정지는 주행 거리계 추정 거리 기준
+            step_distance = stride_per_cycle(self.step_length, self.gait_table.duty_factor) / self.steps_per_cycle
+            self.total_steps = math.ceil(distance_cm / step_distance)
+            self.max_steps = self.total_steps * 2 + self.steps_per_cycle
+            self.distance_reached = False
+            self.obstacle_stopped = False
+            self.odometry.reset()
+            self.heading_controller.reset()
+            self.scheduler.reset_stats()
             
             print(f"직선 보행 시작: {distance_cm}cm, 속도: {self.walking_speed}, 총 걸음: {self.total_steps}")
             
             self.is_walking = True
+            self.leg_controller.is_walking = True
             self.current_step = 0
+            self._start_attitude_feedback()
+            self.ultrasonic_sensor.start()
             
             # 보행 루프 시작
             return self._walking_loop()
@@ -87,7 +128,8 @@ def straight_walk():
         def _walking_loop(self):
             """보행 루프"""
             try:
-                while self.is_walking and self.current_step < self.total_steps:
+                while (self.is_walking and not self.distance_reached and not self.obstacle_stopped
+                       and self.current_step < self.max_steps):
                     # 현재 보행 단계 실행
                     success = self._execute_walking_step()
                     
@@ -100,17 +142,25 @@ def straight_walk():
                     self.current_step += 1
                     
                     # 진행률 표시
-                    progress = (self.current_step / self.total_steps) * 100
-                    print(f"보행 진행률: {progress:.1f}% ({self.current_step}/{self.total_steps})")
-                    
-                    # 단계 간 지연
-                    time.sleep(self.step_interval)
+                    distance = self.odometry.get_pose().distance
+                    progress = min(distance / self.target_distance, 1.0) * 100 if self.target_distance > 0 else 100.0
+                    print(f"보행 진행률: {progress:.1f}% ({distance:.1f}/{self.target_distance}cm)")
+                
+                if self.obstacle_stopped:
+                    print(f"장애물 감지로 정지합니다 (거리: {self.obstacle_planner.decision.distance:.1f}cm)")
+                    self.stop_walking()
+                    return False
                 
-                if self.current_step >= self.total_steps:
+                if self.distance_reached:
                     print("목표 거리에 도달했습니다.")
                     self.stop_walking()
                     return True
                 
+                if self.current_step >= self.max_steps:
+                    print("최대 걸음 수를 넘었습니다. 추정 거리가 늘지 않아 보행을 중단합니다.")
+                    self.stop_walking()
+                    return False
+                
                 return True
                 
             except Exception as e:
@@ -119,16 +169,32 @@ def straight_walk():
                 return False
         
         def _execute_walking_step(self):
-            """보행 단계 실행"""
+            """보행 단계 실행 (보행 테이블의 1/4 주기를 step_interval 동안 재생)"""
             try:
-                # 현재 단계의 패턴 가져오기
-                step_pattern = self.walking_pattern[self.current_step % 4]
+                start_phase = self.current_step / self.steps_per_cycle
+                end_phase = (self.current_step + 1) / self.steps_per_cycle
+                cycle_time = self.step_interval * self.steps_per_cycle
                 
-                # 각 다리별 동작 실행
-                for leg_name, leg_action in step_pattern.items():
-                    success = self._execute_leg_action(leg_name, leg_action)
-                    if not success:
-                        return False
+                # 전방 거리에 따라 걸음 속도 조절 (정지/회피 판단은 제어 틱마다)
+                decision = self.obstacle_planner.update()
+                if decision.action in (STOP, TURN):
+                    self.obstacle_stopped = True
+                    return True
+                cycle_time /= decision.speed_scale
+                
+                # 방향 유지: 시작 방향 대비 편차를 좌우 보폭 차이로 보정 (정지 후 조향하지 않음)
+                turn = self.heading_controller.update(0.0, self.odometry.get_pose().heading, cycle_time,
+                                                      self.gait_table.duty_factor)
+                if turn != self.gait_table.turn:
+                    self.gait_table = self._create_gait_table(turn)
+                
+                self._step_latencies = []
+                if not self.leg_controller.play_gait(self.gait_table, start_phase, end_phase, cycle_time,
+                                                     pose_filter=self._control_tick, scheduler=self.scheduler):
+                    if self.motor_controller.actuator.stop_requested:
+                        print("비상 정지로 직선 보행이 취소되었습니다.")
+                        self.is_walking = False
+                    return False
                 
                 # 균형 보정
                 self._balance_adjustment()
@@ -139,54 +205,93 @@ def straight_walk():
                 print(f"보행 단계 실행 오류: {e}")
                 return False
         
-        def _execute_leg_action(self, leg_name, leg_action):
-            """다리 동작 실행"""
-            try:
-                action = leg_action['action']
-                height = leg_action['height']
-                angle = leg_action['angle']
-                
-                if action == 'lift':
-                    # 다리 들어올리기
-                    return self.leg_controller.move_elbow(leg_name, height)
-                
-                elif action == 'move_forward':
-                    # 다리 앞으로 이동
-                    hip_success = self.leg_controller.move_shoulder(leg_name, angle)
-                    knee_success = self.leg_controller.move_elbow(leg_name, height)
-                    return hip_success and knee_success
-                
-                elif action == 'place':
-                    # 다리 내리기
-                    return self.leg_controller.drop_leg(leg_name, 0)
-                
-                elif action == 'support':
-                    # 지지 상태 유지
-                    return True
-                
-                else:
-                    print(f"알 수 없는 다리 동작: {action}")
-                    return False
-                
-            except Exception as e:
-                print(f"다리 동작 실행 오류: {e}")
-                return False
+        def _start_attitude_feedback(self):
+            """보정 상태와 기준 방향 초기화"""
+            sample = self.imu_sampler.wait_for_sample()
+            self.start_yaw = sample.yaw if sample is not None else None
+            self.heading_drift = 0.0
+            self.step_reports = []
+            for axis in ('roll', 'pitch'):
+                self.attitude_correction[axis] = 0.0
+                self._attitude_integral[axis] = 0.0
+            self._last_correction_time = None
+        
+        def _control_tick(self, row, phase):
+            """제어 틱: 장애물 판단, 주행 거리계 갱신 (정지 거리/목표 거리 도달 시 None으로 구간 종료) 후 자세 보정 중첩"""
+            if self.obstacle_planner.update().action in (STOP, TURN):
+                self.obstacle_stopped = True
+                return None
+            
+            sample = self.imu_sampler.get_latest()
+            yaw = None
+            if sample is not None and self.start_yaw is not None:
+                yaw = sample.yaw - self.start_yaw
+            
+            odometry_pose = self.odometry.update(row, self.gait_table.contacts_at(phase), yaw)
+            if odometry_pose.distance >= self.target_distance:
+                self.distance_reached = True
+                return None
+            
+            if sample is None:
+                return row
+            return self._apply_attitude_correction(row, sample)
+        
+        def _apply_attitude_correction(self, row, sample):
+            """
+            제어 틱마다 최신 IMU 자세로 작은 몸체 자세 보정을 보행 행에 중첩 (PI, 관절 보정 한계 이내)
+            센서를 기다리지 않고 마지막 샘플만 사용하므로 프레임 예산 안에서 끝남
+            """
+            now = self.motor_controller.actuator.clock.now()
+            dt = 0.0 if self._last_correction_time is None else now - self._last_correction_time
+            self._last_correction_time = now
+            
+            limit = self.max_attitude_correction
+            for axis, error in (('roll', sample.roll), ('pitch', sample.pitch)):
+                # 적분 항은 한계 안에서만 누적 (와인드업 방지)
+                integral = self._attitude_integral[axis] + self.attitude_gains['Ki'] * error * dt
+                integral = max(-limit, min(limit, integral))
+                self._attitude_integral[axis] = integral
+                correction = self.attitude_gains['Kp'] * error + integral
+                self.attitude_correction[axis] = max(-limit, min(limit, correction))
+            
+            pose = self._corrected_pose
+            np.multiply(ROLL_OFFSETS, self.attitude_correction['roll'], out=pose)
+            pose += PITCH_OFFSETS * self.attitude_correction['pitch']
+            pose += row
+            clamp_pose(pose, out=pose)
+            
+            # 보정 지연: IMU 샘플 시각 → 보정 프레임 출력 시각
+            self._step_latencies.append(now - sample.timestamp)
+            return pose
         
         def _balance_adjustment(self):
-            """균형 보정"""
+            """걸음별 자세 보고 (방향 편차, 보정 지연), 큰 기울기는 보행 중단"""
             try:
-                # IMU 데이터 읽기 (시뮬레이션)
-                roll_error = 0.0  # 실제로는 IMU에서 읽어와야 함
-                pitch_error = 0.0
-                yaw_error = 0.0
+                sample = self.imu_sampler.get_latest()
+                if sample is None:
+                    return
                 
-                # 균형 보정 실행
-                if abs(roll_error) > 2.0 or abs(pitch_error) > 2.0:
-                    self.motor_controller.recover_balance(roll_error, pitch_error)
+                if self.start_yaw is not None:
+                    self.heading_drift = sample.yaw - self.start_yaw
                 
-                # 조향 보정
-                if abs(yaw_error) > 1.0:
-                    self.steering_controller.balance_for_two_legs(roll_error, pitch_error, yaw_error)
+                latencies = self._step_latencies
+                report = {
+                    'step': self.current_step,
+                    'roll': sample.roll,
+                    'pitch': sample.pitch,
+                    'heading_drift': self.heading_drift,
+                    'roll_correction': self.attitude_correction['roll'],
+                    'pitch_correction': self.attitude_correction['pitch'],
+                    'correction_count': len(latencies),
+                    'latency_mean_ms': sum(latencies) / len(latencies) * 1000.0 if latencies else 0.0,
+                    'latency_max_ms': max(latencies) * 1000.0 if latencies else 0.0
+                }
+                self.step_reports.append(report)
+                
+                # 보정 범위를 넘는 기울기는 보행을 멈추고 자세 복구에 맡김
+                if max(abs(sample.roll), abs(sample.pitch)) > self.abort_inclination:
+                    print(f"기울기 과다 (roll: {sample.roll:.1f}, pitch: {sample.pitch:.1f}), 보행을 중단합니다.")
+                    self.stop_walking()
                 
             except Exception as e:
                 print(f"균형 보정 오류: {e}")
@@ -198,7 +303,8 @@ def straight_walk():
                 return False
             
             self.is_walking = False
-            print("직선 보행 정지")
+            self.ultrasonic_sensor.stop()
+            print(f"직선 보행 정지 (방향 편차: {self.heading_drift:.2f}도)")
             
             # 모든 다리를 중립 위치로
             return self.leg_controller.stop_walking()
@@ -209,8 +315,8 @@ def straight_walk():
                 self.step_length = new_length_cm
                 print(f"보폭을 {new_length_cm}cm로 조정했습니다.")
                 
-                # 보행 패턴 재생성
-                self.walking_pattern = self._create_walking_pattern()
+                # 보행 테이블 재생성
+                self.gait_table = self._create_gait_table()
                 return True
             else:
                 print("보폭은 8.0cm ~ 20.0cm 범위 내에서 설정해야 합니다.")
@@ -229,22 +335,33 @@ def straight_walk():
         
         def get_walking_status(self):
             """보행 상태 정보 반환"""
+            odometry_pose = self.odometry.get_pose()
             return {
                 'is_walking': self.is_walking,
                 'current_step': self.current_step,
                 'total_steps': self.total_steps,
                 'target_distance': self.target_distance,
-                'progress_percentage': (self.current_step / self.total_steps * 100) if self.total_steps > 0 else 0,
+                'distance_travelled': odometry_pose.distance,
+                'odometry_pose': odometry_pose._asdict(),
+                'progress_percentage': min(odometry_pose.distance / self.target_distance * 100, 100.0) if self.target_distance > 0 else 0,
                 'step_length': self.step_length,
-                'walking_speed': self.walking_speed
+                'walking_speed': self.walking_speed,
+                'heading_drift': self.heading_drift,
+                'attitude_correction': self.attitude_correction.copy(),
+                'heading_control': self.heading_controller.get_status(),
+                'obstacle': self.obstacle_planner.get_status(),
+                'last_step_report': self.step_reports[-1] if self.step_reports else None,
+                'scheduler': self.scheduler.get_stats()
             }
         
         def emergency_stop(self):
-            """비상 정지"""
-            print("비상 정지 실행")
-            self.stop_walking()
-            self.motor_controller.emergency_stop()
-            return True
+            """비상 정지 (정지 지연 시간 ms 반환)"""
+            # 진행 중인 보행을 선점 취소하고 중립 자세를 일괄 출력
+            latency_ms = self.motor_controller.emergency_stop()
+            self.is_walking = False
+            self.leg_controller.is_walking = False
+            self.ultrasonic_sensor.stop()
+            return latency_ms
         
         def cleanup(self):
             """리소스 정리"""
@@ -252,6 +369,9 @@ def straight_walk():
             self.leg_controller.cleanup()
             self.motor_controller.cleanup()
             self.steering_controller.cleanup()
+            self.imu_sampler.release('straight_walk')
+            self.contact_sensor.cleanup()
+            self.ultrasonic_sensor.cleanup()
             print("직선 보행 컨트롤러 리소스 정리 완료")
     
     # 전역 인스턴스 생성
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# NewFile 모듈은 같은 디렉토리 기준으로 서로 import하므로 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,44 @@
+import pytest
+import actuator_manager
+from actuator_manager import get_actuator_manager
+from mock_servo_backend import MockServoBackend
+from control_clock import VirtualClock
+
+
+@pytest.fixture
+def fresh_manager(monkeypatch):
+    monkeypatch.setattr(actuator_manager, '_manager', None)
+    yield
+    manager = actuator_manager._manager
+    if manager is not None:
+        manager.servo_bus.cleanup()
+        actuator_manager._clear_actuator_manager(manager)
+
+
+def test_same_backend_kind_returns_shared_manager(fresh_manager):
+    manager = get_actuator_manager('simulation')
+    assert get_actuator_manager('simulation') is manager
+    assert get_actuator_manager() is manager
+
+
+def test_conflicting_backend_kind_raises(fresh_manager):
+    get_actuator_manager('simulation')
+    with pytest.raises(ValueError):
+        get_actuator_manager('pca9685')
+
+
+def test_backend_object_compared_by_identity(fresh_manager):
+    backend = MockServoBackend(clock=VirtualClock(speed=20))
+    manager = get_actuator_manager(backend)
+    assert get_actuator_manager(backend) is manager
+    with pytest.raises(ValueError):
+        get_actuator_manager(MockServoBackend(clock=VirtualClock(speed=20)))
+    with pytest.raises(ValueError):
+        get_actuator_manager('simulation')
+
+
+def test_fallback_keeps_requested_kind(fresh_manager):
+    # 하드웨어 모듈이 없으면 시뮬레이션으로 대체되지만 같은 종류 요청은 충돌이 아님
+    manager = get_actuator_manager('gpio')
+    assert manager.servo_bus.backend_kind == 'gpio'
+    assert get_actuator_manager('gpio') is manager
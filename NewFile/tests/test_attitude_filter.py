@@ -0,0 +1,91 @@
+import math
+import numpy as np
+import pytest
+from attitude_filter import ATTITUDE_FILTERS, AttitudeFilter, create_attitude_filter
+
+RATE = 100.0
+
+
+def tilted_accel(roll, pitch):
+    roll, pitch = math.radians(roll), math.radians(pitch)
+    return (-math.sin(pitch), math.sin(roll) * math.cos(pitch), math.cos(roll) * math.cos(pitch))
+
+
+def static_data(seconds, roll, pitch, gyro_bias=(0.5, -0.3, 0.4)):
+    count = int(seconds * RATE)
+    timestamps = np.arange(1, count + 1) / RATE
+    accel = np.tile(tilted_accel(roll, pitch), (count, 1))
+    gyro = np.tile(gyro_bias, (count, 1))
+    return timestamps, accel, gyro
+
+
+def test_attitude_filter_is_abstract():
+    with pytest.raises(TypeError):
+        AttitudeFilter()
+
+    class Incomplete(AttitudeFilter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize('name', sorted(ATTITUDE_FILTERS))
+@pytest.mark.parametrize('block', [False, True])
+def test_static_attitude_converges(name, block):
+    attitude_filter = create_attitude_filter(name, sample_rate=RATE)
+    # 수평에서 시작한 뒤 기울어진 채 정지 (자이로 영점 오차 포함)
+    attitude_filter.update(0.0, (0.0, 0.0, 1.0), (0.0, 0.0, 0.0))
+    timestamps, accel, gyro = static_data(30.0, roll=10.0, pitch=-5.0)
+    if block:
+        for start in range(0, len(timestamps), 50):
+            attitude_filter.update_arrays(timestamps[start:start + 50], accel[start:start + 50], gyro[start:start + 50])
+    else:
+        for row in range(len(timestamps)):
+            attitude_filter.update(timestamps[row], accel[row], gyro[row])
+
+    angles = attitude_filter.get_angles()
+    assert angles['roll'] == pytest.approx(10.0, abs=0.5)
+    assert angles['pitch'] == pytest.approx(-5.0, abs=0.5)
+    assert attitude_filter.gyro_bias == pytest.approx([0.5, -0.3, 0.4], abs=0.05)
+
+
+@pytest.mark.parametrize('name', sorted(ATTITUDE_FILTERS))
+def test_variable_dt_integrates_measured_interval(name):
+    attitude_filter = create_attitude_filter(name, sample_rate=RATE)
+    rng = np.random.default_rng(1)
+    # 불규칙한 샘플 간격으로 z축 20도/초 회전, yaw는 실제 경과 시간만큼만 증가
+    timestamps = 5.0 + np.cumsum(rng.uniform(0.002, 0.03, 200))
+    for timestamp in timestamps:
+        attitude_filter.update(timestamp, (0.0, 0.0, 1.0), (0.0, 0.0, 20.0))
+    elapsed = timestamps[-1] - timestamps[0] + 1.0 / RATE      # 첫 샘플은 공칭 dt
+    assert attitude_filter.yaw == pytest.approx(20.0 * elapsed, rel=0.02)
+
+
+@pytest.mark.parametrize('name', sorted(ATTITUDE_FILTERS))
+def test_non_positive_dt_does_not_integrate(name):
+    attitude_filter = create_attitude_filter(name, sample_rate=RATE)
+    attitude_filter.update(1.0, (0.0, 0.0, 1.0), (0.0, 0.0, 20.0))
+    yaw = attitude_filter.yaw
+
+    # 같은 시각, 거꾸로 간 시각: dt 0으로 처리
+    attitude_filter.update(1.0, (0.0, 0.0, 1.0), (0.0, 0.0, 20.0))
+    assert attitude_filter.last_dt == 0.0
+    attitude_filter.update(0.5, (0.0, 0.0, 1.0), (0.0, 0.0, 20.0))
+    assert attitude_filter.last_dt == 0.0
+    assert attitude_filter.yaw == pytest.approx(yaw)
+
+    # 묶음 경로도 같은 처리
+    timestamps = np.full(20, 0.5)
+    angles = attitude_filter.update_arrays(timestamps, np.tile((0.0, 0.0, 1.0), (20, 1)), np.tile((0.0, 0.0, 20.0), (20, 1)))
+    np.testing.assert_allclose(angles[:, 2], yaw)
+
+
+@pytest.mark.parametrize('name', sorted(ATTITUDE_FILTERS))
+def test_long_gap_is_limited_to_max_dt(name):
+    attitude_filter = create_attitude_filter(name, sample_rate=RATE)
+    attitude_filter.update(1.0, (0.0, 0.0, 1.0), (0.0, 0.0, 20.0))
+    yaw = attitude_filter.yaw
+    attitude_filter.update(11.0, (0.0, 0.0, 1.0), (0.0, 0.0, 20.0))
+    assert attitude_filter.last_dt == attitude_filter.max_dt
+    assert attitude_filter.yaw - yaw == pytest.approx(20.0 * attitude_filter.max_dt, rel=0.01)
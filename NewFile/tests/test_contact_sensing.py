@@ -0,0 +1,122 @@
+import pytest
+from contact_gait import ContactGaitClock
+from control_clock import VirtualClock
+from fsr_sensor import FakeSPIBus, FSRContactSensor, MCP3008, MCP3008_MAX_VALUE
+from gait_generator import get_gait_table
+from joint_pose import LEG_NAMES
+
+PRESSED = 300       # 0.29: 착지 임계값(0.25) 위
+BETWEEN = 200       # 0.20: 두 임계값 사이
+RELEASED = 100      # 0.10: 이륙 임계값(0.15) 아래
+
+
+def make_sensor(debounce_samples=2):
+    bus = FakeSPIBus()
+    sensor = FSRContactSensor(MCP3008(bus), sample_rate=500, debounce=debounce_samples / 500,
+                              clock=VirtualClock(speed=1.0, start=0.0))
+    return bus, sensor
+
+
+def feed(bus, sensor, values, samples):
+    """다리별 변환값을 설정하고 samples번 읽어 발생한 이벤트 목록 반환"""
+    for channel, value in zip(sensor.channels, values):
+        bus.set_value(channel, value)
+    events = []
+    for _ in range(samples):
+        events.extend(sensor.sample_once())
+    return events
+
+
+def test_touchdown_and_liftoff_use_hysteresis():
+    bus, sensor = make_sensor()
+    events = feed(bus, sensor, (PRESSED, 0, 0, 0), 2)
+    assert [(event.leg, event.kind) for event in events] == [('front_left', 'touchdown')]
+    assert events[0].force == pytest.approx(PRESSED / MCP3008_MAX_VALUE)
+
+    # 두 임계값 사이에서는 접촉 유지
+    assert feed(bus, sensor, (BETWEEN, 0, 0, 0), 10) == []
+    assert sensor.get_contacts()['front_left']
+
+    events = feed(bus, sensor, (RELEASED, 0, 0, 0), 2)
+    assert [(event.leg, event.kind) for event in events] == [('front_left', 'liftoff')]
+
+    # 이륙 후에는 두 임계값 사이여도 착지 아님
+    assert feed(bus, sensor, (BETWEEN, 0, 0, 0), 10) == []
+    assert not sensor.get_contacts()['front_left']
+
+
+def test_debounce_ignores_single_sample_glitch():
+    bus, sensor = make_sensor(debounce_samples=3)
+    for _ in range(5):
+        assert feed(bus, sensor, (PRESSED, 0, 0, 0), 2) == []      # 두 샘플 튐
+        assert feed(bus, sensor, (0, 0, 0, 0), 1) == []            # 연속 횟수 초기화
+    assert not sensor.contacts.any()
+
+    events = feed(bus, sensor, (PRESSED, PRESSED, 0, 0), 3)
+    assert sorted(event.leg for event in events) == ['front_left', 'front_right']
+    assert sensor.event_count == 2
+
+
+def test_sample_reads_all_feet_in_one_transfer_and_notifies_listeners():
+    bus, sensor = make_sensor(debounce_samples=1)
+    received = []
+    sensor.add_listener(received.append)
+    feed(bus, sensor, (PRESSED,) * len(LEG_NAMES), 1)
+    assert bus.transactions == [len(LEG_NAMES)]
+    assert [event.kind for event in received] == ['touchdown'] * len(LEG_NAMES)
+    assert sensor.events == received
+
+
+def make_clock(contacts):
+    """다리별 접촉 상태 (LEG_NAMES 순서)가 디바운스까지 반영된 FSR 센서로 위상 진행기 생성"""
+    bus, sensor = make_sensor(debounce_samples=1)
+    feed(bus, sensor, [PRESSED if contact else RELEASED for contact in contacts], 1)
+    return ContactGaitClock(sensor)
+
+
+def test_late_touchdown_holds_phase_until_timeout():
+    # trot: 위상 0.5에서 front_right/back_left가 착지할 차례인데 닿지 않음
+    table = get_gait_table('trot', 12.0, 8.0, cartesian=True)
+    clock = make_clock((False, False, False, False))
+    clock.reset(0.5, 0.0)
+
+    assert clock.advance(table, 0.05, 1.0) == 0.5
+    assert clock.advance(table, 0.15, 1.0) == 0.5
+    assert clock.get_stats()['late_touchdowns'] == 1
+    assert clock.get_stats()['held_time'] == pytest.approx(0.15)
+
+    # 최대 대기 시간이 지나면 다시 시간에 따라 진행
+    assert clock.advance(table, 0.25, 1.0) == pytest.approx(0.6)
+
+
+def test_sensed_touchdown_releases_hold():
+    table = get_gait_table('trot', 12.0, 8.0, cartesian=True)
+    bus, sensor = make_sensor(debounce_samples=1)
+    clock = ContactGaitClock(sensor)
+    clock.reset(0.5, 0.0)
+    assert clock.advance(table, 0.05, 1.0) == 0.5
+
+    feed(bus, sensor, (RELEASED, PRESSED, PRESSED, RELEASED), 1)
+    assert clock.advance(table, 0.07, 1.0) == pytest.approx(0.52)
+
+
+def test_early_touchdown_advances_phase():
+    # trot 위상 0.3: front_right/back_left 유각 진행률 0.6에 이미 닿음 → 착지 위상(0.5)으로 진행
+    table = get_gait_table('trot', 12.0, 8.0, cartesian=True)
+    clock = make_clock((True, True, True, True))
+    clock.reset(0.3, 0.0)
+
+    phase = clock.advance(table, 0.01, 1.0)
+    assert phase == pytest.approx(0.5)
+    stats = clock.get_stats()
+    assert stats['early_touchdowns'] == 1
+    assert stats['saved_time'] == pytest.approx(0.19)
+
+
+def test_touchdown_before_early_fraction_is_ignored():
+    # 유각 진행률 0.2: 아직 이른 착지로 인정하지 않음 (시간에 따라 진행)
+    table = get_gait_table('trot', 12.0, 8.0, cartesian=True)
+    clock = make_clock((True, True, True, True))
+    clock.reset(0.09, 0.0)
+    assert clock.advance(table, 0.01, 1.0) == pytest.approx(0.1)
+    assert clock.get_stats()['early_touchdowns'] == 0
@@ -0,0 +1,79 @@
+import time
+import pytest
+from actuator_manager import ActuatorManager
+from continuous_walk import ContinuousWalk
+from control_clock import VirtualClock
+from mock_servo_backend import MockServoBackend
+from obstacle_planner import ObstaclePlanner
+from servo_calibration import ServoCalibration
+from ultrasonic_sensor import DistanceReading
+
+
+class FakeLegController:
+    """연속 보행에 필요한 최소 다리 컨트롤러 (액추에이터와 관절 속도만)"""
+    movement_speed = 2.0
+
+    def __init__(self, actuator):
+        self.actuator = actuator
+
+
+class SettableDistanceSensor:
+    """설정한 거리를 항상 새 측정값으로 돌려주는 초음파 센서"""
+    def __init__(self, clock, distance):
+        self.clock = clock
+        self.distance = distance
+
+    def get_reading(self):
+        return DistanceReading(self.clock.now(), self.distance, self.distance)
+
+
+@pytest.fixture
+def walk():
+    backend = MockServoBackend(clock=VirtualClock(speed=10))
+    manager = ActuatorManager(backend, calibration=ServoCalibration())
+    actuator = manager.acquire('test_continuous_walk')
+    sensor = SettableDistanceSensor(actuator.clock, 150.0)
+    walk = ContinuousWalk(FakeLegController(actuator), obstacle_planner=ObstaclePlanner(sensor))
+    yield walk, sensor
+    walk.stop(timeout=1.0)
+    actuator.release()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.002)
+    return True
+
+
+def test_stop_mid_cycle_stands_without_finishing_cycle(walk):
+    walk, sensor = walk
+    walk.set_velocity(1.0)
+    walk.start()
+    assert wait_for(lambda: walk.cycle_count >= 2 and 0.3 < walk.phase < 0.6)
+
+    cycles = walk.cycle_count
+    sensor.distance = 10.0
+    assert wait_for(lambda: walk.obstacle_abort_count == 1)
+    assert walk.cycle_count == cycles
+    assert 0.3 < walk.phase < 1.0
+
+    # 서기로 전환 후 막혀 있는 동안 전진 주기를 다시 시작하지 않음
+    assert wait_for(lambda: walk.current_table is not None and walk.current_table.step_length == 0.0)
+    time.sleep(0.2)
+    assert walk.cycle_count == cycles
+    assert walk.running
+
+
+def test_slow_applies_at_next_cycle(walk):
+    walk, sensor = walk
+    walk.set_velocity(1.0)
+    walk.start()
+    assert wait_for(lambda: walk.cycle_count >= 1)
+    full_step = walk.current_table.step_length
+
+    sensor.distance = 40.0
+    assert wait_for(lambda: walk.current_table.step_length < full_step)
+    assert walk.obstacle_abort_count == 0
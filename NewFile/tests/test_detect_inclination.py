@@ -0,0 +1,72 @@
+import pytest
+from control_clock import VirtualClock
+from detect_inclination import (
+    ACCEL_XOUT_H, BURST_LENGTH, CALIBRATION_SAMPLES, BodyDetectInclination, FakeMPU6050Bus, _burst_decode, _legacy_decode,
+    temperature_from_raw
+)
+from imu_calibration import IMUCalibrationCache
+
+GYRO_XOUT_H = 0x43
+TEMP_OUT_H = 0x41
+
+
+def make_sensor(bus):
+    return BodyDetectInclination(bus, calibration_cache=IMUCalibrationCache(path=None),
+                                 clock=VirtualClock(speed=1000))
+
+
+def read_word(bus, register):
+    msb, lsb = bus.read_i2c_block_data(0x68, register, 2)
+    value = (msb << 8) | lsb
+    return value - 65536 if value > 32767 else value
+
+
+@pytest.mark.parametrize('accel, gyro, temperature', [
+    ((0, 0, 16384), (0, 0, 0), 25.0),
+    ((-1200, 850, -16100), (-32768, 25, 32767), 31.0),
+])
+def test_burst_frame_matches_per_register_reads(accel, gyro, temperature):
+    bus = FakeMPU6050Bus()
+    bus.set_sample(accel=accel, gyro=gyro, temperature=temperature)
+
+    frame = bus.read_i2c_block_data(0x68, ACCEL_XOUT_H, BURST_LENGTH)
+    burst_accel, burst_gyro = _burst_decode(frame)
+
+    per_register_accel = {axis: read_word(bus, ACCEL_XOUT_H + 2 * index) for index, axis in enumerate('xyz')}
+    per_register_gyro = {axis: read_word(bus, GYRO_XOUT_H + 2 * index) for index, axis in enumerate('xyz')}
+    assert burst_accel == per_register_accel
+    assert burst_gyro == per_register_gyro
+
+    legacy = _legacy_decode(bus.read_i2c_block_data(0x68, ACCEL_XOUT_H, 6),
+                            bus.read_i2c_block_data(0x68, GYRO_XOUT_H, 6))
+    assert (burst_accel, burst_gyro) == legacy
+    assert temperature_from_raw(read_word(bus, TEMP_OUT_H)) == pytest.approx(temperature, abs=0.01)
+
+
+def test_raw_sample_uses_one_burst_transaction():
+    bus = FakeMPU6050Bus()
+    sensor = make_sensor(bus)
+    bus.set_sample(accel=(100, -200, 16000), gyro=(5, -6, 7), temperature=28.0)
+    bus.transactions.clear()
+
+    accel, gyro, temperature = sensor._read_raw_sample()
+    assert bus.transactions == [('read_block', ACCEL_XOUT_H, BURST_LENGTH)]
+    assert accel == {'x': 100, 'y': -200, 'z': 16000}
+    assert gyro == {'x': 5, 'y': -6, 'z': 7}
+    assert temperature == pytest.approx(28.0, abs=0.01)
+
+
+def test_sensor_waits_on_injected_clock():
+    class RecordingClock(VirtualClock):
+        def __init__(self):
+            super().__init__(speed=1000)
+            self.sleeps = []
+
+        def sleep(self, seconds):
+            self.sleeps.append(seconds)
+
+    clock = RecordingClock()
+    BodyDetectInclination(FakeMPU6050Bus(), calibration_cache=IMUCalibrationCache(path=None), clock=clock)
+    # 웨이크업 대기 + 보정 샘플 간격
+    assert clock.sleeps[0] == 0.1
+    assert len(clock.sleeps) == 1 + CALIBRATION_SAMPLES
@@ -0,0 +1,68 @@
+import threading
+import numpy as np
+import pytest
+from actuator_manager import ActuatorManager, EMERGENCY_STOP_BUDGET_MS
+from control_clock import VirtualClock
+from joint_pose import new_pose
+from mock_servo_backend import MockServoBackend
+from joint_pose import JOINT_COUNT
+from servo_calibration import ServoCalibration, PULSE_CENTER_US
+
+
+@pytest.fixture
+def manager():
+    backend = MockServoBackend(clock=VirtualClock(speed=20))
+    manager = ActuatorManager(backend, calibration=ServoCalibration())
+    yield manager
+    if manager.trajectory is not None:
+        manager.trajectory.stop()
+    manager.servo_bus.cleanup()
+
+
+def test_emergency_stop_latency_within_budget(manager):
+    # 궤적 실행 중에 비상 정지
+    assert manager.move_pose(new_pose(30.0), speed_factor=0.2)
+    manager.clock.sleep(0.2)
+
+    latencies = []
+    for _ in range(20):
+        manager.clear_emergency_stop()
+        manager.move_pose(new_pose(-30.0), speed_factor=0.2)
+        latencies.append(manager.emergency_stop())
+
+    assert max(latencies) < EMERGENCY_STOP_BUDGET_MS
+    assert manager.last_stop_latency_ms == latencies[-1]
+
+
+def test_emergency_stop_commands_neutral_in_one_frame(manager):
+    manager.write_pose(new_pose(20.0))
+    backend = manager.servo_bus.backend
+    command_count = len(backend.commands)
+
+    manager.emergency_stop()
+
+    _, channels, pulses = backend.commands[command_count]
+    assert len(backend.commands) == command_count + 1
+    assert len(channels) == JOINT_COUNT
+    np.testing.assert_allclose(pulses, PULSE_CENTER_US, atol=1.0)
+
+
+def test_emergency_stop_blocks_writes_and_wakes_waiters(manager):
+    woke = threading.Event()
+
+    def sequence():
+        # 긴 단계 대기 중 비상 정지가 오면 즉시 깨어나야 함
+        if manager.wait(60.0):
+            woke.set()
+
+    thread = threading.Thread(target=sequence)
+    thread.start()
+    manager.emergency_stop()
+    thread.join(1.0)
+
+    assert woke.is_set()
+    assert not manager.write_pose(new_pose(10.0))
+    assert not manager.move_pose(new_pose(10.0))
+
+    manager.clear_emergency_stop()
+    assert manager.write_pose(new_pose(10.0))
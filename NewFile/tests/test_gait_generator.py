@@ -0,0 +1,33 @@
+import pytest
+from gait_generator import get_gait_table, stride_per_cycle, turn_for_yaw_rate, yaw_rate_for_turn
+from leg_odometry import LegOdometry
+
+
+def run_cycles(table, cycles=2):
+    """보행 테이블을 주행 거리계에 cycles 주기만큼 통과시킨 추정 위치"""
+    odometry = LegOdometry(yaw_weight=0.0)
+    for index in range(cycles * table.samples + 1):
+        row = index % table.samples
+        odometry.update(table.poses[row], table.contacts[row])
+    return odometry.get_pose()
+
+
+@pytest.mark.parametrize('gait', ['crawl', 'trot'])
+def test_stride_per_cycle_matches_odometry(gait):
+    table = get_gait_table(gait, 6.0, 3.0, cartesian=True)
+    pose = run_cycles(table)
+    assert pose.distance / 2 == pytest.approx(stride_per_cycle(6.0, table.duty_factor), rel=0.01)
+
+
+@pytest.mark.parametrize('gait', ['crawl', 'trot'])
+def test_yaw_rate_for_turn_matches_odometry(gait):
+    cycle_time = 1.2
+    table = get_gait_table(gait, 0.0, 3.0, turn=1.0, cartesian=True)
+    pose = run_cycles(table)
+    realised_rate = pose.heading / 2 / cycle_time
+    assert yaw_rate_for_turn(1.0, cycle_time, table.duty_factor) == pytest.approx(realised_rate, rel=0.02)
+
+
+def test_turn_for_yaw_rate_round_trip():
+    turn = turn_for_yaw_rate(20.0, 1.2, 0.75)
+    assert yaw_rate_for_turn(turn, 1.2, 0.75) == pytest.approx(20.0)
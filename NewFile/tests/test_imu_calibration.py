@@ -0,0 +1,90 @@
+import json
+import time
+import pytest
+from control_clock import VirtualClock
+from detect_inclination import ACCEL_XOUT_H, BURST_LENGTH, BodyDetectInclination, FakeMPU6050Bus
+from imu_calibration import IMUCalibrationCache
+
+SENSOR_ID = 'mpu6050-test'
+
+
+def make_sensor(path, temperature=30.0, sensor_id=SENSOR_ID, **cache_options):
+    bus = FakeMPU6050Bus()
+    bus.set_sample(accel=(120, -80, 16500), gyro=(40, -25, 12), temperature=temperature)
+    sensor = BodyDetectInclination(bus, calibration_cache=IMUCalibrationCache(path, **cache_options),
+                                   sensor_id=sensor_id, clock=VirtualClock(speed=1000))
+    return bus, sensor
+
+
+def burst_reads(bus):
+    return sum(1 for kind, register, length in bus.transactions
+               if kind == 'read_block' and register == ACCEL_XOUT_H and length == BURST_LENGTH)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    path = str(tmp_path / 'imu_calibration.json')
+    _, sensor = make_sensor(path)
+    assert sensor.calibration_info['source'] == 'calibration'
+    return path
+
+
+def test_saved_cache_skips_recalibration(cache_path):
+    with open(cache_path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert SENSOR_ID in saved
+
+    bus, sensor = make_sensor(cache_path, temperature=31.0)
+    assert sensor.calibration_info['source'] == 'cache'
+    assert burst_reads(bus) == 1        # 온도 확인 한 번만 읽음
+    assert sensor.calibrated_offsets['gyro'] == pytest.approx({'x': 40.0, 'y': -25.0, 'z': 12.0})
+    assert sensor.calibrated_offsets['accel']['z'] == pytest.approx(16500 - sensor.accel_scale)
+
+
+@pytest.mark.parametrize('options', [
+    {'temperature': 45.0},                  # 다른 온도 구간
+    {'sensor_id': 'mpu6050-other'},         # 다른 센서
+])
+def test_mismatched_cache_recalibrates(cache_path, options):
+    bus, sensor = make_sensor(cache_path, **options)
+    assert sensor.calibration_info['source'] == 'calibration'
+    assert burst_reads(bus) > 1
+
+
+def test_stale_cache_recalibrates(cache_path):
+    with open(cache_path, encoding='utf-8') as f:
+        saved = json.load(f)
+    for entry in saved[SENSOR_ID].values():
+        entry['updated'] = time.time() - 3600.0
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(saved, f)
+
+    _, sensor = make_sensor(cache_path, max_age=60.0)
+    assert sensor.calibration_info['source'] == 'calibration'
+    _, sensor = make_sensor(cache_path, max_age=None)
+    assert sensor.calibration_info['source'] == 'cache'
+
+
+def test_malformed_entry_is_rejected(cache_path):
+    with open(cache_path, encoding='utf-8') as f:
+        saved = json.load(f)
+    for entry in saved[SENSOR_ID].values():
+        del entry['gyro']
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(saved, f)
+
+    _, sensor = make_sensor(cache_path)
+    assert sensor.calibration_info['source'] == 'calibration'
+
+
+@pytest.mark.parametrize('content', ['{"mpu6050-test": {"30": ', '[1, 2, 3]'])
+def test_corrupt_cache_falls_back_to_calibration(tmp_path, content):
+    path = str(tmp_path / 'imu_calibration.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    _, sensor = make_sensor(path)
+    assert sensor.calibration_info['source'] == 'calibration'
+    # 새 보정값으로 올바른 캐시를 다시 저장
+    _, sensor = make_sensor(path)
+    assert sensor.calibration_info['source'] == 'cache'
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+import imu_sampler
+from detect_inclination import (
+    BodyDetectInclination, FakeMPU6050Bus, FIFO_COLUMNS, FIFO_SIZE, BURST_LENGTH, USER_CTRL, USER_CTRL_FIFO_EN
+)
+from control_clock import VirtualClock
+from imu_calibration import IMUCalibrationCache
+from imu_sampler import IMUSampler, get_imu_sampler
+
+TEMPERATURE_RAW = int(round((30.0 - 36.53) * 340.0))
+
+
+def make_sensor():
+    bus = FakeMPU6050Bus()
+    sensor = BodyDetectInclination(bus, calibration_cache=IMUCalibrationCache(path=None),
+                                   clock=VirtualClock(speed=1000))
+    assert sensor.enable_fifo()
+    return bus, sensor
+
+
+def raw_samples(count, accel=(0, 0, 16384), gyro=(0, 0, 0)):
+    return np.tile([*accel, TEMPERATURE_RAW, *gyro], (count, 1))
+
+
+def test_enable_fifo_turns_on_sensor_fifo():
+    bus, sensor = make_sensor()
+    assert bus.registers[USER_CTRL] & USER_CTRL_FIFO_EN
+    assert sensor.fifo_enabled
+
+
+def test_read_fifo_block_decodes_and_timestamps_samples():
+    bus, sensor = make_sensor()
+    bus.push_fifo(raw_samples(10, accel=(1638, -1638, 16384), gyro=(131, -262, 655)))
+    block = sensor.read_fifo_block(now=50.0)
+
+    assert block.shape == (10, len(FIFO_COLUMNS))
+    period = 1.0 / sensor.sample_rate
+    np.testing.assert_allclose(np.diff(block[:, 0]), period)
+    assert block[-1, 0] == pytest.approx(50.0)
+    np.testing.assert_allclose(block[:, 1:4], [[0.1, -0.1, 1.0]] * 10, atol=1e-3)
+    np.testing.assert_allclose(block[:, 4:7], [[1.0, -2.0, 5.0]] * 10, atol=1e-9)
+    np.testing.assert_allclose(block[:, 7], 30.0, atol=0.01)
+
+
+def test_consecutive_blocks_continue_timestamps():
+    bus, sensor = make_sensor()
+    period = 1.0 / sensor.sample_rate
+    bus.push_fifo(raw_samples(5))
+    first = sensor.read_fifo_block(now=10.0)
+    bus.push_fifo(raw_samples(5))
+    second = sensor.read_fifo_block(now=10.0 + 5 * period + 0.003)
+
+    # 꺼낸 시각이 조금 늦어도 샘플 주기 간격을 유지
+    assert second[0, 0] - first[-1, 0] == pytest.approx(period)
+
+
+def test_fifo_overflow_resets_and_recovers():
+    bus, sensor = make_sensor()
+    bus.push_fifo(raw_samples(FIFO_SIZE // BURST_LENGTH + 5))
+    block = sensor.read_fifo_block(now=1.0)
+
+    assert len(block) == 0
+    assert sensor.fifo_overflow_count == 1
+    assert len(bus.fifo) == 0
+
+    bus.push_fifo(raw_samples(4))
+    assert len(sensor.read_fifo_block(now=1.1)) == 4
+
+
+def test_partial_sample_bytes_stay_in_fifo():
+    bus, sensor = make_sensor()
+    bus.push_fifo(raw_samples(3))
+    del bus.fifo[-4:]                   # 마지막 샘플이 아직 덜 쌓인 상태
+    assert len(sensor.read_fifo_block(now=1.0)) == 2
+    assert len(bus.fifo) == BURST_LENGTH - 4
+
+
+def test_process_block_filters_whole_block():
+    bus, sensor = make_sensor()
+    # roll 약 10도 정지 자세
+    angle = np.radians(10.0)
+    accel = (0, int(16384 * np.sin(angle)), int(16384 * np.cos(angle)))
+    for step in range(20):
+        bus.push_fifo(raw_samples(20, accel=accel))
+        angles = sensor.process_block(sensor.read_fifo_block(now=1.0 + 0.2 * step))
+
+    assert angles.shape == (20, 3)
+    assert sensor.filtered_angles['roll'] == pytest.approx(10.0, abs=0.5)
+    assert abs(sensor.filtered_angles['pitch']) < 0.5
+    assert sensor.process_block(np.empty((0, len(FIFO_COLUMNS)))).shape == (0, 3)
+
+
+def test_sampler_block_appends_every_fifo_sample():
+    bus, sensor = make_sensor()
+    sampler = IMUSampler(sensor, use_fifo=True)
+    bus.push_fifo(raw_samples(30))
+    assert sampler.sample_block() == 30
+    assert sampler.sample_count == 30
+    assert len(sampler.get_window()) == 30
+    assert sampler.latest is not None
+
+
+class NoFIFOSensor:
+    """FIFO 설정이 실패하는 센서 (폴링 대체 확인용)"""
+    sample_rate = 100
+
+    def __init__(self):
+        self.reads = 0
+
+    def enable_fifo(self):
+        return False
+
+    def disable_fifo(self):
+        pass
+
+    def read_gyro(self):
+        self.reads += 1
+        return {'angles': {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0},
+                'gyro_rates': {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0}}
+
+    def cleanup(self):
+        pass
+
+
+def test_sampler_falls_back_to_polling_when_fifo_fails():
+    sensor = NoFIFOSensor()
+    sampler = IMUSampler(sensor, use_fifo=True)
+    assert sampler.use_fifo
+    sampler.start()
+    assert sampler.wait_for_sample(1.0) is not None
+    sampler.stop()
+    assert not sampler.use_fifo
+    assert sensor.reads > 0
+
+
+def test_shared_sampler_uses_fifo_by_default(monkeypatch):
+    monkeypatch.setattr(imu_sampler, '_sampler', None)
+    sampler = get_imu_sampler()
+    try:
+        assert sampler.use_fifo
+        assert get_imu_sampler() is sampler
+    finally:
+        sampler.cleanup()
+        imu_sampler._clear_imu_sampler(sampler)
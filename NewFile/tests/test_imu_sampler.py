@@ -0,0 +1,95 @@
+import threading
+import numpy as np
+import pytest
+from imu_sampler import IMUSampler, HISTORY_COLUMNS
+
+
+class StillSensor:
+    """정지 자세만 돌려주는 센서"""
+    sample_rate = 100
+
+    def read_gyro(self):
+        return {'angles': {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0},
+                'gyro_rates': {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0}}
+
+    def cleanup(self):
+        pass
+
+
+def make_sampler(history=1.0):
+    return IMUSampler(StillSensor(), sample_rate=100, history=history)
+
+
+def counter_rows(start, count):
+    """모든 열이 일련번호인 행 (시각 열도 일련번호)"""
+    values = np.arange(start, start + count, dtype=np.float64)
+    return np.repeat(values[:, None], len(HISTORY_COLUMNS), axis=1)
+
+
+def test_window_wraps_around_in_order():
+    sampler = make_sampler()
+    capacity = len(sampler.history)
+    for start in range(0, capacity * 3 + 7, 7):
+        sampler._append(counter_rows(start, 7))
+
+    window = sampler.get_window()
+    assert len(window) == capacity
+    np.testing.assert_array_equal(np.diff(window[:, 0]), 1.0)
+    assert window[-1, 0] == sampler.write_count - 1
+
+
+def test_block_larger_than_buffer_keeps_latest_rows():
+    sampler = make_sampler()
+    capacity = len(sampler.history)
+    sampler._append(counter_rows(0, capacity * 2 + 3))
+    window = sampler.get_window()
+    np.testing.assert_array_equal(window[:, 0], np.arange(capacity + 3, capacity * 2 + 3))
+
+
+def test_window_duration_and_average():
+    sampler = make_sampler()
+    sampler._append(counter_rows(0, 50))
+    window = sampler.get_window(duration=9.0)
+    np.testing.assert_array_equal(window[:, 0], np.arange(40, 50))
+    average = sampler.get_average(9.0)
+    assert average.timestamp == 49.0
+    assert average.roll == pytest.approx(44.5)
+
+
+def test_empty_window():
+    sampler = make_sampler()
+    assert len(sampler.get_window()) == 0
+    assert sampler.get_average(1.0) is None
+
+
+def test_snapshot_consistent_with_large_concurrent_blocks():
+    sampler = make_sampler(history=2.0)
+    capacity = len(sampler.history)
+    block = capacity // 2 + 11          # 한 번에 버퍼 절반 넘게 쓰는 묶음
+    stop = threading.Event()
+
+    def writer():
+        start = 0
+        while not stop.is_set():
+            sampler._append(counter_rows(start, block))
+            start += block
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            window = sampler.get_window()
+            if len(window) > 1:
+                # 찢어진 복사면 일련번호가 끊기거나 행 안의 열 값이 달라짐
+                np.testing.assert_array_equal(np.diff(window[:, 0]), 1.0)
+                assert (window == window[:, :1]).all()
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_sample_once_publishes_latest():
+    sampler = make_sampler()
+    sample = sampler.sample_once()
+    assert sampler.get_latest() is sample
+    assert sampler.get_status()['history_length'] == 1
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from joint_pose import ANGLE_MIN, ANGLE_MAX, JOINT_COUNT, LEG_NAMES
+from leg_kinematics import (
+    forward_kinematics, inverse_kinematics, CachedLegIK, ANKLE_INDEX, NEUTRAL_FEET
+)
+
+TOLERANCE = 1e-6
+
+
+@pytest.fixture
+def random_poses():
+    """관절 제한 안의 무작위 자세 (발목은 발 위치에 영향이 없으므로 0)"""
+    rng = np.random.default_rng(0)
+    pose = rng.uniform(ANGLE_MIN, ANGLE_MAX, size=(20000, JOINT_COUNT))
+    pose[:, ANKLE_INDEX] = 0.0
+    return pose
+
+
+def test_round_trip_joint_and_position_error(random_poses):
+    feet = forward_kinematics(random_poses)
+    solved, reachable = inverse_kinematics(feet)
+
+    assert reachable.all()
+    assert np.abs(solved - random_poses).max() < TOLERANCE
+    assert np.abs(forward_kinematics(solved) - feet).max() < TOLERANCE
+
+
+def test_neutral_pose_round_trip():
+    solved, reachable = inverse_kinematics(NEUTRAL_FEET)
+    assert reachable.all()
+    np.testing.assert_allclose(solved, 0.0, atol=TOLERANCE)
+
+
+def test_batch_shape_and_ankle_passthrough(random_poses):
+    feet = forward_kinematics(random_poses[:24]).reshape(2, 3, 4, len(LEG_NAMES), 2)
+    ankle = np.full((2, 3, 4, len(LEG_NAMES)), 5.0)
+    solved, reachable = inverse_kinematics(feet, ankle)
+    assert solved.shape == (2, 3, 4, JOINT_COUNT)
+    assert reachable.shape == (2, 3, 4, len(LEG_NAMES))
+    np.testing.assert_allclose(solved[..., ANKLE_INDEX], 5.0)
+
+
+def test_ankle_does_not_move_foot(random_poses):
+    # 2자유도 시상면 모델: 발목 각도는 발 위치에 영향이 없고, 역기구학의 힙/무릎 해도 바꾸지 않음
+    rng = np.random.default_rng(1)
+    tilted = random_poses[:1000].copy()
+    tilted[:, ANKLE_INDEX] = rng.uniform(-20.0, 20.0, size=(1000, len(LEG_NAMES)))
+    np.testing.assert_array_equal(forward_kinematics(tilted), forward_kinematics(random_poses[:1000]))
+
+    feet = forward_kinematics(tilted)
+    plain, _ = inverse_kinematics(feet)
+    solved, _ = inverse_kinematics(feet, tilted[:, ANKLE_INDEX])
+    np.testing.assert_array_equal(np.delete(solved, ANKLE_INDEX, axis=-1), np.delete(plain, ANKLE_INDEX, axis=-1))
+    np.testing.assert_allclose(solved, tilted, atol=TOLERANCE)
+
+
+def test_unreachable_target_is_flagged():
+    feet = NEUTRAL_FEET.copy()
+    feet[0] = [0.0, -40.0]          # 다리 길이 합(22cm)보다 먼 목표
+    _, reachable = inverse_kinematics(feet)
+    assert not reachable[0]
+    assert reachable[1:].all()
+
+
+def test_cached_solution_matches_exact_solve(random_poses):
+    feet = forward_kinematics(random_poses[:1000])
+    cached_ik = CachedLegIK()
+    cached_pose, cached_reachable = cached_ik.solve(feet)
+
+    # 캐시 해는 격자 중심점의 정확한 해와 같고, 위치 오차는 양자화 오차 이내
+    quantised = np.rint(feet / cached_ik.resolution) * cached_ik.resolution
+    exact_pose, exact_reachable = inverse_kinematics(quantised)
+    np.testing.assert_allclose(cached_pose, exact_pose, atol=TOLERANCE)
+    np.testing.assert_array_equal(cached_reachable, exact_reachable)
+    assert np.abs(forward_kinematics(cached_pose) - feet).max() < cached_ik.resolution * 2
+
+
+def test_cache_hit_returns_same_solution(random_poses):
+    cached_ik = CachedLegIK()
+    feet = np.rint(forward_kinematics(random_poses[:500]) / cached_ik.resolution) * cached_ik.resolution
+    first_pose, first_reachable = cached_ik.solve(feet)
+    misses = cached_ik.misses
+    hits = cached_ik.hits
+
+    # 같은 격자 칸 안에서 조금 움직인 목표는 모두 캐시 적중, 격자 중심점의 정확한 해를 반환
+    shifted_pose, shifted_reachable = cached_ik.solve(feet + cached_ik.resolution * 0.2)
+    assert cached_ik.misses == misses
+    assert cached_ik.hits == hits + feet.shape[0] * len(LEG_NAMES)
+    np.testing.assert_array_equal(shifted_pose, first_pose)
+    np.testing.assert_array_equal(shifted_reachable, first_reachable)
+
+    exact_pose, _ = inverse_kinematics(feet)
+    np.testing.assert_allclose(shifted_pose, exact_pose, atol=TOLERANCE)
+
+
+def test_cache_clears_when_full(random_poses):
+    cached_ik = CachedLegIK(max_entries=100)
+    cached_ik.solve(forward_kinematics(random_poses[:200]))
+    assert len(cached_ik.cache) <= 800
+    cached_ik.solve(forward_kinematics(random_poses[200:210]))
+    assert len(cached_ik.cache) <= 100
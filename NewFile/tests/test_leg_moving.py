@@ -0,0 +1,45 @@
+import pytest
+from actuator_manager import ActuatorManager
+from control_clock import VirtualClock
+from gait_generator import get_gait_table
+from leg_moving import LegMoving
+from mock_servo_backend import MockServoBackend
+from servo_calibration import ServoCalibration
+
+
+@pytest.fixture
+def legs():
+    manager = ActuatorManager(MockServoBackend(clock=VirtualClock(speed=20)), calibration=ServoCalibration())
+    legs = LegMoving(actuator=manager.acquire('leg'))
+    legs.is_walking = True
+    yield legs
+    legs.is_walking = False
+    legs.cleanup()
+
+
+def count_moves(legs, monkeypatch):
+    moves = []
+    manager = legs.actuator.manager
+    move_pose = manager.move_pose
+    monkeypatch.setattr(manager, 'move_pose', lambda *args, **kwargs: moves.append(args) or move_pose(*args, **kwargs))
+    return moves
+
+
+def test_consecutive_segments_skip_move_to_start(legs, monkeypatch):
+    moves = count_moves(legs, monkeypatch)
+    table = get_gait_table('crawl', 12.0, 8.0, cartesian=True)
+
+    # 첫 구간만 시작 자세로 이동, 이어지는 구간은 이미 시작 자세이므로 바로 재생
+    for step in range(4):
+        assert legs.play_gait(table, step / 4, (step + 1) / 4, 0.8)
+    assert len(moves) == 1
+    assert abs(legs.actuator.get_pose() - table.pose_at(1.0)).max() <= legs.actuator.write_deadband
+
+
+def test_segment_moves_when_pose_differs(legs, monkeypatch):
+    moves = count_moves(legs, monkeypatch)
+    table = get_gait_table('crawl', 12.0, 8.0, cartesian=True)
+    assert legs.play_gait(table, 0.0, 0.25, 0.8)
+    # 다른 위상에서 시작하면 다시 이동 후 재생
+    assert legs.play_gait(table, 0.5, 0.75, 0.8)
+    assert len(moves) == 2
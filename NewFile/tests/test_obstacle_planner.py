@@ -0,0 +1,87 @@
+from obstacle_planner import ObstaclePlanner, GO, SLOW, STOP, TURN
+from ultrasonic_sensor import UltrasonicSensor, MockEchoInterface, ULTRASONIC_MIN_DISTANCE
+
+
+class ManualClock:
+    """테스트에서 직접 진행시키는 시계"""
+    def __init__(self):
+        self.time = 100.0
+
+    def now(self):
+        return self.time
+
+
+def make_planner(distance, turn_direction=None):
+    clock = ManualClock()
+    interface = MockEchoInterface(distance=distance)
+    sensor = UltrasonicSensor(interface=interface, clock=clock)
+    planner = ObstaclePlanner(sensor, turn_direction=turn_direction)
+    return clock, interface, sensor, planner
+
+
+def measure(sensor, clock, count):
+    for _ in range(count):
+        clock.time += 1.0 / sensor.sample_rate
+        sensor.measure_once()
+
+
+def test_clear_path_goes():
+    clock, _, sensor, planner = make_planner(150.0)
+    measure(sensor, clock, 5)
+    assert planner.update().action == GO
+
+
+def test_dropout_keeps_stop_and_does_not_refresh_timestamp():
+    clock, interface, sensor, planner = make_planner(10.0)
+    measure(sensor, clock, 5)
+    assert planner.update().action == STOP
+    last_valid = sensor.get_reading().timestamp
+
+    interface.dropout = 1.0
+    for _ in range(40):
+        measure(sensor, clock, 1)
+        assert planner.update().action == STOP
+    reading = sensor.get_reading()
+    assert reading.distance is None
+    assert reading.raw is None
+    assert reading.timestamp == last_valid
+    assert sensor.timeout_count == 40
+
+
+def test_dropout_before_any_echo_is_not_clear():
+    clock, interface, sensor, planner = make_planner(150.0)
+    interface.dropout = 1.0
+    measure(sensor, clock, 10)
+    decision = planner.update()
+    assert decision.action == SLOW
+    assert decision.speed_scale == planner.min_speed_scale
+
+
+def test_stale_reading_slows_down():
+    clock, interface, sensor, planner = make_planner(150.0)
+    measure(sensor, clock, 5)
+    assert planner.update().action == GO
+
+    # 창에 유효 측정이 남아 있어도 마지막 에코가 max_age보다 오래되면 감속
+    interface.dropout = 1.0
+    measure(sensor, clock, 2)
+    clock.time += planner.max_age
+    decision = planner.update()
+    assert decision.action == SLOW
+    assert decision.speed_scale == planner.min_speed_scale
+
+
+def test_stop_distance_checked_before_stale():
+    clock, interface, sensor, planner = make_planner(10.0, turn_direction='left')
+    measure(sensor, clock, 5)
+    interface.dropout = 1.0
+    measure(sensor, clock, 2)
+    clock.time += planner.max_age * 4
+    assert planner.update().action == TURN
+
+
+def test_too_close_is_treated_as_minimum_distance():
+    clock, _, sensor, planner = make_planner(1.0)
+    measure(sensor, clock, 5)
+    assert sensor.get_distance() == ULTRASONIC_MIN_DISTANCE
+    assert planner.update().action == STOP
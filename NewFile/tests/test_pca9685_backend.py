@@ -0,0 +1,48 @@
+import numpy as np
+from pca9685_backend import PCA9685ServoBackend, FakeI2CBus, PCA9685_ADDRESS, FULL_OFF
+from servo_bus import JOINT_COUNT
+
+
+def make_backend():
+    bus = FakeI2CBus()
+    backend = PCA9685ServoBackend(bus=bus)
+    return bus, backend
+
+
+def off_counts(bus):
+    return [bus.read_channel_counts(PCA9685_ADDRESS, channel)[1] for channel in range(JOINT_COUNT)]
+
+
+def test_stop_sets_full_off_on_every_channel():
+    bus, backend = make_backend()
+    backend.write_pulses(np.full(JOINT_COUNT, 1500.0), np.ones(JOINT_COUNT, dtype=bool))
+    backend.stop()
+    for channel in range(JOINT_COUNT):
+        assert bus.read_channel_counts(PCA9685_ADDRESS, channel)[1] & (FULL_OFF << 8)
+
+
+def test_masked_write_after_stop_restores_all_channels():
+    bus, backend = make_backend()
+    pulses = np.linspace(1000.0, 2000.0, JOINT_COUNT)
+    backend.write_pulses(pulses, np.ones(JOINT_COUNT, dtype=bool))
+    expected = off_counts(bus)
+
+    backend.stop()
+    mask = np.zeros(JOINT_COUNT, dtype=bool)
+    mask[3] = True
+    pulses[3] = 1700.0
+    backend.write_pulses(pulses, mask)
+
+    expected[3] = int(backend._pulses_to_counts(np.array([1700.0]))[0])
+    assert off_counts(bus) == expected
+
+
+def test_masked_write_sends_only_changed_span():
+    bus, backend = make_backend()
+    backend.write_pulses(np.full(JOINT_COUNT, 1500.0), np.ones(JOINT_COUNT, dtype=bool))
+    mask = np.zeros(JOINT_COUNT, dtype=bool)
+    mask[[2, 4]] = True
+    backend.write_pulses(np.full(JOINT_COUNT, 1600.0), mask)
+    kind, _, _, length = bus.transactions[-1]
+    assert kind == 'write_block'
+    assert length == 3 * 4
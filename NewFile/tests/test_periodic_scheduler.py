@@ -0,0 +1,94 @@
+import pytest
+from control_clock import VirtualClock
+from periodic_scheduler import CATCH_UP, SKIP, PeriodicScheduler
+
+RATE = 10.0             # 가상 100ms 주기
+PERIOD = 1.0 / RATE
+
+
+def make_scheduler(policy, **kwargs):
+    # 가상 시계 2배속: 주기 50ms (실제), 스레드 깨어남 지연보다 충분히 김
+    clock = VirtualClock(speed=2.0, start=100.0)
+    return clock, PeriodicScheduler(RATE, clock, policy=policy, **kwargs)
+
+
+def test_skip_policy_drops_missed_ticks_and_keeps_phase():
+    clock, scheduler = make_scheduler(SKIP)
+    start = scheduler.start() - PERIOD
+    clock.sleep(2.5 * PERIOD)           # 작업이 두 번째 마감 시각까지 넘김
+
+    assert not scheduler.wait_next()
+    stats = scheduler.get_stats()
+    assert stats['overrun_count'] == 1
+    assert stats['skipped_ticks'] == 1
+    assert stats['tick_count'] == 1
+    # 놓친 주기를 건너뛰고 세 번째 마감 시각에 깨어남 (위상 유지)
+    assert clock.now() >= start + 3 * PERIOD
+    assert scheduler.next_deadline == pytest.approx(start + 4 * PERIOD)
+
+
+def test_catch_up_policy_runs_missed_ticks_without_waiting():
+    clock, scheduler = make_scheduler(CATCH_UP)
+    start = scheduler.start() - PERIOD
+    clock.sleep(3.5 * PERIOD)           # 마감 시각 세 개를 넘김
+
+    for _ in range(3):
+        assert not scheduler.wait_next()
+    # 밀린 세 주기는 대기 없이 실행
+    assert clock.now() < start + 4 * PERIOD
+    stats = scheduler.get_stats()
+    assert stats['tick_count'] == 3
+    assert stats['overrun_count'] == 3
+    assert stats['skipped_ticks'] == 0
+
+    # 따라잡은 뒤에는 다시 마감 시각까지 대기
+    scheduler.wait_next()
+    assert clock.now() >= start + 4 * PERIOD
+    assert scheduler.get_stats()['overrun_count'] == 3
+
+
+def test_catch_up_policy_limits_burst():
+    clock, scheduler = make_scheduler(CATCH_UP, max_catch_up=1)
+    start = scheduler.start() - PERIOD
+    clock.sleep(3.5 * PERIOD)
+
+    scheduler.wait_next()
+    assert scheduler.skipped_ticks == 1
+    assert scheduler.next_deadline == pytest.approx(start + 3 * PERIOD)
+
+
+def test_stats_count_jitter_and_overruns():
+    clock, scheduler = make_scheduler(SKIP)
+    scheduler.start()
+    for tick in range(6):
+        if tick == 3:
+            clock.sleep(1.5 * PERIOD)   # 한 번만 주기 초과
+        scheduler.wait_next()
+
+    stats = scheduler.get_stats()
+    assert stats['tick_count'] == 6
+    assert stats['jitter']['count'] == 6
+    assert sum(stats['jitter']['bins'].values()) == 6
+    assert stats['jitter']['max_ms'] < PERIOD * 1000.0 / 2
+    assert stats['overrun_count'] == 1
+    assert sum(stats['overrun']['bins'].values()) == 1
+    assert stats['overrun']['max_ms'] == pytest.approx(PERIOD * 1000.0 / 2, abs=20.0)
+
+    scheduler.reset_stats()
+    stats = scheduler.get_stats()
+    assert stats['tick_count'] == 0
+    assert stats['jitter']['count'] == stats['overrun_count'] == 0
+
+
+def test_wait_function_interrupt_is_reported():
+    clock, scheduler = make_scheduler(SKIP)
+    scheduler.start()
+    assert scheduler.wait_next(lambda timeout: True)
+    assert scheduler.tick_count == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        PeriodicScheduler(0)
+    with pytest.raises(ValueError):
+        PeriodicScheduler(10, policy='later')
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from joint_pose import JOINT_COUNT, JOINT_INDEX, new_pose
+from servo_bus import ServoCommandBus, SimulationServoBackend
+from servo_calibration import ServoCalibration
+
+
+class RecordingBackend(SimulationServoBackend):
+    """출력한 채널 마스크를 기록하는 백엔드"""
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    def write_pulses(self, pulses, mask):
+        super().write_pulses(pulses, mask)
+        self.frames.append(mask.copy())
+
+
+def make_bus(deadband=0.5):
+    backend = RecordingBackend()
+    return backend, ServoCommandBus(backend, deadband=deadband, calibration=ServoCalibration())
+
+
+def test_changes_inside_deadband_are_skipped():
+    backend, bus = make_bus()
+    assert bus.write_pose(new_pose(10.0))
+    assert backend.frames[-1].all()
+
+    assert bus.write_pose(new_pose(10.3))
+    assert len(backend.frames) == 1
+    assert bus.get_write_stats()['suppressed_writes'] == JOINT_COUNT
+
+    # 데드밴드를 넘는 채널만 출력
+    pose = new_pose(10.3)
+    pose[JOINT_INDEX['front_left_knee']] = 12.0
+    assert bus.write_pose(pose)
+    assert np.flatnonzero(backend.frames[-1]).tolist() == [JOINT_INDEX['front_left_knee']]
+    assert bus.get_angle('front_left_knee') == pytest.approx(12.0)
+
+
+def test_force_writes_every_masked_channel():
+    backend, bus = make_bus()
+    bus.write_pose(new_pose(10.0))
+    assert bus.write_pose(new_pose(10.0), force=True)
+    assert len(backend.frames) == 2
+    assert backend.frames[-1].all()
+
+
+def test_writes_resume_after_invalidate():
+    backend, bus = make_bus()
+    bus.write_pose(new_pose(10.0))
+    bus.write_pose(new_pose(10.0))
+    assert len(backend.frames) == 1
+
+    bus.invalidate()
+    assert bus.write_pose(new_pose(10.0))
+    assert len(backend.frames) == 2
+    assert backend.frames[-1].all()
+
+
+def test_simulation_backend_is_quiet_by_default(capsys):
+    bus = ServoCommandBus(SimulationServoBackend(), calibration=ServoCalibration())
+    bus.write_pose(new_pose(5.0))
+    assert capsys.readouterr().out == ''
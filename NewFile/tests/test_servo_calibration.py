@@ -0,0 +1,31 @@
+import numpy as np
+from servo_calibration import ServoCalibration, ServoCalibrationRoutine, PULSE_CENTER_US
+from joint_pose import JOINT_NAMES
+
+
+class RecordingBackend:
+    """출력한 (채널, 펄스) 기록"""
+    def __init__(self):
+        self.writes = []
+
+    def write_pulses(self, pulses, mask):
+        for channel in np.flatnonzero(mask):
+            self.writes.append((int(channel), float(pulses[channel])))
+
+
+def test_limit_jogs_start_from_center():
+    answers = iter(['', 'y', '-', '-', '', '+', '+', '+', ''])
+    backend = RecordingBackend()
+    calibration = ServoCalibration()
+    routine = ServoCalibrationRoutine(backend, calibration, input_func=lambda prompt: next(answers))
+    joint_name = JOINT_NAMES[0]
+    routine.calibrate_joint(joint_name)
+
+    pulses = [pulse for channel, pulse in backend.writes if channel == 0]
+    center = PULSE_CENTER_US + calibration.joints[joint_name]['offset'] * calibration.joints[joint_name]['us_per_degree']
+    # 중립 조그 1회 + 방향 확인 1회 이후 최소 한계 조그는 중립에서 시작
+    assert pulses[2] == center
+    assert pulses[5] == center
+    assert max(abs(pulse - center) for pulse in pulses) <= 30.0 + 10.0 * calibration.joints[joint_name]['us_per_degree']
+    assert calibration.joints[joint_name]['min_us'] == center - 20.0
+    assert calibration.joints[joint_name]['max_us'] == center + 30.0
@@ -0,0 +1,72 @@
+import pytest
+from actuator_manager import ActuatorManager
+from activate_steering import BodyActivateSteering
+from control_clock import VirtualClock
+from gait_generator import turn_for_yaw_rate, yaw_rate_for_turn
+from mock_servo_backend import MockServoBackend
+from servo_calibration import ServoCalibration
+from turning_walk import HeadingController
+
+HIPS = ('front_left_hip', 'back_left_hip', 'front_right_hip', 'back_right_hip')
+
+
+@pytest.mark.parametrize('duty_factor', [0.5, 0.75, 0.9])
+@pytest.mark.parametrize('yaw_rate', [-25.0, 5.0, 20.0])
+def test_turn_yaw_rate_round_trip_with_duty(duty_factor, yaw_rate):
+    turn = turn_for_yaw_rate(yaw_rate, 1.2, duty_factor)
+    assert yaw_rate_for_turn(turn, 1.2, duty_factor) == pytest.approx(yaw_rate)
+
+
+def test_turn_for_yaw_rate_scales_with_duty():
+    # 듀티 비가 클수록 한 주기 회전이 작으므로 같은 회전 속도에 더 큰 보폭 차이
+    assert turn_for_yaw_rate(20.0, 1.2, 0.9) == pytest.approx(turn_for_yaw_rate(20.0, 1.2, 0.5) * 0.9 / 0.5)
+
+
+def test_heading_controller_wraps_error_and_quantizes():
+    controller = HeadingController(Kp=1.0, turn_step=0.25)
+    turn = controller.update(170.0, -170.0, 1.2, 0.75)
+    assert controller.heading_error == pytest.approx(-20.0)
+    assert controller.yaw_rate_command == pytest.approx(-20.0)
+    assert turn < 0
+    assert turn / 0.25 == pytest.approx(round(turn / 0.25))
+    assert turn == pytest.approx(turn_for_yaw_rate(-20.0, 1.2, 0.75), abs=0.125)
+
+
+def test_heading_controller_limits_and_feedforward():
+    controller = HeadingController(Kp=1.0, max_yaw_rate=30.0, max_turn=4.0)
+    controller.update(90.0, 0.0, 1.2, 0.75)
+    assert controller.yaw_rate_command == 30.0
+    assert abs(controller.turn) <= 4.0
+
+    # 오차가 없으면 피드포워드만 남음
+    controller.update(0.0, 0.0, 1.2, 0.75, feedforward_rate=10.0)
+    assert controller.yaw_rate_command == 10.0
+
+    controller.reset()
+    assert controller.get_status() == {'heading_error': 0.0, 'yaw_rate_command': 0.0, 'turn': 0.0}
+
+
+@pytest.fixture
+def steering():
+    manager = ActuatorManager(MockServoBackend(clock=VirtualClock(speed=20)), calibration=ServoCalibration())
+    steering = BodyActivateSteering(actuator=manager.acquire('steering'))
+    yield steering
+    steering.cleanup()
+
+
+def test_steering_hip_offsets_scale_with_angle(steering):
+    actuator = steering.actuator
+    neutral = {name: actuator.get_target(name) for name in HIPS}
+
+    assert steering.adjust_steering(10.0)
+    offset = 10.0 * steering.hip_steering_gain
+    assert actuator.get_target('front_left_hip') == pytest.approx(neutral['front_left_hip'] + offset)
+    assert actuator.get_target('back_right_hip') == pytest.approx(neutral['back_right_hip'] - offset)
+
+    # 차이만큼만 추가 회전, 중립 복귀 시 원래 각도
+    assert steering.adjust_steering(-6.0)
+    assert actuator.get_target('front_left_hip') == pytest.approx(neutral['front_left_hip'] - 6.0 * steering.hip_steering_gain)
+    assert steering.reset_steering()
+    actuator.wait_until_settled(timeout=5.0)
+    for name in HIPS:
+        assert actuator.get_angle(name) == pytest.approx(neutral[name], abs=0.5)
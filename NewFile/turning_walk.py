@@ -0,0 +1,236 @@
+import math
+from gait_generator import GAIT_PRESETS, get_gait_table, stride_per_cycle, turn_for_yaw_rate, yaw_rate_for_turn
+from leg_odometry import LegOdometry
+
+
+class HeadingController:
+    """
+    IMU 방향 폐루프 제어
+    목표 방향 오차 → 회전 속도 명령 (피드포워드 + 비례) → 좌우 보폭 차이 turn (cm)
+    turn은 turn_step 단위로 양자화하여 보행 테이블 캐시를 재사용
+    """
+    def __init__(self, Kp=1.0, max_yaw_rate=30.0, max_turn=4.0, turn_step=0.25):
+        self.Kp = Kp                        # 방향 오차 1도당 회전 속도 (도/초)
+        self.max_yaw_rate = max_yaw_rate    # 회전 속도 명령 한계 (도/초)
+        self.max_turn = max_turn            # 좌우 보폭 차이 한계 (cm)
+        self.turn_step = turn_step
+
+        self.heading_error = 0.0
+        self.yaw_rate_command = 0.0
+        self.turn = 0.0
+
+    def update(self, target_heading, heading, cycle_time, duty_factor, feedforward_rate=0.0):
+        """방향 오차로 다음 걸음의 turn (cm) 계산 (duty_factor: 보행 테이블 듀티 비)"""
+        # -180 ~ 180도로 감아서 오차 계산
+        self.heading_error = (target_heading - heading + 180.0) % 360.0 - 180.0
+        yaw_rate = feedforward_rate + self.Kp * self.heading_error
+        self.yaw_rate_command = max(-self.max_yaw_rate, min(self.max_yaw_rate, yaw_rate))
+
+        turn = turn_for_yaw_rate(self.yaw_rate_command, cycle_time, duty_factor)
+        turn = max(-self.max_turn, min(self.max_turn, turn))
+        self.turn = round(turn / self.turn_step) * self.turn_step
+        return self.turn
+
+    def reset(self):
+        self.heading_error = 0.0
+        self.yaw_rate_command = 0.0
+        self.turn = 0.0
+
+    def get_status(self):
+        return {
+            'heading_error': self.heading_error,
+            'yaw_rate_command': self.yaw_rate_command,
+            'turn': self.turn
+        }
+
+
+class TurningWalk:
+    """
+    곡선 보행 / 제자리 회전
+    정지 후 조향하는 대신 보행 테이블의 좌우 보폭 차이(turn)로 걸으면서 방향을 바꾸고,
+    걸음마다 IMU yaw(다리 주행 거리계와 혼합)로 목표 방향을 추종
+    """
+    def __init__(self, leg_controller=None, imu_sampler=None, gait='crawl', step_length=12.0, step_height=8.0,
+                 step_interval=0.3, steps_per_cycle=4):
+        if leg_controller is None:
+            from leg_moving import LegMoving
+            leg_controller = LegMoving()
+            self._owns_leg_controller = True
+        else:
+            self._owns_leg_controller = False
+        self.leg_controller = leg_controller
+        self.actuator = leg_controller.actuator
+
+        if imu_sampler is None:
+            from imu_sampler import get_imu_sampler
+            imu_sampler = get_imu_sampler(self.actuator.clock).acquire('turning_walk')
+            self._owns_imu_sampler = True
+        else:
+            self._owns_imu_sampler = False
+        self.imu_sampler = imu_sampler
+        # 시뮬레이션 센서는 yaw가 변하지 않으므로 기구학 방향만 사용
+        self.use_imu_yaw = not getattr(imu_sampler.sensor, 'simulation_mode', False)
+
+        # 보행 파라미터 (직교 좌표 보행, cm)
+        self.gait = gait
+        self.step_length = step_length
+        self.step_height = step_height
+        self.step_interval = step_interval      # 한 걸음 (1/steps_per_cycle 주기) 시간 (초)
+        self.steps_per_cycle = steps_per_cycle
+
+        self.heading_controller = HeadingController()
+        self.odometry = LegOdometry(yaw_weight=0.98 if self.use_imu_yaw else 0.0)
+
+        # 실행 상태
+        self.is_walking = False
+        self.mode = None
+        self.current_step = 0
+        self.start_yaw = 0.0
+        self.target_heading = 0.0
+        self.gait_table = None
+        self._done = None
+
+    @property
+    def cycle_time(self):
+        return self.step_interval * self.steps_per_cycle
+
+    @property
+    def duty_factor(self):
+        return GAIT_PRESETS[self.gait]['duty_factor']
+
+    def walk_arc(self, distance_cm, radius_cm):
+        """
+        반지름 radius_cm (양수면 좌회전, 음수면 우회전) 원호를 따라 distance_cm 보행
+        목표 방향 = 시작 방향 + 이동 거리 / 반지름
+        """
+        if radius_cm == 0:
+            raise ValueError("원호 반지름은 0이 될 수 없습니다 (제자리 회전은 turn_in_place 사용)")
+
+        speed = stride_per_cycle(self.step_length, self.duty_factor) / self.cycle_time     # 전진 속도 (cm/초)
+        feedforward_rate = math.degrees(speed / radius_cm)
+
+        def target(elapsed):
+            return math.degrees(self.odometry.get_pose().distance / radius_cm)
+
+        def done(elapsed, heading):
+            return self.odometry.get_pose().distance >= distance_cm
+
+        print(f"곡선 보행 시작: {distance_cm}cm, 반지름 {radius_cm}cm")
+        return self._walk('arc', self.step_length, target, done, feedforward_rate)
+
+    def turn_in_place(self, angle, yaw_rate=20.0, tolerance=2.0, timeout=None):
+        """
+        제자리 회전 (angle: 양수면 좌회전, 도)
+        목표 방향을 yaw_rate로 경사 증가시키며 추종, 목표 방향 ± tolerance 안에 들면 종료
+        """
+        direction = 1.0 if angle >= 0 else -1.0
+        yaw_rate = abs(yaw_rate)
+        ramp_time = abs(angle) / yaw_rate if yaw_rate > 0 else 0.0
+        if timeout is None:
+            timeout = ramp_time * 2.0 + 2.0
+
+        def target(elapsed):
+            return direction * min(yaw_rate * elapsed, abs(angle))
+
+        def done(elapsed, heading):
+            reached = elapsed >= ramp_time and abs(angle - heading) <= tolerance
+            return reached or elapsed >= timeout
+
+        print(f"제자리 회전 시작: {angle}도, {yaw_rate}도/초")
+        return self._walk('turn_in_place', 0.0, target, done, direction * yaw_rate, ramp_time)
+
+    def _heading(self):
+        """시작 기준 현재 방향 (도)"""
+        return self.odometry.get_pose().heading
+
+    def _walk(self, mode, step_length, target, done, feedforward_rate, feedforward_time=None):
+        if self.is_walking:
+            print("이미 보행 중입니다.")
+            return False
+
+        clock = self.actuator.clock
+        self.imu_sampler.start()
+        sample = self.imu_sampler.wait_for_sample()
+        self.start_yaw = sample.yaw if sample is not None else 0.0
+        self.odometry.reset()
+        self.heading_controller.reset()
+
+        self.mode = mode
+        self.is_walking = True
+        self.leg_controller.is_walking = True
+        self.current_step = 0
+        start = clock.now()
+        self._done = lambda: done(clock.now() - start, self._heading())
+
+        try:
+            while self.is_walking and not self._done():
+                # 걸음마다 방향 오차로 좌우 보폭 차이 갱신 (회전은 걷는 동안 진행)
+                elapsed = clock.now() - start
+                self.target_heading = target(elapsed)
+                rate = feedforward_rate if feedforward_time is None or elapsed < feedforward_time else 0.0
+                turn = self.heading_controller.update(self.target_heading, self._heading(), self.cycle_time,
+                                                      self.duty_factor, rate)
+                self.gait_table = get_gait_table(self.gait, step_length, self.step_height, turn=turn,
+                                                 cartesian=True)
+
+                start_phase = self.current_step / self.steps_per_cycle
+                end_phase = (self.current_step + 1) / self.steps_per_cycle
+                if not self.leg_controller.play_gait(self.gait_table, start_phase, end_phase, self.cycle_time,
+                                                     pose_filter=self._control_tick):
+                    if self.actuator.stop_requested:
+                        print("비상 정지로 회전 보행이 취소되었습니다.")
+                    self.is_walking = False
+                    return False
+                self.current_step += 1
+
+            print(f"{mode} 완료: 방향 {self._heading():.1f}도, 이동 {self.odometry.get_pose().distance:.1f}cm")
+            return True
+
+        except Exception as e:
+            print(f"회전 보행 오류: {e}")
+            return False
+        finally:
+            self.stop()
+
+    def _control_tick(self, row, phase):
+        """제어 틱: 주행 거리계 갱신 (IMU yaw 혼합), 종료 조건이면 None으로 구간 종료"""
+        yaw = None
+        if self.use_imu_yaw:
+            sample = self.imu_sampler.get_latest()
+            if sample is not None:
+                yaw = sample.yaw - self.start_yaw
+        self.odometry.update(row, self.gait_table.contacts_at(phase), yaw)
+        if self._done():
+            return None
+        return row
+
+    def stop(self):
+        """보행 정지 (중립 자세로 복귀)"""
+        if not self.is_walking:
+            return False
+        self.is_walking = False
+        return self.leg_controller.stop_walking()
+
+    def get_status(self):
+        """회전 보행 상태 정보 반환"""
+        pose = self.odometry.get_pose()
+        status = {
+            'is_walking': self.is_walking,
+            'mode': self.mode,
+            'current_step': self.current_step,
+            'heading': pose.heading,
+            'target_heading': self.target_heading,
+            'distance': pose.distance,
+            'expected_yaw_rate': yaw_rate_for_turn(self.heading_controller.turn, self.cycle_time, self.duty_factor),
+            'use_imu_yaw': self.use_imu_yaw
+        }
+        status.update(self.heading_controller.get_status())
+        return status
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+        if self._owns_imu_sampler:
+            self.imu_sampler.release('turning_walk')
+        if self._owns_leg_controller:
+            self.leg_controller.cleanup()
@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from control_clock import SYSTEM_CLOCK
+from periodic_scheduler import PeriodicScheduler
+
+
+# IOE-SR05 초음파 센서 핀 (라즈베리파이 GPIO, BCM; 에코는 5V → 3.3V 분압 필요)
+ULTRASONIC_TRIGGER_PIN = 20
+ULTRASONIC_ECHO_PIN = 21
+
+SPEED_OF_SOUND_CM_S = 34300.0       # 20도 기준 음속 (cm/초)
+ULTRASONIC_MIN_DISTANCE = 2.0       # 측정 하한 (cm)
+ULTRASONIC_MAX_DISTANCE = 200.0     # 측정 상한 (cm, 2m)
+
+# 거리 측정값 (마지막 유효 에코 시각, 중앙값 필터 거리 cm 또는 None(알 수 없음), 마지막 원시 거리 cm 또는 None)
+DistanceReading = namedtuple('DistanceReading', ['timestamp', 'distance', 'raw'])
+
+
+class GPIOEchoInterface:
+    """
+    RPi.GPIO 트리거/에코 인터페이스
+    에코 핀 양쪽 에지를 이벤트 콜백으로 받아 시각을 기록 (측정 중 대기 루프 없음)
+    """
+    def __init__(self, trigger_pin=ULTRASONIC_TRIGGER_PIN, echo_pin=ULTRASONIC_ECHO_PIN):
+        import RPi.GPIO as GPIO
+        self.GPIO = GPIO
+        self.trigger_pin = trigger_pin
+        self.echo_pin = echo_pin
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        GPIO.setup(trigger_pin, GPIO.OUT, initial=GPIO.LOW)
+        GPIO.setup(echo_pin, GPIO.IN)
+        self._callback = None
+
+    def set_edge_callback(self, callback):
+        """에지 콜백 등록 (callback(레벨, 시각 초))"""
+        self._callback = callback
+        self.GPIO.add_event_detect(self.echo_pin, self.GPIO.BOTH, callback=self._on_edge)
+
+    def _on_edge(self, channel):
+        timestamp = time.perf_counter()
+        self._callback(self.GPIO.input(channel), timestamp)
+
+    def trigger(self):
+        """10us 트리거 펄스"""
+        self.GPIO.output(self.trigger_pin, self.GPIO.HIGH)
+        time.sleep(0.00001)
+        self.GPIO.output(self.trigger_pin, self.GPIO.LOW)
+
+    def cleanup(self):
+        try:
+            self.GPIO.remove_event_detect(self.echo_pin)
+            self.GPIO.cleanup((self.trigger_pin, self.echo_pin))
+        except:
+            pass
+
+
+class MockEchoInterface:
+    """
+    테스트용 에코 인터페이스
+    트리거마다 설정된 거리(또는 거리 함수)의 에코 펄스를 에지 콜백 두 번으로 즉시 전달,
+    잡음/측정 누락 비율 지정 가능
+    """
+    def __init__(self, distance=ULTRASONIC_MAX_DISTANCE, noise=0.0, dropout=0.0, seed=None):
+        self.distance = distance        # cm 또는 인자 없는 함수
+        self.noise = noise              # 거리 잡음 표준편차 (cm)
+        self.dropout = dropout          # 에코가 돌아오지 않을 확률
+        self.trigger_count = 0
+        self._callback = None
+        self._rng = np.random.default_rng(seed)
+
+    def set_edge_callback(self, callback):
+        self._callback = callback
+
+    def trigger(self):
+        self.trigger_count += 1
+        if self._rng.random() < self.dropout:
+            return
+        distance = self.distance() if callable(self.distance) else self.distance
+        if self.noise > 0:
+            distance += self._rng.normal(0.0, self.noise)
+        start = time.perf_counter()
+        self._callback(1, start)
+        self._callback(0, start + max(distance, 0.0) * 2.0 / SPEED_OF_SOUND_CM_S)
+
+    def cleanup(self):
+        pass
+
+
+class UltrasonicSensor:
+    """
+    IOE-SR05 초음파 거리 센서
+    별도 스레드가 sample_rate(Hz)로 트리거하고, 에코 시간은 에지 콜백으로 측정,
+    최근 window개 측정의 중앙값을 불변 측정값으로 게시 (get_reading()은 잠금 없이 O(1))
+    에코가 없으면 측정 시각을 갱신하지 않고, 창 전체가 측정 실패면 거리를 None(알 수 없음)으로 게시
+    """
+    def __init__(self, interface=None, sample_rate=20, window=5, max_distance=ULTRASONIC_MAX_DISTANCE,
+                 clock=SYSTEM_CLOCK):
+        if interface is None:
+            try:
+                interface = GPIOEchoInterface()
+                self.simulation_mode = False
+            except Exception as e:
+                print(f"초음파 센서 GPIO 초기화 오류: {e}. 시뮬레이션 모드로 실행됩니다.")
+                interface = MockEchoInterface()
+                self.simulation_mode = True
+        else:
+            self.simulation_mode = isinstance(interface, MockEchoInterface)
+
+        self.interface = interface
+        self.sample_rate = sample_rate
+        self.max_distance = max_distance
+        self.clock = clock
+
+        # 중앙값 필터 창 (미리 할당, 측정 누락은 NaN)
+        self.window = np.full(window, np.nan)
+        self._window_index = 0
+
+        self.reading = DistanceReading(clock.now(), None, None)
+        self.measurement_count = 0
+        self.timeout_count = 0
+
+        # 에코 측정 상태 (에지 콜백 스레드와 공유)
+        self._echo_start = None
+        self._echo_width = None
+        self._echo_done = threading.Event()
+        interface.set_edge_callback(self._on_edge)
+
+        self.scheduler = PeriodicScheduler(sample_rate, clock, name='ultrasonic')
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.running = False
+
+    def _on_edge(self, level, timestamp):
+        """에코 에지 콜백: 상승 에지 시각 기록, 하강 에지에서 펄스 폭 확정"""
+        if level:
+            self._echo_start = timestamp
+        elif self._echo_start is not None:
+            self._echo_width = timestamp - self._echo_start
+            self._echo_start = None
+            self._echo_done.set()
+
+    def measure_once(self):
+        """트리거 한 번 후 에코를 기다려 필터 갱신 (측정 실패 시 None)"""
+        self._echo_done.clear()
+        self._echo_start = None
+        self._echo_width = None
+        self.interface.trigger()
+
+        # 최대 거리 왕복 시간 + 여유만큼만 대기 (실제 시간 기준)
+        timeout = self.max_distance * 2.0 / SPEED_OF_SOUND_CM_S + 0.005
+        raw = None
+        if self._echo_done.wait(timeout) and self._echo_width is not None:
+            # 측정 하한보다 가까우면 하한, 상한보다 멀면 상한으로 간주 (에코는 받았으므로 유효 측정)
+            distance = self._echo_width * SPEED_OF_SOUND_CM_S / 2.0
+            raw = min(max(distance, ULTRASONIC_MIN_DISTANCE), self.max_distance)
+        else:
+            self.timeout_count += 1
+
+        self.window[self._window_index] = np.nan if raw is None else raw
+        self._window_index = (self._window_index + 1) % len(self.window)
+        self.measurement_count += 1
+
+        # 유효 측정이 없으면 (모두 에코 없음) 알 수 없음, 시각은 마지막 유효 에코 기준 유지
+        valid = self.window[~np.isnan(self.window)]
+        filtered = float(np.median(valid)) if valid.size else None
+        timestamp = self.clock.now() if raw is not None else self.reading.timestamp
+        self.reading = DistanceReading(timestamp, filtered, raw)
+        return raw
+
+    def start(self):
+        """측정 스레드 시작"""
+        if self.running:
+            return False
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='ultrasonic', daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        wait = lambda timeout: self.clock.wait(self._stop_event, timeout)
+        self.scheduler.start()
+        try:
+            while not self._stop_event.is_set():
+                self.measure_once()
+                if self.scheduler.wait_next(wait):
+                    break
+        except Exception as e:
+            print(f"초음파 측정 오류: {e}")
+        finally:
+            self.running = False
+
+    def stop(self):
+        """측정 스레드 정지"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        self.running = False
+
+    def get_reading(self):
+        """최신 측정값 (DistanceReading)"""
+        return self.reading
+
+    def get_distance(self):
+        """최신 중앙값 필터 거리 (cm, 알 수 없으면 None)"""
+        return self.reading.distance
+
+    def get_status(self):
+        """초음파 센서 상태 정보 반환"""
+        reading = self.reading
+        return {
+            'simulation_mode': self.simulation_mode,
+            'running': self.running,
+            'distance': reading.distance,
+            'raw': reading.raw,
+            'age': self.clock.now() - reading.timestamp,
+            'measurement_count': self.measurement_count,
+            'timeout_count': self.timeout_count,
+            'scheduler': self.scheduler.get_stats()
+        }
+
+    def cleanup(self):
+        """리소스 정리"""
+        self.stop()
+        self.interface.cleanup()
+        print("초음파 센서 리소스 정리 완료")